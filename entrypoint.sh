@@ -0,0 +1,10 @@
+#!/bin/sh
+# Production entrypoint: prepare the database and static files, then serve
+# the app with gunicorn (configured in gunicorn.conf.py).
+set -e
+
+python manage.py wait_for_db
+python manage.py migrate --noinput
+python manage.py collectstatic --noinput
+
+exec gunicorn --config gunicorn.conf.py
@@ -0,0 +1,54 @@
+"""gunicorn settings for ``entrypoint.sh``; every value can be overridden
+through the environment."""
+import os
+
+
+def _cpu_count() -> int:
+    try:
+        # Respects the CPUs the container is pinned to.
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", _cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# The async read views need the ASGI app; everything else runs as WSGI.
+if os.environ.get("ASYNC_READ_VIEWS", "") == "1":
+    wsgi_app = "social_media_api.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "social_media_api.wsgi:application"
+    worker_class = "gthread"
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", worker_class)
+
+# Recycle workers now and then so a slow leak cannot grow forever.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = timeout
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+# Workers share Prometheus metrics through files in this directory (see
+# social_api.metrics); it is emptied on startup so samples of a previous
+# run do not add up.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus")
+
+
+def on_starting(server):
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
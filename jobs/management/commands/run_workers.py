@@ -0,0 +1,71 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.worker import work_forever
+
+
+class Command(BaseCommand):
+    help = "Run a pool of background job worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.JOBS_WORKERS,
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.JOBS_BATCH_SIZE,
+            help="Jobs claimed per poll.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is drained.",
+        )
+
+    def handle(self, *args, **options):
+        kwargs = {
+            "batch_size": options["batch_size"],
+            "poll_interval": options["poll_interval"],
+            "once": options["once"],
+        }
+        processes = max(options["processes"], 1)
+        self.stdout.write(f"Starting {processes} job worker(s)...")
+
+        if processes == 1:
+            work_forever(**kwargs)
+            return
+
+        # Children must open their own database connections.
+        connections.close_all()
+        pool = [
+            multiprocessing.Process(
+                target=work_forever, kwargs=kwargs, name=f"job-worker-{i}"
+            )
+            for i in range(processes)
+        ]
+        for process in pool:
+            process.start()
+
+        def shutdown(signum, frame):
+            for process in pool:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        for process in pool:
+            process.join()
+        self.stdout.write(self.style.SUCCESS("Job workers stopped."))
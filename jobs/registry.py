@@ -0,0 +1,55 @@
+import functools
+
+from django.conf import settings
+from django.db import transaction
+
+from jobs.models import Job
+
+tasks = {}
+
+
+class Task:
+    def __init__(self, func, name: str, max_attempts: int | None):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, **kwargs) -> None:
+        """Queue a run with JSON-serializable ``kwargs``.
+
+        The job row is written once the current transaction commits, so
+        workers never see work for data that was rolled back. With
+        ``JOBS_EAGER`` the task runs right away instead (tests).
+        """
+        if settings.JOBS_EAGER:
+            self.func(**kwargs)
+            return
+        transaction.on_commit(
+            functools.partial(
+                Job.objects.create,
+                name=self.name,
+                kwargs=kwargs,
+                max_attempts=self.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+            )
+        )
+
+
+def task(name: str | None = None, max_attempts: int | None = None):
+    """Register a function as a background task::
+
+        @task()
+        def send_email(user_id): ...
+
+        send_email.enqueue(user_id=user.id)
+    """
+
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        tasks[task_name] = Task(func, task_name, max_attempts)
+        return tasks[task_name]
+
+    return decorator
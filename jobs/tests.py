@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import task
+from jobs.worker import Worker, claim
+
+calls = []
+
+
+@task()
+def record(value):
+    calls.append(value)
+
+
+@task(max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+@override_settings(JOBS_EAGER=False, JOBS_BACKOFF_BASE=10)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def drain(self):
+        return Worker(batch_size=10, poll_interval=0).work(once=True)
+
+    def test_enqueue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.enqueue(value=1)
+            self.assertFalse(Job.objects.exists())
+
+        job = Job.objects.get()
+        self.assertEqual(job.name, "jobs.tests.record")
+        self.assertEqual(job.kwargs, {"value": 1})
+        self.assertEqual(calls, [])
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        record.enqueue(value=2)
+
+        self.assertEqual(calls, [2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_worker_runs_and_deletes_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.enqueue(value=3)
+
+        self.assertEqual(self.drain(), 1)
+        self.assertEqual(calls, [3])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_with_backoff(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            explode.enqueue()
+
+        with self.assertLogs("jobs.worker", "WARNING"):
+            self.drain()
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("boom", job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+        self.assertEqual(claim(10), [])
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs("jobs.worker", "ERROR"):
+            self.drain()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_expired_lease_is_reclaimed(self):
+        Job.objects.create(
+            name="jobs.tests.record",
+            kwargs={"value": 4},
+            max_attempts=3,
+            attempts=1,
+            status=Job.Status.RUNNING,
+            locked_at=timezone.now() - timedelta(days=1),
+        )
+
+        self.drain()
+
+        self.assertEqual(calls, [4])
+
+    def test_unknown_task_fails(self):
+        Job.objects.create(name="missing", max_attempts=1)
+
+        with self.assertLogs("jobs.worker", "ERROR"):
+            self.drain()
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("Unknown task", job.last_error)
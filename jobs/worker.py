@@ -0,0 +1,118 @@
+import logging
+import signal
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import tasks
+
+logger = logging.getLogger(__name__)
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retrying a job that has failed ``attempts`` times."""
+    seconds = settings.JOBS_BACKOFF_BASE * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.JOBS_BACKOFF_MAX))
+
+
+def claim(limit: int) -> list[Job]:
+    """Lock up to ``limit`` due jobs for this worker.
+
+    Rows locked by another worker are skipped, so any number of workers
+    can poll the same table. Jobs left ``running`` for longer than
+    ``JOBS_LEASE_SECONDS`` belong to a worker that died and are taken
+    over, unless they have no attempts left.
+    """
+    now = timezone.now()
+    expired = Q(
+        status=Job.Status.RUNNING,
+        locked_at__lt=now - timedelta(seconds=settings.JOBS_LEASE_SECONDS),
+    )
+    with transaction.atomic():
+        Job.objects.filter(expired, attempts__gte=F("max_attempts")).update(
+            status=Job.Status.FAILED,
+            locked_at=None,
+            last_error="Worker lease expired.",
+        )
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=Job.Status.PENDING, run_at__lte=now) | expired)
+            .order_by("run_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        Job.objects.filter(id__in=ids).update(
+            status=Job.Status.RUNNING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+    return list(Job.objects.filter(id__in=ids).order_by("run_at", "id"))
+
+
+def run(job: Job) -> bool:
+    """Execute a claimed job. Finished jobs are deleted; failed ones are
+    rescheduled with exponential backoff until ``max_attempts`` is hit."""
+    try:
+        task = tasks.get(job.name)
+        if task is None:
+            raise LookupError(f"Unknown task {job.name!r}.")
+        task(**job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error("Job %s failed permanently:\n%s", job, error)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.FAILED, locked_at=None, last_error=error
+            )
+        else:
+            logger.warning("Job %s failed, retrying:\n%s", job, error)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.PENDING,
+                locked_at=None,
+                run_at=timezone.now() + backoff(job.attempts),
+                last_error=error,
+            )
+        return False
+    Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+class Worker:
+    def __init__(self, batch_size: int, poll_interval: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stopping = False
+
+    def stop(self, *args) -> None:
+        self.stopping = True
+
+    def work(self, once: bool = False) -> int:
+        """Process jobs until stopped, or until the queue is drained when
+        ``once`` is set. Returns the number of jobs processed."""
+        processed = 0
+        while not self.stopping:
+            close_old_connections()
+            jobs = claim(self.batch_size)
+            if not jobs:
+                if once:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            for job in jobs:
+                run(job)
+                processed += 1
+        return processed
+
+
+def work_forever(batch_size: int, poll_interval: float, once: bool) -> None:
+    """Entry point of a worker process; SIGTERM finishes the current
+    batch and exits."""
+    worker = Worker(batch_size, poll_interval)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.work(once=once)
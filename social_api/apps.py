@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class SocialMediaServiseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "social_api"
+
+    def ready(self):
+        import social_api.signals  # noqa: F401
+
+        if settings.METRICS_ENABLED:
+            from social_api.metrics import instrument_serializers
+
+            instrument_serializers()
@@ -0,0 +1,167 @@
+"""Async variants of the hot read endpoints.
+
+They reuse the querysets, filters, serializers, pagination and response
+cache of the sync viewsets; only the request handling is a coroutine, so
+an ASGI worker can keep many slow connections open while queries run in
+threads. ``with_async_reads`` mounts them on the router URLs when
+``ASYNC_READ_VIEWS`` is on.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.urls import URLPattern
+from django.utils.decorators import classonlymethod
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+from social_api.cache import cache_response, conditional_response
+from social_api.views import FollowViewSet, PostViewSet
+
+READ_METHODS = ("GET", "HEAD")
+
+
+class AsyncReadMixin:
+    """Turns a GenericViewSet's ``dispatch`` into a coroutine and adds
+    ``alist``/``aretrieve`` counterparts of ``list``/``retrieve``.
+
+    Authentication, permission and throttle checks run in a thread since
+    they may touch the cache or database. Serialization happens on the
+    event loop, so querysets must load every relation the serializer
+    reads.
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        async_view.__dict__.update(view.__dict__)
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, "__await__"):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    async def alist(self, request) -> Response:
+        queryset = self.filter_queryset(self.get_queryset())
+        # Pagination evaluates the page itself, so it runs in a thread just
+        # like the async ORM would run the query.
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is None:
+            instances = [instance async for instance in queryset]
+            return Response(self.get_serializer(instances, many=True).data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    async def aretrieve(self, request) -> Response:
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (
+            queryset.model.DoesNotExist,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise Http404
+        self.check_object_permissions(request, instance)
+        return Response(self.get_serializer(instance).data)
+
+
+def read_async(viewset, async_viewset, actions: dict, **initkwargs):
+    """View for one route that serves GET with ``async_viewset`` and every
+    other method with the sync ``viewset`` in a thread."""
+    read_view = async_viewset.as_view({"get": actions["get"]}, **initkwargs)
+    other_actions = {
+        method: action
+        for method, action in actions.items()
+        if method not in ("get", "head")
+    }
+    other_view = read_view
+    if other_actions:
+        other_view = sync_to_async(
+            viewset.as_view(other_actions, **initkwargs)
+        )
+
+    async def view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await read_view(request, *args, **kwargs)
+        return await other_view(request, *args, **kwargs)
+
+    # Lets the schema generator describe the route like the router's.
+    view.cls = viewset
+    view.initkwargs = initkwargs
+    view.actions = actions
+    return csrf_exempt(view)
+
+
+def with_async_reads(patterns: list, async_viewsets: dict) -> list:
+    """Router ``patterns`` with the list/retrieve routes of the viewsets
+    keyed in ``async_viewsets`` served by their async variant."""
+    result = []
+    for pattern in patterns:
+        callback = pattern.callback
+        async_viewset = async_viewsets.get(getattr(callback, "cls", None))
+        actions = getattr(callback, "actions", {})
+        if async_viewset and actions.get("get") in ("list", "retrieve"):
+            pattern = URLPattern(
+                pattern.pattern,
+                read_async(
+                    callback.cls,
+                    async_viewset,
+                    actions,
+                    **callback.initkwargs,
+                ),
+                pattern.default_args,
+                pattern.name,
+            )
+        result.append(pattern)
+    return result
+
+
+class AsyncPostViewSet(AsyncReadMixin, PostViewSet):
+    @conditional_response("posts", weak=True)
+    @cache_response("posts")
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request)
+
+    @conditional_response("post:{pk}")
+    @cache_response("post:{pk}")
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aretrieve(request)
+
+
+class AsyncFollowViewSet(AsyncReadMixin, FollowViewSet):
+    @cache_response("follows")
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request)
+
+    @cache_response("follows")
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aretrieve(request)
@@ -0,0 +1,234 @@
+"""Bulk follow, unfollow and like.
+
+Model signals are bypassed here (inserts send none and the per-row follow
+handlers are muted for deletes), so every side effect the signals would
+run for a single row — counters, timelines, cache invalidation — is
+applied once for the batch.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from social_api.cache import invalidate_on_commit
+from social_api.feed import backfill_timelines, drop_from_timelines
+from social_api.models import Follow, Like, Post
+from social_api.signals import muted_follow_signals
+from user.authentication import forget_user_on_commit
+
+
+def _resolve_usernames(usernames: list[str]) -> dict[str, int]:
+    return dict(
+        get_user_model()
+        .objects.filter(username__in=usernames)
+        .order_by()
+        .values_list("username", "id")
+    )
+
+
+def _insert_new(model, values: dict, target: str, target_ids: list):
+    """Insert a row of ``values`` pointing ``target`` at each of
+    ``target_ids``, skipping targets that no longer exist and rows a
+    unique constraint rejects, and return the target ids actually
+    inserted.
+
+    Unlike ``bulk_create(ignore_conflicts=True)`` this tells which rows
+    were new, also when a concurrent transaction inserted the same one.
+    The rows are selected from the target table, so a target deleted
+    since it was looked up drops out instead of failing the foreign key;
+    on PostgreSQL the selected targets are also locked against deletion
+    until the transaction ends.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    meta = model._meta
+    fields = [meta.get_field(name) for name in values]
+    target_field = meta.get_field(target)
+    target_meta = target_field.related_model._meta
+    target_pk = f"{quote(target_meta.db_table)}.{quote(target_meta.pk.column)}"
+    columns = [*(field.column for field in fields), target_field.column]
+    sql = (
+        f"INSERT INTO {quote(meta.db_table)} "
+        f"({', '.join(quote(column) for column in columns)}) "
+        f"SELECT {', '.join(['%s'] * len(fields) + [target_pk])} "
+        f"FROM {quote(target_meta.db_table)} "
+        f"WHERE {target_pk} IN ({', '.join(['%s'] * len(target_ids))}) "
+        f"{'FOR KEY SHARE ' if connection.vendor == 'postgresql' else ''}"
+        f"ON CONFLICT DO NOTHING "
+        f"RETURNING {quote(target_field.column)}"
+    )
+    params = [
+        *(
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(fields, values.values())
+        ),
+        *target_ids,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {value for value, in cursor.fetchall()}
+
+
+def _followed_ids(follower, user_ids, lock: bool = False) -> set[int]:
+    follows = Follow.objects.filter(
+        follower=follower, following__in=user_ids
+    ).order_by()
+    if lock:
+        follows = follows.select_for_update()
+    return set(follows.values_list("following_id", flat=True))
+
+
+def _liked_ids(user, post_ids) -> set[int]:
+    likes = Like.objects.filter(user=user, post__in=post_ids).order_by()
+    return set(likes.values_list("post_id", flat=True))
+
+
+def _shift_follow_counters(follower, user_ids: list[int], delta: int) -> None:
+    users = get_user_model().objects
+    now = timezone.now()
+    users.filter(pk=follower.pk).update(
+        following_count=F("following_count") + delta * len(user_ids),
+        updated_at=now,
+    )
+    users.filter(pk__in=user_ids).update(
+        followers_count=F("followers_count") + delta, updated_at=now
+    )
+    for user_id in (follower.pk, *user_ids):
+        forget_user_on_commit(user_id, claims=False)
+
+
+@transaction.atomic
+def bulk_follow(follower, usernames: list[str]) -> list[dict]:
+    user_ids = _resolve_usernames(usernames)
+    followed = _followed_ids(follower, user_ids.values())
+
+    statuses, new = {}, {}
+    for username in dict.fromkeys(usernames):
+        user_id = user_ids.get(username)
+        if user_id is None:
+            statuses[username] = "not_found"
+        elif user_id == follower.pk:
+            statuses[username] = "self"
+        elif user_id in followed:
+            statuses[username] = "already_following"
+        else:
+            new[username] = user_id
+
+    if new:
+        now = timezone.now()
+        inserted = _insert_new(
+            Follow,
+            {"follower": follower.pk, "created_at": now},
+            "following",
+            list(new.values()),
+        )
+        # Followed or deleted concurrently since the checks above.
+        skipped = [
+            username
+            for username, user_id in new.items()
+            if user_id not in inserted
+        ]
+        remaining = _resolve_usernames(skipped) if skipped else {}
+        for username in new:
+            statuses[username] = "followed"
+        for username in skipped:
+            statuses[username] = (
+                "already_following" if username in remaining else "not_found"
+            )
+            del new[username]
+
+    if new:
+        _shift_follow_counters(follower, list(new.values()), 1)
+        backfill_timelines(follower.pk, list(new.values()))
+        invalidate_on_commit(
+            "follows",
+            f"user:{follower.username}",
+            *(f"user:{username}" for username in new),
+        )
+    return [
+        {"username": username, "status": statuses[username]}
+        for username in dict.fromkeys(usernames)
+    ]
+
+
+@transaction.atomic
+def bulk_unfollow(follower, usernames: list[str]) -> list[dict]:
+    user_ids = _resolve_usernames(usernames)
+    followed = _followed_ids(follower, user_ids.values(), lock=True)
+
+    results, removed = [], {}
+    for username in dict.fromkeys(usernames):
+        user_id = user_ids.get(username)
+        if user_id is None:
+            result = "not_found"
+        elif user_id not in followed:
+            result = "not_following"
+        else:
+            result = "unfollowed"
+            removed[username] = user_id
+        results.append({"username": username, "status": result})
+
+    if removed:
+        # The rows are locked above, so exactly these are deleted.
+        with muted_follow_signals():
+            Follow.objects.filter(
+                follower=follower, following__in=removed.values()
+            ).delete()
+        _shift_follow_counters(follower, list(removed.values()), -1)
+        drop_from_timelines(follower.pk, list(removed.values()))
+        invalidate_on_commit(
+            "follows",
+            f"user:{follower.username}",
+            *(f"user:{username}" for username in removed),
+        )
+    return results
+
+
+@transaction.atomic
+def bulk_like(user, post_ids: list[int]) -> list[dict]:
+    existing = set(
+        Post.objects.filter(pk__in=post_ids).values_list("id", flat=True)
+    )
+    liked = _liked_ids(user, existing)
+
+    statuses, new = {}, []
+    for post_id in dict.fromkeys(post_ids):
+        if post_id not in existing:
+            statuses[post_id] = "not_found"
+        elif post_id in liked:
+            statuses[post_id] = "already_liked"
+        else:
+            new.append(post_id)
+
+    if new:
+        now = timezone.now()
+        inserted = _insert_new(
+            Like, {"user": user.pk, "created_at": now}, "post", new
+        )
+        # Liked or deleted concurrently since the checks above.
+        skipped = [post_id for post_id in new if post_id not in inserted]
+        remaining = set(
+            Post.objects.filter(pk__in=skipped).values_list("id", flat=True)
+            if skipped
+            else ()
+        )
+        for post_id in new:
+            if post_id in inserted:
+                statuses[post_id] = "liked"
+            elif post_id in remaining:
+                statuses[post_id] = "already_liked"
+            else:
+                statuses[post_id] = "not_found"
+        new = [post_id for post_id in new if post_id in inserted]
+
+    if new:
+        Post.objects.filter(pk__in=new).update(
+            likes_count=F("likes_count") + 1, updated_at=now
+        )
+        invalidate_on_commit(
+            "posts", *(f"post:{post_id}" for post_id in new)
+        )
+    return [
+        {"post": post_id, "status": statuses[post_id]}
+        for post_id in dict.fromkeys(post_ids)
+    ]
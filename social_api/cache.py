@@ -0,0 +1,264 @@
+import functools
+import hashlib
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+# Per-process hit/miss counters, keyed "<view>.<hit|miss>".
+stats = Counter()
+
+
+def _cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def is_shared(alias: str) -> bool:
+    """Whether every process sees what the cache ``alias`` holds; a write
+    to a local-memory cache is invisible to the other workers."""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def _generation_key(scope: str) -> str:
+    return f"response-cache:gen:{scope}"
+
+
+def _generations(scopes: list[str]) -> list:
+    """Current generation of every scope.
+
+    A missing generation is seeded with a fresh value instead of 0, so
+    responses cached before it was evicted can never be matched again.
+    """
+    cache = _cache()
+    keys = [_generation_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _key(name: str, scopes, request, kwargs, user="") -> str:
+    """Cache key of ``name`` for the request path under the current
+    generations of ``scopes`` (formatted with the view ``kwargs``)."""
+    resolved = [scope.format(**kwargs) for scope in scopes]
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    generations = ".".join(map(str, _generations(resolved)))
+    return f"response-cache:{name}:{generations}:{user}:{path}"
+
+
+def invalidate(*scopes: str) -> None:
+    """Drop every cached response depending on one of ``scopes``."""
+    cache = _cache()
+    for scope in scopes:
+        key = _generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_on_commit(*scopes: str) -> None:
+    """Invalidate now and again once the surrounding transaction commits,
+    so a response cached from pre-commit data does not survive."""
+    invalidate(*scopes)
+    transaction.on_commit(functools.partial(invalidate, *scopes))
+
+
+def cache_response(*scopes: str, vary_on_user: bool = False):
+    """Cache the data of a successful GET response of a view method.
+
+    ``scopes`` are formatted with the view kwargs (e.g. ``"post:{pk}"``)
+    and name what the response depends on; ``invalidate()`` on any of them
+    expires it. The key also covers the full path with query string and,
+    when ``vary_on_user`` is set, the requesting user. Works on both sync
+    and ``async def`` view methods.
+    """
+
+    def decorator(method):
+        name = method.__qualname__
+
+        def key_for(request, kwargs) -> str:
+            user = request.user.pk if vary_on_user else ""
+            return _key(name, scopes, request, kwargs, user)
+
+        def hit(data) -> Response:
+            stats[f"{name}.hit"] += 1
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        if iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                if request.method != "GET":
+                    return await method(view, request, *args, **kwargs)
+
+                key = await sync_to_async(key_for)(request, kwargs)
+                data = await _cache().aget(key)
+                if data is not None:
+                    return hit(data)
+
+                stats[f"{name}.miss"] += 1
+                response = await method(view, request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    await _cache().aset(
+                        key, response.data, settings.RESPONSE_CACHE_TIMEOUT
+                    )
+                response["X-Cache"] = "MISS"
+                return response
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method != "GET":
+                return method(view, request, *args, **kwargs)
+
+            key = key_for(request, kwargs)
+            cache = _cache()
+            data = cache.get(key)
+            if data is not None:
+                return hit(data)
+
+            stats[f"{name}.miss"] += 1
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _version(view, field: str):
+    """Newest ``field`` of the view's queryset, narrowed to the requested
+    object on detail routes; None when there is none."""
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        queryset = view.get_queryset()
+        if lookup_url_kwarg in view.kwargs:
+            queryset = queryset.filter(
+                **{view.lookup_field: view.kwargs[lookup_url_kwarg]}
+            )
+        return (
+            queryset.order_by(f"-{field}")
+            .values_list(field, flat=True)
+            .first()
+        )
+    except (TypeError, ValueError, ValidationError):
+        # Invalid lookups and filters are left for the view to report.
+        return None
+
+
+def conditional_response(
+    *scopes: str, field: str = "updated_at", weak: bool = False
+):
+    """Answer GET requests whose ``If-None-Match`` or ``If-Modified-Since``
+    still holds with 304 Not Modified, before the view method runs.
+
+    The ETag hashes the newest ``field`` of the view's queryset (of the
+    requested object on detail routes), the generations of ``scopes`` as
+    in ``cache_response``, the full path and the accepted media type.
+    Objects get a strong ETag and ``Last-Modified``; list pages a weak
+    ETag, as the newest row only stands for the page. The version read is
+    cached like a response under ``scopes``, so put it above
+    ``cache_response`` with the same scopes and cached responses and
+    their 304s run no query.
+
+    Without a shared cache, views with ``scopes`` get no validators: the
+    generations of this process miss the changes made through the other
+    workers, which would then be answered with 304.
+    """
+
+    def decorator(method):
+        name = f"{method.__qualname__}.version"
+
+        def validators(view, request, kwargs) -> tuple:
+            if scopes and not is_shared(settings.RESPONSE_CACHE_ALIAS):
+                return None, None
+            key = _key(name, scopes, request, kwargs)
+            version = _cache().get(key) if scopes else None
+            if version is None:
+                version = _version(view, field)
+                if version is None:
+                    return None, None
+                if scopes:
+                    _cache().set(
+                        key, version, settings.RESPONSE_CACHE_TIMEOUT
+                    )
+            parts = [key, version.isoformat(), request.accepted_media_type]
+            digest = hashlib.md5("\n".join(parts).encode()).hexdigest()
+            if weak:
+                return f'W/"{digest}"', None
+            return f'"{digest}"', int(version.timestamp())
+
+        def not_modified(request, etag, last_modified):
+            """304 (or 412) response when the request's conditions say
+            so, else None."""
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                tag(response, etag, last_modified)
+            return response
+
+        def tag(response, etag, last_modified):
+            if etag is not None and response.status_code in (
+                status.HTTP_200_OK,
+                status.HTTP_304_NOT_MODIFIED,
+            ):
+                response["ETag"] = etag
+                if last_modified is not None:
+                    response["Last-Modified"] = http_date(last_modified)
+            return response
+
+        if iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await method(view, request, *args, **kwargs)
+
+                etag, last_modified = await sync_to_async(validators)(
+                    view, request, kwargs
+                )
+                if etag is not None and (
+                    response := not_modified(request, etag, last_modified)
+                ):
+                    return response
+                response = await method(view, request, *args, **kwargs)
+                return tag(response, etag, last_modified)
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return method(view, request, *args, **kwargs)
+
+            etag, last_modified = validators(view, request, kwargs)
+            if etag is not None and (
+                response := not_modified(request, etag, last_modified)
+            ):
+                return response
+            response = method(view, request, *args, **kwargs)
+            return tag(response, etag, last_modified)
+
+        return wrapper
+
+    return decorator
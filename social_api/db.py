@@ -0,0 +1,32 @@
+from django.db import connections
+
+# Counters psycopg_pool only reports once they are non-zero.
+POOL_COUNTERS = (
+    "requests_num",
+    "requests_queued",
+    "requests_wait_ms",
+    "requests_errors",
+    "usage_ms",
+    "returns_bad",
+    "connections_num",
+    "connections_ms",
+    "connections_errors",
+    "connections_lost",
+)
+
+
+def pool_stats(alias: str = "default") -> dict | None:
+    """Statistics of this process' connection pool for ``alias``, or None
+    when the database is not pooled.
+
+    ``pool_size``/``pool_available`` are the open and idle connections,
+    ``requests_waiting`` the checkouts currently blocked. Counters since
+    startup include ``requests_num`` checkouts, of which
+    ``requests_queued`` had to wait ``requests_wait_ms`` in total.
+    """
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    stats = dict.fromkeys(POOL_COUNTERS, 0)
+    stats.update(pool.get_stats())
+    return stats
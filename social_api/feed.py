@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.db.models import F, Q, QuerySet, Window
+from django.db.models.functions import RowNumber
+
+from social_api.models import Follow, Post, TimelineEntry
+
+
+def fan_out_post(post: Post) -> bool:
+    """Push a new post into its author's followers' timelines.
+
+    Authors with more than ``FEED_FANOUT_MAX_FOLLOWERS`` followers are
+    skipped; their posts stay ``fanned_out=False`` and are merged into
+    timelines at read time instead, like every post not fanned out yet.
+    """
+    if post.author.followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS:
+        return False
+
+    followers = Follow.objects.filter(following=post.author_id)
+
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(
+                owner_id=follower_id, post=post, created_at=post.created_at
+            )
+            for follower_id in followers.values_list(
+                "follower_id", flat=True
+            ).iterator()
+        ),
+        batch_size=settings.FEED_FANOUT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    Post.objects.filter(pk=post.pk).update(fanned_out=True)
+    post.fanned_out = True
+    return True
+
+
+def backfill_timeline(follow: Follow) -> None:
+    """Copy the followee's recent fanned-out posts into a new follower's
+    timeline so the feed is not empty until they post again."""
+    backfill_timelines(follow.follower_id, [follow.following_id])
+
+
+def backfill_timelines(follower_id: int, following_ids: list[int]) -> None:
+    """``backfill_timeline`` for several new followees in one query."""
+    posts = (
+        Post.objects.filter(author__in=following_ids, fanned_out=True)
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=F("author"),
+                order_by=F("created_at").desc(),
+            )
+        )
+        .filter(rank__lte=settings.FEED_BACKFILL_SIZE)
+        .values_list("id", "created_at")
+    )
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(
+                owner_id=follower_id,
+                post_id=post_id,
+                created_at=created_at,
+            )
+            for post_id, created_at in posts
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def drop_from_timeline(follow: Follow) -> None:
+    drop_from_timelines(follow.follower_id, [follow.following_id])
+
+
+def drop_from_timelines(follower_id: int, following_ids: list[int]) -> None:
+    TimelineEntry.objects.filter(
+        owner=follower_id, post__author__in=following_ids
+    ).delete()
+
+
+def timeline_for(
+    user, position=None, reverse: bool = False, limit: int | None = None
+) -> QuerySet:
+    """Posts for ``user``'s home timeline.
+
+    Fanned-out posts are read from the user's timeline entries, a range of
+    the ``(owner, -created_at)`` index. The followees' posts that are not
+    fanned out are merged in from the partial ``(author, -created_at)``
+    index of unfanned posts (migration 0016): those of authors with more
+    than ``FEED_FANOUT_MAX_FOLLOWERS`` followers, or that had that many
+    when they posted, and those still waiting for ``fan_out_post`` or
+    created without it (admin, shell, ``bulk_create``).
+
+    With ``limit``, just the first ``limit`` entries and unfanned posts
+    past the cursor ``position`` (a ``created_at``; older ones, or newer
+    with ``reverse``) are picked, as ``CreatedAtCursorPagination`` would
+    order and filter them, so a page reads a bounded range of each index.
+    """
+    entries = TimelineEntry.objects.filter(owner=user)
+    unfanned = Post.objects.filter(
+        author__in=Follow.objects.filter(follower=user).values("following"),
+        fanned_out=False,
+    )
+    if limit is None:
+        return Post.objects.filter(
+            Q(pk__in=entries.values("post"))
+            | Q(pk__in=unfanned.values("pk"))
+        )
+
+    if position is not None:
+        lookup = "created_at__gt" if reverse else "created_at__lt"
+        entries = entries.filter(**{lookup: position})
+        unfanned = unfanned.filter(**{lookup: position})
+    order = "" if reverse else "-"
+    post_ids = [
+        *entries.order_by(f"{order}created_at", f"{order}post")
+        .values_list("post", flat=True)[:limit],
+        *unfanned.order_by(f"{order}created_at", f"{order}id")
+        .values_list("id", flat=True)[:limit],
+    ]
+    return Post.objects.filter(pk__in=post_ids)
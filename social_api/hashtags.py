@@ -0,0 +1,90 @@
+import re
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import F, QuerySet, Sum
+from django.utils import timezone
+
+from social_api.models import Hashtag, HashtagBucket, Post, PostHashtag
+
+HASHTAG_RE = re.compile(r"#(\w+)")
+WORD_RE = re.compile(r"\w+")
+MAX_LENGTH = Hashtag._meta.get_field("name").max_length
+
+
+def normalize(tag: str) -> str:
+    return tag.lstrip("#").lower()
+
+
+def parse_tags(title: str, content: str, hashtag: str | None) -> set[str]:
+    """Collect ``#tags`` from the title and content, and every word of the
+    ``hashtag`` field, with or without a leading ``#``."""
+    tags = HASHTAG_RE.findall(title or "") + HASHTAG_RE.findall(content or "")
+    tags += WORD_RE.findall(hashtag or "")
+    return {
+        normalize(tag) for tag in tags if len(tag) <= MAX_LENGTH
+    }
+
+
+def bucket_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def record_usage(hashtag_ids: list[int], moment: datetime) -> None:
+    """Bump the hourly usage bucket of every given hashtag by one."""
+    bucket = bucket_start(moment)
+    HashtagBucket.objects.bulk_create(
+        [
+            HashtagBucket(hashtag_id=hashtag_id, bucket=bucket)
+            for hashtag_id in hashtag_ids
+        ],
+        ignore_conflicts=True,
+    )
+    HashtagBucket.objects.filter(
+        hashtag_id__in=hashtag_ids, bucket=bucket
+    ).update(count=F("count") + 1)
+
+
+def sync_post_tags(post: Post, created: bool) -> None:
+    """Make ``post.tags`` match the tags written in the post."""
+    names = parse_tags(post.title, post.content, post.hashtag)
+    current = (
+        set() if created else set(post.tags.values_list("name", flat=True))
+    )
+
+    removed = current - names
+    if removed:
+        PostHashtag.objects.filter(
+            post=post, hashtag__name__in=removed
+        ).delete()
+
+    added = names - current
+    if added:
+        Hashtag.objects.bulk_create(
+            [Hashtag(name=name) for name in added], ignore_conflicts=True
+        )
+        hashtag_ids = list(
+            Hashtag.objects.filter(name__in=added).values_list(
+                "id", flat=True
+            )
+        )
+        PostHashtag.objects.bulk_create(
+            [
+                PostHashtag(post=post, hashtag_id=hashtag_id)
+                for hashtag_id in hashtag_ids
+            ],
+            ignore_conflicts=True,
+        )
+        record_usage(hashtag_ids, timezone.now())
+
+
+def trending(hours: int | None = None, limit: int | None = None) -> QuerySet:
+    """Hashtags ranked by uses over the last ``hours`` hourly buckets."""
+    hours = hours or settings.HASHTAG_TRENDING_HOURS
+    limit = limit or settings.HASHTAG_TRENDING_LIMIT
+    since = bucket_start(timezone.now()) - timedelta(hours=hours - 1)
+    return (
+        Hashtag.objects.filter(buckets__bucket__gte=since)
+        .annotate(uses=Sum("buckets__count"))
+        .order_by("-uses", "name")[:limit]
+    )
@@ -0,0 +1,170 @@
+import io
+import pathlib
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from social_api.cache import invalidate_on_commit
+from user.authentication import forget_user_on_commit
+
+FORMATS = (("webp", "WEBP"), ("jpeg", "JPEG"))
+# Kept as uploaded; any other format is re-encoded as a .jpg.
+SOURCE_FORMATS = {
+    ".png": "PNG",
+    ".webp": "WEBP",
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+}
+
+
+def _open(field) -> Image.Image:
+    with field.open("rb") as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        return image.convert("RGB")
+
+
+def _encode(image: Image.Image, image_format: str) -> ContentFile:
+    # Only the pixels are written, so EXIF/GPS and other metadata is dropped.
+    buffer = io.BytesIO()
+    image.save(
+        buffer, image_format, quality=settings.IMAGE_QUALITY, optimize=True
+    )
+    return ContentFile(buffer.getvalue())
+
+
+def _delete(storage, names) -> None:
+    for name in names:
+        storage.delete(name)
+
+
+def _changed(instance) -> None:
+    """Expire what still points at the old files; the ``.update()`` that
+    records the new ones sends no signals."""
+    if isinstance(instance, get_user_model()):
+        # Post and follow lists inline the image in ?expand=.
+        invalidate_on_commit(f"user:{instance.username}", "posts", "follows")
+        forget_user_on_commit(instance.pk, claims=False)
+    else:
+        invalidate_on_commit("posts", f"post:{instance.pk}")
+
+
+def process_image(model_label: str, pk: int, field_name: str) -> None:
+    """Sanitize an uploaded image and render its responsive variants.
+
+    The original is re-encoded without metadata, as a ``.jpg`` unless it
+    is a PNG, WebP or JPEG already, and capped to
+    ``IMAGE_MAX_DIMENSION``; every width of ``IMAGE_VARIANT_WIDTHS`` below
+    the original width is rendered as WebP and JPEG next to it. The result
+    is stored in ``<field_name>_variants`` and bumps ``updated_at``.
+    Running it again for an already processed file does nothing.
+
+    New files are saved next to the old ones, which are deleted only once
+    the row points at the new ones, so the image is never missing. If the
+    image was replaced in the meantime, the new files are dropped instead.
+    """
+    model = apps.get_model(model_label)
+    variants_field = f"{field_name}_variants"
+    fields = [field_name, variants_field]
+    if issubclass(model, get_user_model()):
+        fields.append("username")
+    instance = model.objects.filter(pk=pk).only(*fields).first()
+    if instance is None:
+        return
+    field = getattr(instance, field_name)
+    recorded = getattr(instance, variants_field) or {}
+
+    if not field:
+        if recorded:
+            model.objects.filter(pk=pk).update(
+                **{variants_field: {}}, updated_at=timezone.now()
+            )
+            _changed(instance)
+        return
+    if recorded.get("source") == field.name:
+        return
+
+    storage = field.storage
+    image = _open(field)
+    image.thumbnail(
+        (settings.IMAGE_MAX_DIMENSION, settings.IMAGE_MAX_DIMENSION)
+    )
+    original = pathlib.PurePosixPath(field.name)
+    source_format = SOURCE_FORMATS.get(original.suffix.lower())
+    if source_format is None:
+        source_format, original = "JPEG", original.with_suffix(".jpg")
+    source = storage.save(str(original), _encode(image, source_format))
+    written = [source]
+
+    variants = []
+    for width in settings.IMAGE_VARIANT_WIDTHS:
+        if width >= image.width:
+            continue
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for extension, image_format in FORMATS:
+            name = f"{original.stem}-{width}w.{extension}"
+            name = storage.save(
+                str(original.with_name(name)), _encode(resized, image_format)
+            )
+            written.append(name)
+            variants.append(
+                {
+                    "name": name,
+                    "format": extension,
+                    "width": width,
+                    "height": height,
+                }
+            )
+
+    updated = model.objects.filter(pk=pk, **{field_name: field.name}).update(
+        **{
+            field_name: source,
+            variants_field: {
+                "source": source,
+                "width": image.width,
+                "height": image.height,
+                "variants": variants,
+            },
+        },
+        updated_at=timezone.now(),
+    )
+    if updated:
+        _changed(instance)
+        stale = [
+            field.name,
+            *(variant["name"] for variant in recorded.get("variants", ())),
+        ]
+    else:
+        stale = written
+    transaction.on_commit(lambda: _delete(storage, stale))
+
+
+def needs_processing(instance, field_name: str) -> bool:
+    field = getattr(instance, field_name)
+    recorded = getattr(instance, f"{field_name}_variants") or {}
+    return (field.name or None) != recorded.get("source")
+
+
+def srcset(instance, field_name: str, request=None) -> dict:
+    """``{"webp": "<url> 320w, ...", "jpeg": ...}`` for an image field."""
+    recorded = getattr(instance, f"{field_name}_variants") or {}
+    storage = getattr(instance, field_name).storage
+    result = {}
+    for extension, _ in FORMATS:
+        urls = []
+        for variant in recorded.get("variants", ()):
+            if variant["format"] != extension:
+                continue
+            url = storage.url(variant["name"])
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls.append(f"{url} {variant['width']}w")
+        if urls:
+            result[extension] = ", ".join(urls)
+    return result
@@ -0,0 +1,252 @@
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social_api.models import Post
+from social_api.queries import recording
+from user.serializers import ClaimsTokenObtainPairSerializer
+
+SCENARIOS = (
+    "post-list",
+    "post-detail",
+    "feed",
+    "user-search",
+    "follow",
+    "like",
+)
+
+
+def _percentile(timings: list[float], share: float) -> float:
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * share))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the API endpoints in-process as random users with real JWTs "
+        "and report p50/p99 latency, queries per request and throughput per "
+        "scenario. Seed data with seed_graph first; follow and like undo "
+        "their writes. Compare runs with --save and --baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            help="Scenario to run, repeatable (default: all).",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per scenario."
+        )
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Clear the response cache before every request.",
+        )
+        parser.add_argument("--seed", type=int, help="Random seed.")
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument("--save", help="Write the results as JSON here.")
+        parser.add_argument(
+            "--baseline",
+            help="JSON of an earlier run to compare with; fails on "
+            "regressions.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Latency increase over the baseline counted as a "
+            "regression (default 0.2 = 20%%).",
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        users = list(
+            get_user_model()
+            .objects.filter(is_active=True)
+            .order_by("?")[: options["users"]]
+        )
+        self.post_ids = list(Post.objects.values_list("pk", flat=True))
+        if len(users) < 2 or not self.post_ids:
+            raise CommandError("Seed users and posts first (seed_graph).")
+        self.clients = [
+            self.client_for(user, options["host"]) for user in users
+        ]
+        self.usernames = [user.username for user in users]
+        self.cold = options["cold"]
+        self.samples = defaultdict(
+            lambda: {"timings": [], "queries": [], "errors": 0}
+        )
+
+        for scenario in options["scenario"] or SCENARIOS:
+            run = getattr(self, f"run_{scenario.replace('-', '_')}")
+            for _ in range(options["requests"]):
+                run(random.randrange(len(self.clients)))
+
+        results = self.summarize()
+        self.report(results)
+        if options["save"]:
+            with open(options["save"], "w") as file:
+                json.dump(results, file, indent=2)
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+            self.compare(results, baseline, options["tolerance"])
+
+    @staticmethod
+    def client_for(user, host: str) -> APIClient:
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        client = APIClient(SERVER_NAME=host)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def measure(self, name: str, actor: int, method: str, path: str):
+        if self.cold:
+            caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        client = self.clients[actor]
+        sample = self.samples[name]
+        with recording() as log:
+            started = time.perf_counter()
+            response = getattr(client, method)(path)
+            elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            sample["errors"] += 1
+            return response
+        sample["timings"].append(elapsed)
+        sample["queries"].append(log.count)
+        return response
+
+    def run_post_list(self, actor: int) -> None:
+        self.measure(
+            "post-list", actor, "get", reverse("social_api:post-list")
+        )
+
+    def run_post_detail(self, actor: int) -> None:
+        post_id = random.choice(self.post_ids)
+        self.measure(
+            "post-detail",
+            actor,
+            "get",
+            reverse("social_api:post-detail", args=[post_id]),
+        )
+
+    def run_feed(self, actor: int) -> None:
+        self.measure("feed", actor, "get", reverse("social_api:feed"))
+
+    def run_user_search(self, actor: int) -> None:
+        username = random.choice(self.usernames)
+        start = random.randrange(max(1, len(username) - 2))
+        self.measure(
+            "user-search",
+            actor,
+            "get",
+            reverse("user:users_list")
+            + f"?username={username[start:start + 3]}",
+        )
+
+    def run_follow(self, actor: int) -> None:
+        username = random.choice(
+            self.usernames[:actor] + self.usernames[actor + 1:]
+        )
+        follow = self.measure(
+            "follow",
+            actor,
+            "post",
+            reverse("user:follow-user", args=[username]),
+        )
+        if follow.status_code < 400:
+            self.measure(
+                "unfollow",
+                actor,
+                "delete",
+                reverse("user:unfollow-user", args=[username]),
+            )
+
+    def run_like(self, actor: int) -> None:
+        post_id = random.choice(self.post_ids)
+        like = self.measure(
+            "like",
+            actor,
+            "post",
+            reverse("social_api:post-add-like", args=[post_id]),
+        )
+        if like.status_code < 400:
+            self.measure(
+                "unlike",
+                actor,
+                "post",
+                reverse("social_api:post-unlike-post", args=[post_id]),
+            )
+
+    def summarize(self) -> dict:
+        results = {}
+        for name, sample in self.samples.items():
+            timings = sample["timings"]
+            if not timings:
+                results[name] = {"requests": 0, "errors": sample["errors"]}
+                continue
+            results[name] = {
+                "requests": len(timings),
+                "errors": sample["errors"],
+                "p50_ms": statistics.median(timings) * 1000,
+                "p99_ms": _percentile(timings, 0.99) * 1000,
+                "queries": statistics.mean(sample["queries"]),
+                "per_second": len(timings) / sum(timings),
+            }
+        return results
+
+    def report(self, results: dict) -> None:
+        self.stdout.write(
+            f"{'scenario':<12} {'requests':>8} {'errors':>6} {'p50 ms':>8} "
+            f"{'p99 ms':>8} {'queries':>7} {'req/s':>8}"
+        )
+        for name, result in results.items():
+            if not result["requests"]:
+                self.stdout.write(
+                    f"{name:<12} {0:>8} {result['errors']:>6}"
+                )
+                continue
+            self.stdout.write(
+                f"{name:<12} {result['requests']:>8} {result['errors']:>6} "
+                f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['queries']:>7.1f} {result['per_second']:>8.1f}"
+            )
+        self.stdout.write(
+            f"{Post.objects.count()} posts, "
+            f"{get_user_model().objects.count()} users on {connection.vendor}"
+        )
+
+    def compare(self, results: dict, baseline: dict, tolerance: float):
+        regressions = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if not before or not before["requests"] or not result["requests"]:
+                continue
+            if result["queries"] > before["queries"]:
+                regressions.append(
+                    f"{name}: {result['queries']:.1f} queries per request, "
+                    f"was {before['queries']:.1f}"
+                )
+            for key in ("p50_ms", "p99_ms"):
+                if result[key] > before[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{name}: {key} {result[key]:.2f}, "
+                        f"was {before[key]:.2f}"
+                    )
+        if regressions:
+            raise CommandError(
+                "Regressions against the baseline:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
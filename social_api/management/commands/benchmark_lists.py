@@ -0,0 +1,91 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from social_api.models import Follow, Post
+from social_api.renderers import FastJSONRenderer
+from social_api.rows import values_queryset
+from social_api.serializers import FollowListSerializer, PostListSerializer
+from social_api.sparse import sparse_queryset
+
+LISTS = {
+    "posts": (Post, PostListSerializer),
+    "follows": (Follow, FollowListSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark the post and follow list serialization: the newest "
+        "rows as model instances through the serializer and JSONRenderer, "
+        "against .values() rows through ValuesListSerializer and "
+        "FastJSONRenderer. Reports the best of --repeat runs in rows per "
+        "second and fails if the two outputs differ."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list",
+            action="append",
+            choices=LISTS,
+            help="List to run, repeatable (default: all).",
+        )
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'list':<8} {'path':<10} {'rows':>6} {'fetch ms':>9} "
+            f"{'serialize ms':>12} {'render ms':>9} {'rows/s':>9}"
+        )
+        for name in options["list"] or LISTS:
+            model, serializer_class = LISTS[name]
+            queryset = model.objects.order_by("-created_at", "-id")
+            if not queryset.exists():
+                raise CommandError(f"No {name} to list, run seed_graph.")
+            runs = {}
+            for path, values in (("instances", False), ("values", True)):
+                runs[path] = min(
+                    (
+                        self.run(
+                            queryset, serializer_class, options["rows"], values
+                        )
+                        for _ in range(options["repeat"])
+                    ),
+                    key=lambda result: sum(result[0]),
+                )
+                self.report(name, path, *runs[path][:2])
+            if runs["instances"][2] != runs["values"][2]:
+                raise CommandError(f"The {name} outputs differ.")
+            before, after = (sum(runs[path][0]) for path in runs)
+            self.stdout.write(f"{name}: {before / after:.1f}x rows/s")
+
+    @staticmethod
+    def run(queryset, serializer_class, rows: int, values: bool):
+        start = time.perf_counter()
+        if values:
+            queryset = values_queryset(queryset, serializer_class(context={}))
+            renderer = FastJSONRenderer()
+        else:
+            queryset = sparse_queryset(queryset, serializer_class, {})
+            renderer = JSONRenderer()
+        objects = list(queryset[:rows])
+        fetched = time.perf_counter()
+        data = serializer_class(objects, many=True).data
+        serialized = time.perf_counter()
+        content = renderer.render(data)
+        timings = (
+            fetched - start,
+            serialized - fetched,
+            time.perf_counter() - serialized,
+        )
+        return timings, len(objects), content
+
+    def report(self, name: str, path: str, timings: tuple, rows: int):
+        fetch, serialize, render = (timing * 1000 for timing in timings)
+        self.stdout.write(
+            f"{name:<8} {path:<10} {rows:>6} {fetch:>9.2f} "
+            f"{serialize:>12.2f} {render:>9.2f} "
+            f"{rows / sum(timings):>9.0f}"
+        )
@@ -0,0 +1,95 @@
+import random
+import statistics
+import string
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from social_api.models import Post
+
+
+SEARCHES = (
+    ("post title", Post.objects.all(), "title__icontains"),
+    ("post hashtag", Post.objects.all(), "hashtag__icontains"),
+    (
+        "post author",
+        Post.objects.select_related("author"),
+        "author__username__icontains",
+    ),
+    ("user email", get_user_model().objects.all(), "email__icontains"),
+    ("user username", get_user_model().objects.all(), "username__icontains"),
+    ("user bio", get_user_model().objects.all(), "bio__icontains"),
+)
+
+
+def _word(length: int = 8) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=length))
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the icontains search filters used by PostViewSet and "
+        "UserListView, optionally seeding synthetic posts first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=0,
+            help="Seed synthetic posts until the table has this many rows.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Print the query plan of each search.",
+        )
+
+    def handle(self, *args, **options):
+        self.seed(options["posts"], options["batch_size"])
+
+        for label, queryset, lookup in SEARCHES:
+            queryset = queryset.filter(**{lookup: _word(3)})[:20]
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            self.stdout.write(
+                f"{label:<14} p50 {statistics.median(timings):8.2f} ms"
+                f"  p99 {p99:8.2f} ms"
+            )
+            if options["explain"]:
+                self.stdout.write(queryset.explain())
+
+        self.stdout.write(
+            f"{Post.objects.count()} posts on {connection.vendor}"
+        )
+
+    def seed(self, target: int, batch_size: int) -> None:
+        missing = target - Post.objects.count()
+        if missing <= 0:
+            return
+        author, _ = get_user_model().objects.get_or_create(
+            email="benchmark@example.com",
+            defaults={"username": "benchmark"},
+        )
+        while missing > 0:
+            size = min(batch_size, missing)
+            Post.objects.bulk_create(
+                Post(
+                    author=author,
+                    title=f"{_word()} {_word()} {_word()}",
+                    content=_word(40),
+                    hashtag=f"#{_word(6)}",
+                )
+                for _ in range(size)
+            )
+            missing -= size
+            self.stdout.write(f"Seeded, {missing} posts left")
@@ -0,0 +1,112 @@
+import http.client
+import socket
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a URL of a running server from concurrent keep-alive "
+        "connections and report throughput and latency, e.g. to compare "
+        "runserver with the gunicorn profile of entrypoint.sh."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Seconds to run."
+        )
+        parser.add_argument("--token", help="JWT access token to send.")
+        parser.add_argument(
+            "--slow-clients",
+            type=int,
+            default=0,
+            help="Extra connections that trickle their request headers for "
+            "the whole run, like clients on a bad network.",
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme not in ("http", "https"):
+            raise CommandError("Only http(s) URLs are supported.")
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+        path = url.path + (f"?{url.query}" if url.query else "")
+        connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+
+        deadline = time.perf_counter() + options["duration"]
+        timings, errors = [], []
+        lock = threading.Lock()
+
+        def client():
+            connection = connection_class(url.netloc, timeout=30)
+            local_timings, local_errors = [], 0
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status < 400
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    connection = connection_class(url.netloc, timeout=30)
+                    ok = False
+                if ok:
+                    local_timings.append(
+                        (time.perf_counter() - started) * 1000
+                    )
+                else:
+                    local_errors += 1
+            connection.close()
+            with lock:
+                timings.extend(local_timings)
+                errors.append(local_errors)
+
+        def slow_client():
+            try:
+                sock = socket.create_connection(
+                    (url.hostname, url.port or 80), timeout=30
+                )
+                sock.sendall(f"GET {path} HTTP/1.1\r\n".encode())
+                while time.perf_counter() < deadline:
+                    sock.sendall(b"X")
+                    time.sleep(0.5)
+                sock.close()
+            except OSError:
+                pass
+
+        threads = [
+            threading.Thread(target=slow_client)
+            for _ in range(options["slow_clients"])
+        ] + [
+            threading.Thread(target=client)
+            for _ in range(options["concurrency"])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if not timings:
+            raise CommandError(f"All {sum(errors)} requests failed.")
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(
+            f"{len(timings)} ok, {sum(errors)} failed in {elapsed:.1f} s"
+            f"  {len(timings) / elapsed:8.1f} req/s"
+            f"  p50 {statistics.median(timings):8.2f} ms"
+            f"  p99 {p99:8.2f} ms"
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from social_api.models import Comment, Like, Post
+
+
+def _count_subquery(model) -> Coalesce:
+    counts = (
+        model.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.likes_count and Post.comments_count in bulk."
+
+    def handle(self, *args, **options):
+        updated = Post.objects.update(
+            likes_count=_count_subquery(Like),
+            comments_count=_count_subquery(Comment),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted counters for {updated} posts")
+        )
@@ -0,0 +1,228 @@
+import itertools
+import random
+import string
+from bisect import bisect
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from social_api.cache import invalidate
+from social_api.models import Comment, Follow, Like, Post
+from user.authentication import forget_user
+
+
+def _word(length: int = 8) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=length))
+
+
+def _amount(mean: float) -> int:
+    """Exponentially distributed count with the given mean."""
+    return int(random.expovariate(1 / mean)) if mean > 0 else 0
+
+
+def _zipf_weights(size: int, exponent: float) -> list[float]:
+    """Cumulative weights giving rank ``r`` a share of ``1 / (r + 1) ** s``."""
+    weights = (1 / (rank + 1) ** exponent for rank in range(size))
+    return list(itertools.accumulate(weights))
+
+
+def _pick(items: list, cum_weights: list[float]):
+    return items[bisect(cum_weights, random.random() * cum_weights[-1])]
+
+
+def _last_pk(manager) -> int:
+    return manager.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+def _count(model, field: str) -> Coalesce:
+    counts = (
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate a synthetic social graph: users, power-law follows "
+        "and popularity, posts, likes and comments. Seeded posts are not "
+        "fanned out (feeds read them from the followees) and their hashtags "
+        "are not indexed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--posts", type=float, default=10, help="Mean posts per user."
+        )
+        parser.add_argument(
+            "--follows", type=float, default=20, help="Mean follows per user."
+        )
+        parser.add_argument(
+            "--likes", type=float, default=5, help="Mean likes per post."
+        )
+        parser.add_argument(
+            "--comments", type=float, default=2, help="Mean comments per post."
+        )
+        parser.add_argument(
+            "--exponent",
+            type=float,
+            default=1.0,
+            help="Zipf exponent of user and post popularity.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, help="Random seed.")
+        parser.add_argument(
+            "--prefix", default="seed", help="Username and email prefix."
+        )
+        parser.add_argument("--password", default="password")
+
+    def handle(self, *args, **options):
+        if options["users"] < 2:
+            raise CommandError("--users must be at least 2.")
+        random.seed(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        user_ids = self.create_users(
+            options["users"], options["prefix"], options["password"]
+        )
+        # Popularity ranks: followers and likes concentrate on the first.
+        random.shuffle(user_ids)
+        user_weights = _zipf_weights(len(user_ids), options["exponent"])
+
+        follows = self.create_follows(
+            user_ids, user_weights, options["follows"]
+        )
+        post_ids = self.create_posts(user_ids, options["posts"])
+        random.shuffle(post_ids)
+        post_weights = _zipf_weights(len(post_ids), options["exponent"])
+        likes = self.create_likes(
+            user_ids, post_ids, post_weights, options["likes"]
+        )
+        comments = self.create_comments(
+            user_ids, post_ids, post_weights, options["comments"]
+        )
+
+        self.recount(user_ids, post_ids)
+        invalidate("posts", "follows")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(user_ids)} users, {follows} follows, "
+                f"{len(post_ids)} posts, {likes} likes, {comments} comments"
+            )
+        )
+
+    def bulk_create(self, model, objects, **kwargs) -> int:
+        created = 0
+        objects = iter(objects)
+        while batch := list(itertools.islice(objects, self.batch_size)):
+            model.objects.bulk_create(batch, **kwargs)
+            created += len(batch)
+        return created
+
+    def create_users(self, count: int, prefix: str, password: str) -> list:
+        users = get_user_model().objects
+        start = users.filter(username__startswith=prefix).count()
+        last_id = _last_pk(users)
+        password = make_password(password)
+        self.bulk_create(
+            get_user_model(),
+            (
+                get_user_model()(
+                    username=f"{prefix}{index}",
+                    email=f"{prefix}{index}@example.com",
+                    password=password,
+                    bio=f"{_word()} {_word()}",
+                )
+                for index in range(start, start + count)
+            ),
+        )
+        return list(users.filter(pk__gt=last_id).values_list("pk", flat=True))
+
+    def create_follows(self, user_ids, weights, mean: float) -> int:
+        def follows():
+            for follower in user_ids:
+                targets = set()
+                for _ in range(min(_amount(mean), len(user_ids) - 1)):
+                    target = _pick(user_ids, weights)
+                    if target != follower:
+                        targets.add(target)
+                for target in targets:
+                    yield Follow(follower_id=follower, following_id=target)
+
+        return self.bulk_create(Follow, follows(), ignore_conflicts=True)
+
+    def create_posts(self, user_ids, mean: float) -> list:
+        last_id = _last_pk(Post.objects)
+        self.bulk_create(
+            Post,
+            (
+                Post(
+                    author_id=author,
+                    title=f"{_word()} {_word()} {_word()}",
+                    content=f"{_word(40)} #{_word(5)}",
+                    hashtag=f"#{_word(5)}",
+                )
+                for author in user_ids
+                for _ in range(_amount(mean))
+            ),
+        )
+        return list(
+            Post.objects.filter(pk__gt=last_id).values_list("pk", flat=True)
+        )
+
+    def create_likes(self, user_ids, post_ids, weights, mean: float) -> int:
+        if not post_ids:
+            return 0
+        pairs = {
+            (random.choice(user_ids), _pick(post_ids, weights))
+            for _ in range(int(len(post_ids) * mean))
+        }
+        return self.bulk_create(
+            Like,
+            (Like(user_id=user, post_id=post) for user, post in pairs),
+            ignore_conflicts=True,
+        )
+
+    def create_comments(self, user_ids, post_ids, weights, mean: float) -> int:
+        if not post_ids:
+            return 0
+        return self.bulk_create(
+            Comment,
+            (
+                Comment(
+                    user_id=random.choice(user_ids),
+                    post_id=_pick(post_ids, weights),
+                    content=f"{_word()} {_word()}",
+                )
+                for _ in range(int(len(post_ids) * mean))
+            ),
+        )
+
+    def recount(self, user_ids, post_ids) -> None:
+        """bulk_create skips the signals maintaining the counters."""
+        for start in range(0, len(user_ids), self.batch_size):
+            get_user_model().objects.filter(
+                pk__in=user_ids[start:start + self.batch_size]
+            ).update(
+                followers_count=_count(Follow, "following"),
+                following_count=_count(Follow, "follower"),
+                updated_at=timezone.now(),
+            )
+        for user_id in user_ids:
+            forget_user(user_id, claims=False)
+        for start in range(0, len(post_ids), self.batch_size):
+            Post.objects.filter(
+                pk__in=post_ids[start:start + self.batch_size]
+            ).update(
+                likes_count=_count(Like, "post"),
+                comments_count=_count(Comment, "post"),
+                updated_at=timezone.now(),
+            )
@@ -1,18 +1,57 @@
 import time
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import connections, OperationalError
 
 
 class Command(BaseCommand):
+    help = (
+        "Block until the database accepts connections, retrying with "
+        "exponential backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Give up after this many seconds.",
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=5,
+            help="Longest pause between two attempts.",
+        )
+
     def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        deadline = time.monotonic() + options["timeout"]
+        delay = 0.25
         self.stdout.write("Waiting for database")
-        db_conn = None
-        while not db_conn:
+        while True:
             try:
-                db_conn = connections["default"]
-            except OperationalError:
-                self.stdout.write("Database unavailable, waiting 1 second")
-                time.sleep(1)
+                # Looking the connection up does not connect; only a real
+                # round trip proves the server accepts queries.
+                connection.ensure_connection()
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                break
+            except OperationalError as error:
+                connection.close()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f"Database unavailable after {options['timeout']}s: "
+                        f"{error}"
+                    )
+                delay = min(delay * 2, options["max_delay"], remaining)
+                self.stdout.write(
+                    f"Database unavailable, waiting {delay:.1f} seconds"
+                )
+                time.sleep(delay)
 
+        # Leave no connection behind for the next command to inherit.
+        connection.close()
         self.stdout.write(self.style.SUCCESS("Database available"))
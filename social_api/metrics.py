@@ -0,0 +1,200 @@
+"""Prometheus metrics, served on ``/metrics``.
+
+``metrics_middleware`` times every request per route (the URL name, e.g.
+``social_api:post-detail``) and splits it into database time, from the
+execute wrapper of ``social_api.queries``, and serializer time, spent in
+``serializer.data`` minus the queries run meanwhile. Response cache hits
+and misses of ``social_api.cache.stats`` and connection pool statistics
+are exported along.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set (see ``gunicorn.conf.py``) every
+process writes its samples to memory-mapped files there, and ``/metrics``
+sums them over all worker processes.
+"""
+import os
+import threading
+import time
+from collections import Counter as Tally
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from rest_framework.serializers import BaseSerializer
+
+from social_api import cache
+from social_api.db import pool_stats
+from social_api.queries import recording
+
+REQUESTS = Counter(
+    "http_requests", "Requests served.", ["route", "method", "status"]
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to produce a response.",
+    ["route", "method"],
+)
+DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database queries per request.",
+    ["route", "method"],
+)
+SERIALIZER_TIME = Histogram(
+    "http_request_serializer_seconds",
+    "Time spent in serializers per request, without their queries.",
+    ["route", "method"],
+)
+QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries per request.",
+    ["route", "method"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+CACHE_REQUESTS = Counter(
+    "response_cache_requests",
+    "Response cache lookups by cached view and result (hit or miss).",
+    ["view", "result"],
+)
+POOL = Gauge(
+    "db_pool",
+    "Connection pool statistics (see social_api.db.pool_stats).",
+    ["alias", "stat"],
+    multiprocess_mode="livesum",
+)
+
+
+class _Timing:
+    def __init__(self, log):
+        self.log = log
+        self.serializer = 0.0
+        self.depth = 0
+
+
+_timing = ContextVar("request_timing", default=None)
+
+
+def instrument_serializers() -> None:
+    """Time the outermost ``serializer.data`` of each request."""
+    original = BaseSerializer.data.fget
+    if getattr(original, "timed", False):
+        return
+
+    def data(serializer):
+        timing = _timing.get()
+        if timing is None or timing.depth:
+            return original(serializer)
+        start = time.perf_counter()
+        db_start = timing.log.duration
+        timing.depth += 1
+        try:
+            return original(serializer)
+        finally:
+            timing.depth -= 1
+            timing.serializer += (time.perf_counter() - start) - (
+                timing.log.duration - db_start
+            )
+
+    data.timed = True
+    BaseSerializer.data = property(data)
+
+
+_exported_cache_stats = Tally()
+_exported_lock = threading.Lock()
+_pool_exported_at = 0.0
+
+
+def _export_cache_stats() -> None:
+    """Move the new hits and misses of ``cache.stats`` to the counter."""
+    with _exported_lock:
+        for key, count in list(cache.stats.items()):
+            delta = count - _exported_cache_stats[key]
+            if delta:
+                view, result = key.rsplit(".", 1)
+                CACHE_REQUESTS.labels(view, result).inc(delta)
+                _exported_cache_stats[key] = count
+
+
+def _export_pool_stats() -> None:
+    global _pool_exported_at
+    now = time.monotonic()
+    if now - _pool_exported_at < settings.METRICS_POOL_INTERVAL:
+        return
+    _pool_exported_at = now
+    for alias in settings.DATABASES:
+        stats = pool_stats(alias)
+        for stat, value in (stats or {}).items():
+            POOL.labels(alias, stat).set(value)
+
+
+def _observe(request, response, timing: _Timing, duration: float) -> None:
+    match = request.resolver_match
+    route = match.view_name if match else "<unmatched>"
+    method = request.method
+    REQUESTS.labels(route, method, response.status_code).inc()
+    LATENCY.labels(route, method).observe(duration)
+    DB_TIME.labels(route, method).observe(timing.log.duration)
+    SERIALIZER_TIME.labels(route, method).observe(timing.serializer)
+    QUERIES.labels(route, method).observe(timing.log.count)
+    _export_cache_stats()
+    _export_pool_stats()
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """Record the metrics of every request while ``METRICS_ENABLED``."""
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if not settings.METRICS_ENABLED:
+                return await get_response(request)
+            start = time.perf_counter()
+            with recording() as log:
+                timing = _Timing(log)
+                token = _timing.set(timing)
+                try:
+                    response = await get_response(request)
+                finally:
+                    _timing.reset(token)
+            _observe(request, response, timing, time.perf_counter() - start)
+            return response
+
+    else:
+
+        def middleware(request):
+            if not settings.METRICS_ENABLED:
+                return get_response(request)
+            start = time.perf_counter()
+            with recording() as log:
+                timing = _Timing(log)
+                token = _timing.set(timing)
+                try:
+                    response = get_response(request)
+                finally:
+                    _timing.reset(token)
+            _observe(request, response, timing, time.perf_counter() - start)
+            return response
+
+    return middleware
+
+
+def metrics_view(request):
+    """Prometheus text exposition of all worker processes."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:08
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model("social_api", "Post")
+    Like = apps.get_model("social_api", "Like")
+    Comment = apps.get_model("social_api", "Comment")
+
+    def count_of(model):
+        counts = (
+            model.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    Post.objects.update(
+        likes_count=count_of(Like), comments_count=count_of(Comment),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0002_alter_follow_following"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
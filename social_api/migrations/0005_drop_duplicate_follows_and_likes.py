@@ -0,0 +1,56 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:14
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def drop_duplicates(apps, schema_editor):
+    """Remove rows the new constraints would reject, keeping the oldest."""
+    Follow = apps.get_model("social_api", "Follow")
+    Like = apps.get_model("social_api", "Like")
+    Post = apps.get_model("social_api", "Post")
+
+    Follow.objects.filter(follower=models.F("following")).delete()
+    Follow.objects.filter(
+        Exists(
+            Follow.objects.filter(
+                follower=OuterRef("follower"),
+                following=OuterRef("following"),
+                pk__lt=OuterRef("pk"),
+            )
+        )
+    ).delete()
+    deleted, _ = Like.objects.filter(
+        Exists(
+            Like.objects.filter(
+                user=OuterRef("user"),
+                post=OuterRef("post"),
+                pk__lt=OuterRef("pk"),
+            )
+        )
+    ).delete()
+    if deleted:
+        counts = (
+            Like.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        Post.objects.update(
+            likes_count=Coalesce(
+                Subquery(counts, output_field=IntegerField()), 0
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0004_timelineentry"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:17
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+import social_api.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_api", "0006_follow_like_constraints_and_indexes"),
+        ("user", "0004_user_trigram_indexes"),
+    ]
+
+    operations = [
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"),
+                    name="gin_trgm_ops",
+                ),
+                name="post_title_trgm",
+            ),
+        ),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("hashtag"),
+                    name="gin_trgm_ops",
+                ),
+                name="post_hashtag_trgm",
+            ),
+        ),
+    ]
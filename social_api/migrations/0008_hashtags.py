@@ -0,0 +1,116 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0007_post_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Hashtag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="HashtagBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PostHashtag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="hashtagbucket",
+            name="hashtag",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="buckets",
+                to="social_api.hashtag",
+            ),
+        ),
+        migrations.AddField(
+            model_name="posthashtag",
+            name="hashtag",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="post_hashtags",
+                to="social_api.hashtag",
+            ),
+        ),
+        migrations.AddField(
+            model_name="posthashtag",
+            name="post",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="post_hashtags",
+                to="social_api.post",
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="tags",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="posts",
+                through="social_api.PostHashtag",
+                to="social_api.hashtag",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hashtagbucket",
+            index=models.Index(fields=["bucket"], name="hashtag_bucket_bucket"),
+        ),
+        migrations.AddConstraint(
+            model_name="hashtagbucket",
+            constraint=models.UniqueConstraint(
+                fields=("hashtag", "bucket"), name="unique_hashtag_bucket"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="posthashtag",
+            constraint=models.UniqueConstraint(
+                fields=("hashtag", "post"), name="unique_post_hashtag"
+            ),
+        ),
+    ]
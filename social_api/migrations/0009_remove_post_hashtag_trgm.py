@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:40
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+import social_api.operations
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_api", "0008_hashtags"),
+    ]
+
+    operations = [
+        social_api.operations.RemovePostgresIndexConcurrently(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("hashtag"),
+                    name="gin_trgm_ops",
+                ),
+                name="post_hashtag_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:42
+
+import re
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import F
+from django.utils import timezone
+
+# Frozen copies of social_api.hashtags as of this migration, so later
+# changes to the app code do not change what it does.
+HASHTAG_RE = re.compile(r"#(\w+)")
+WORD_RE = re.compile(r"\w+")
+MAX_LENGTH = 100
+
+
+def parse_tags(title: str, content: str, hashtag: str | None) -> set[str]:
+    tags = HASHTAG_RE.findall(title or "") + HASHTAG_RE.findall(content or "")
+    tags += WORD_RE.findall(hashtag or "")
+    return {tag.lower() for tag in tags if len(tag) <= MAX_LENGTH}
+
+
+def bucket_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def backfill_hashtags(apps, schema_editor):
+    Post = apps.get_model("social_api", "Post")
+    Hashtag = apps.get_model("social_api", "Hashtag")
+    PostHashtag = apps.get_model("social_api", "PostHashtag")
+    HashtagBucket = apps.get_model("social_api", "HashtagBucket")
+
+    trending_since = bucket_start(timezone.now()) - timedelta(
+        hours=settings.HASHTAG_TRENDING_HOURS
+    )
+    hashtag_ids = {}
+    posts = Post.objects.values_list(
+        "id", "title", "content", "hashtag", "created_at"
+    )
+    for post_id, title, content, hashtag, created_at in posts.iterator(
+        chunk_size=2000
+    ):
+        names = parse_tags(title, content, hashtag)
+        missing = names - hashtag_ids.keys()
+        if missing:
+            Hashtag.objects.bulk_create(
+                [Hashtag(name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+            hashtag_ids.update(
+                Hashtag.objects.filter(name__in=missing).values_list(
+                    "name", "id"
+                )
+            )
+        PostHashtag.objects.bulk_create(
+            [
+                PostHashtag(post_id=post_id, hashtag_id=hashtag_ids[name])
+                for name in names
+            ],
+            ignore_conflicts=True,
+        )
+        if names and created_at >= trending_since:
+            bucket = bucket_start(created_at)
+            ids = [hashtag_ids[name] for name in names]
+            HashtagBucket.objects.bulk_create(
+                [HashtagBucket(hashtag_id=i, bucket=bucket) for i in ids],
+                ignore_conflicts=True,
+            )
+            HashtagBucket.objects.filter(
+                hashtag_id__in=ids, bucket=bucket
+            ).update(count=F("count") + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0009_remove_post_hashtag_trgm"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_hashtags, migrations.RunPython.noop),
+    ]
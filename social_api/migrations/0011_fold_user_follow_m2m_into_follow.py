@@ -0,0 +1,59 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:05
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fold_m2m_into_follow(apps, schema_editor):
+    """Move User.user_followers/user_following rows into Follow and
+    compute the User follow counters from the merged graph."""
+    User = apps.get_model("user", "User")
+    Follow = apps.get_model("social_api", "Follow")
+
+    followers = User.user_followers.through.objects.values_list(
+        "from_user_id", "to_user_id"
+    )
+    following = User.user_following.through.objects.values_list(
+        "from_user_id", "to_user_id"
+    )
+    # user_followers of A lists users following A; user_following of A
+    # lists users A follows.
+    pairs = {(follower, user) for user, follower in followers}
+    pairs |= {(user, followed) for user, followed in following}
+    Follow.objects.bulk_create(
+        [
+            Follow(follower_id=follower, following_id=followed)
+            for follower, followed in pairs
+            if follower != followed
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    def count_of(field):
+        counts = (
+            Follow.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    User.objects.update(
+        followers_count=count_of("following"),
+        following_count=count_of("follower"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0010_backfill_post_hashtags"),
+        ("user", "0005_user_followers_count_user_following_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(fold_m2m_into_follow, migrations.RunPython.noop),
+    ]
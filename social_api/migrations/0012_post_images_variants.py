@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0011_fold_user_follow_m2m_into_follow"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="images_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
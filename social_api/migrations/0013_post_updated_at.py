@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+import social_api.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_api", "0012_post_images_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="post",
+            index=models.Index(fields=["-updated_at"], name="post_updated"),
+        ),
+    ]
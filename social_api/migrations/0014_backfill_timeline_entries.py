@@ -0,0 +1,67 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:10
+
+from django.conf import settings
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def fan_out_existing_posts(apps, schema_editor):
+    """Fan out the posts created before the timeline existed.
+
+    Posts of authors with at most FEED_FANOUT_MAX_FOLLOWERS followers get
+    timeline entries for their newest FEED_BACKFILL_SIZE posts per author,
+    like a new follow backfills, and are all marked fanned out; the feed
+    only merges unfanned posts of larger authors at read time.
+    """
+    Post = apps.get_model("social_api", "Post")
+    Follow = apps.get_model("social_api", "Follow")
+    TimelineEntry = apps.get_model("social_api", "TimelineEntry")
+
+    pending = Post.objects.filter(
+        fanned_out=False,
+        author__followers_count__lte=settings.FEED_FANOUT_MAX_FOLLOWERS,
+    )
+    author_ids = list(
+        pending.order_by().values_list("author_id", flat=True).distinct()
+    )
+    for author_id in author_ids:
+        posts = list(
+            pending.filter(author_id=author_id)
+            .order_by("-created_at")
+            .values_list("id", "created_at")[: settings.FEED_BACKFILL_SIZE]
+        )
+        followers = Follow.objects.filter(following_id=author_id)
+        entries = []
+        for follower_id in followers.values_list(
+            "follower_id", flat=True
+        ).iterator(chunk_size=BATCH_SIZE):
+            entries += [
+                TimelineEntry(
+                    owner_id=follower_id,
+                    post_id=post_id,
+                    created_at=created_at,
+                )
+                for post_id, created_at in posts
+            ]
+            if len(entries) >= BATCH_SIZE:
+                TimelineEntry.objects.bulk_create(
+                    entries, ignore_conflicts=True
+                )
+                entries = []
+        TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        pending.filter(author_id=author_id).update(fanned_out=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0013_post_updated_at"),
+        ("user", "0008_user_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            fan_out_existing_posts, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+import social_api.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_api", "0014_backfill_timeline_entries"),
+    ]
+
+    operations = [
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="post_created"
+            ),
+        ),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="comment",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="comment_created"
+            ),
+        ),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="like",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="like_created"
+            ),
+        ),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="follow",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="follow_created"
+            ),
+        ),
+    ]
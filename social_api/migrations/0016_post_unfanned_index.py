@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+import social_api.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("social_api", "0015_global_created_indexes"),
+    ]
+
+    operations = [
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-created_at"],
+                condition=models.Q(fanned_out=False),
+                name="post_unfanned_author_created",
+            ),
+        ),
+    ]
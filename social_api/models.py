@@ -1,9 +1,10 @@
 import pathlib
 import uuid
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.text import slugify
 
+from user.model_mixins import CounterFieldsMixin
 from user.models import User
 
 
@@ -23,41 +24,55 @@ class Follow(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     @staticmethod
-    def unique_follow(follower: str, following: str, error_to_raise) -> dict:
-        if follower == following:
+    def create_unique(follower: User, following: User, error_to_raise):
+        """Insert a follow, relying on the database constraints to reject
+        duplicates instead of checking with a SELECT first."""
+        if follower.pk == following.pk:
             raise error_to_raise("You can't follow yourself")
-        if Follow.objects.filter(
-            follower__username=follower, following__username=following
-        ).exists():
+        try:
+            with transaction.atomic():
+                return Follow.objects.create(
+                    follower=follower, following=following
+                )
+        except IntegrityError:
             raise error_to_raise("You have already followed this user")
-        return {"follower": follower, "following": following}
-
-    def clean(self) -> None:
-        Follow.unique_follow(
-            self.follower.username, self.following.username, ValueError)
-
-    def save(
-            self,
-            force_insert=False,
-            force_update=False,
-            using=None,
-            update_fields=None,
-            *args,
-            **kwargs,
-    ):
-        self.full_clean()
-        super(Follow, self).save(
-            force_insert, force_update, using, update_fields,
-        )
 
     def __str__(self):
         return f"{self.follower.username} followed {self.following.username}"
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "following"], name="unique_follow"
+            ),
+            models.CheckConstraint(
+                condition=~models.Q(follower=models.F("following")),
+                name="no_self_follow",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["follower", "-created_at"],
+                name="follow_follower_created",
+            ),
+        ]
+        # PostgreSQL also has a (-created_at, -id) index for the global
+        # list, see migration 0015.
+
+
+class Hashtag(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.name}"
+
+    class Meta:
+        ordering = ["name"]
 
 
-class Post(models.Model):
+class Post(CounterFieldsMixin, models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -67,13 +82,104 @@ class Post(models.Model):
     content = models.TextField()
     hashtag = models.CharField(max_length=255, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Version of the representation for ETag/Last-Modified, also bumped by
+    # likes, comments and image processing.
+    updated_at = models.DateTimeField(auto_now=True)
     images = models.ImageField(null=True, upload_to=post_image_file_path)
+    images_variants = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    fanned_out = models.BooleanField(default=False, editable=False)
+    tags = models.ManyToManyField(
+        Hashtag, through="PostHashtag", related_name="posts", blank=True,
+    )
+
+    counter_fields = ("likes_count", "comments_count", "fanned_out")
 
     def __str__(self):
         return f"{self.author.email} crated {self.title} at {self.created_at}"
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["author", "-created_at"], name="post_author_created"
+            ),
+        ]
+        # PostgreSQL also has a trigram GIN index on UPPER(title) for
+        # icontains, see migration 0007, one on -updated_at for ETags, see
+        # migration 0013, one on (-created_at, -id) for the global list,
+        # see migration 0015, and a partial one on (author, -created_at) of
+        # the posts not fanned out for the feed, see migration 0016.
+
+
+class PostHashtag(models.Model):
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="post_hashtags",
+    )
+    hashtag = models.ForeignKey(
+        Hashtag, on_delete=models.CASCADE, related_name="post_hashtags",
+    )
+
+    def __str__(self):
+        return f"{self.post_id} tagged #{self.hashtag_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hashtag", "post"], name="unique_post_hashtag"
+            ),
+        ]
+
+
+class HashtagBucket(models.Model):
+    """Number of times a hashtag was used within one hour."""
+    hashtag = models.ForeignKey(
+        Hashtag, on_delete=models.CASCADE, related_name="buckets",
+    )
+    bucket = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"#{self.hashtag_id} used {self.count} times at {self.bucket}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hashtag", "bucket"], name="unique_hashtag_bucket"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["bucket"], name="hashtag_bucket_bucket"),
+        ]
+
+
+class TimelineEntry(models.Model):
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="timeline_entries",
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="timeline_entries",
+    )
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.post_id} in timeline of {self.owner_id}"
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "post"], name="unique_timeline_entry"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "-created_at"], name="timeline_owner_created"
+            ),
+        ]
 
 
 class Like(models.Model):
@@ -90,33 +196,30 @@ class Like(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     @staticmethod
-    def unique_like(user: str, post: str, error_to_raise):
-        if Like.objects.filter(user__email=user, post__content=post).exists():
+    def create_unique(user: User, post: "Post", error_to_raise, **kwargs):
+        try:
+            with transaction.atomic():
+                return Like.objects.create(user=user, post=post, **kwargs)
+        except IntegrityError:
             raise error_to_raise("You have already liked this post.")
-        return {"user": user, "post": post}
-
-    def clean(self):
-        Like.unique_like(self.user.email, self.post.content, ValueError)
-
-    def save(self,
-             force_insert=False,
-             force_update=False,
-             using=None,
-             update_fields=None,
-             *args,
-             **kwargs,
-             ):
-        self.full_clean()
-        return super(Like, self).save(
-            force_insert=force_insert,
-            force_update=force_update,
-            using=using,
-            update_fields=update_fields,
-        )
 
     def __str__(self):
         return f"{self.user.email} liked " f"{self.post.id} post"
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "post"], name="unique_like"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["post", "-created_at"], name="like_post_created"
+            ),
+        ]
+        # PostgreSQL also has a (-created_at, -id) index for the global
+        # list, see migration 0015.
+
 
 class Comment(models.Model):
     user = models.ForeignKey(
@@ -133,3 +236,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["post", "-created_at"], name="comment_post_created"
+            ),
+        ]
+        # PostgreSQL also has a (-created_at, -id) index for the global
+        # list, see migration 0015.
@@ -0,0 +1,54 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+
+
+class AddPostgresIndexConcurrently(AddIndexConcurrently):
+    """Concurrently build an index on PostgreSQL only.
+
+    Used for trigram GIN indexes, which other backends (SQLite in tests)
+    cannot build, and for indexes of large tables, which are built without
+    blocking writes. The index is kept out of the migration state, like a
+    ``RunSQL``, so SQLite table rebuilds never try to recreate it and the
+    models do not list it in ``Meta.indexes``.
+    """
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+
+class RemovePostgresIndexConcurrently(AddPostgresIndexConcurrently):
+    """Drop an index created by ``AddPostgresIndexConcurrently``.
+
+    Takes the full index definition so that the migration can be reversed.
+    """
+
+    def describe(self):
+        return "Concurrently drop index %s of model %s" % (
+            self.index.name,
+            self.model_name,
+        )
+
+    @property
+    def migration_name_fragment(self):
+        return "remove_%s_%s" % (self.model_name_lower, self.index.name.lower())
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        super().database_backwards(
+            app_label, schema_editor, from_state, to_state
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        super().database_forwards(
+            app_label, schema_editor, from_state, to_state
+        )
@@ -0,0 +1,20 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Cursor pagination ordered by ``(created_at, id)``, newest first.
+
+    DRF's cursor holds only the ``created_at`` of the last row plus an
+    offset over the rows sharing it, capped at ``offset_cutoff``; ``id``
+    just makes the order stable. Pages are range scans of the
+    ``(-created_at, -id)`` indexes whatever their depth.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class DateJoinedCursorPagination(CreatedAtCursorPagination):
+    ordering = ("-date_joined", "-id")
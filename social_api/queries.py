@@ -0,0 +1,154 @@
+"""Per-request SQL query accounting.
+
+Every database connection gets an execute wrapper that feeds the
+``QueryLog``s active in the current context. ``query_stats_middleware``
+opens one per request and reports it in ``X-DB-*`` headers and the
+``social_api.queries`` log; ``query_budget`` opens one in tests and fails
+when a block runs more queries than allowed.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+_logs = ContextVar("query_logs", default=())
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+
+
+def fingerprint(sql: str) -> str:
+    """``sql`` with literals and placeholder lists collapsed, so the
+    queries of an N+1 loop share one fingerprint."""
+    sql = _LITERALS.sub("?", " ".join(sql.split()))
+    return _PLACEHOLDER_LISTS.sub("(...)", sql)
+
+
+class QueryLog:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def add(self, sql: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Fingerprints run more than once, with their run count."""
+        return {sql: n for sql, n in self.fingerprints.items() if n > 1}
+
+    @property
+    def repeated(self) -> int:
+        """Queries that repeated an earlier fingerprint."""
+        return sum(n - 1 for n in self.duplicates.values())
+
+
+def _record(execute, sql, params, many, context):
+    logs = _logs.get()
+    if not logs:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        for log in logs:
+            log.add(sql, duration)
+
+
+def instrument(connection, **kwargs) -> None:
+    if _record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record)
+
+
+connection_created.connect(instrument)
+
+
+@contextmanager
+def recording():
+    """Collect the queries run in the block, in any thread it hands work
+    to with ``sync_to_async``, into the ``QueryLog`` it yields."""
+    for connection in connections.all(initialized_only=True):
+        instrument(connection)
+    log = QueryLog()
+    token = _logs.set((*_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _logs.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_duplicates: int = 0):
+    """Fail with AssertionError if the block runs more than
+    ``max_queries`` queries or repeats a query fingerprint more than
+    ``max_duplicates`` times in total."""
+    with recording() as log:
+        yield log
+    if log.count > max_queries or log.repeated > max_duplicates:
+        lines = [
+            f"{n}x {sql}" for sql, n in log.fingerprints.most_common()
+        ]
+        raise AssertionError(
+            f"{log.count} queries ({log.repeated} repeated), budget is "
+            f"{max_queries} ({max_duplicates} repeated):\n" + "\n".join(lines)
+        )
+
+
+def _report(request, response, log: QueryLog) -> None:
+    repeated = log.repeated
+    response["X-DB-Queries"] = str(log.count)
+    response["X-DB-Time"] = f"{log.duration * 1000:.1f}"
+    response["X-DB-Duplicates"] = str(repeated)
+
+    match = request.resolver_match
+    endpoint = match.view_name if match else request.path
+    logger.log(
+        logging.WARNING if repeated else logging.INFO,
+        "%s %s: %d queries in %.1f ms, %d repeated",
+        request.method,
+        endpoint,
+        log.count,
+        log.duration * 1000,
+        repeated,
+        extra={"duplicates": log.duplicates},
+    )
+
+
+@sync_and_async_middleware
+def query_stats_middleware(get_response):
+    """Report the queries of each request while ``QUERY_STATS`` is on."""
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if not settings.QUERY_STATS:
+                return await get_response(request)
+            with recording() as log:
+                response = await get_response(request)
+            _report(request, response, log)
+            return response
+
+    else:
+
+        def middleware(request):
+            if not settings.QUERY_STATS:
+                return get_response(request)
+            with recording() as log:
+                response = get_response(request)
+            _report(request, response, log)
+            return response
+
+    return middleware
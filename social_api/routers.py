@@ -0,0 +1,128 @@
+"""Primary/replica database routing.
+
+Reads go to a random alias of ``DATABASE_REPLICAS`` only while a view
+with ``ReplicaReadMixin`` handles a safe request; everything else,
+including all writes, uses ``default``. A user who has just written is
+pinned to the primary for ``READ_YOUR_WRITES_SECONDS`` so they see their
+own likes, comments and follows despite replication lag. The pin is a
+signed cookie on the response of the write, and is also kept in the cache
+when that is shared between workers, for clients that drop cookies.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+from social_api.cache import is_shared
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+PIN_COOKIE = "db_primary_pin"
+_PIN_SALT = "social_api.routers.pin"
+
+
+def reading_from_replica() -> bool:
+    return _replica_reads.get()
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """Route the reads of the block to a replica, e.g. in commands that
+    can tolerate replication lag."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _pin_key(user_id) -> str:
+    return f"db-primary-pin:{user_id}"
+
+
+def pin_to_primary(response, user_id) -> None:
+    """Pin ``user_id`` to the primary for the requests following
+    ``response``."""
+    seconds = settings.READ_YOUR_WRITES_SECONDS
+    response.set_signed_cookie(
+        PIN_COOKIE,
+        str(user_id),
+        salt=_PIN_SALT,
+        max_age=seconds,
+        httponly=True,
+        samesite="Lax",
+    )
+    if is_shared(settings.REPLICA_PIN_CACHE_ALIAS):
+        caches[settings.REPLICA_PIN_CACHE_ALIAS].set(
+            _pin_key(user_id), True, timeout=seconds
+        )
+
+
+def is_pinned(request, user_id) -> bool:
+    pinned = request.get_signed_cookie(
+        PIN_COOKIE,
+        default=None,
+        salt=_PIN_SALT,
+        max_age=settings.READ_YOUR_WRITES_SECONDS,
+    )
+    if pinned == str(user_id):
+        return True
+    # A process-local cache would only know the writes of this worker.
+    return is_shared(settings.REPLICA_PIN_CACHE_ALIAS) and bool(
+        caches[settings.REPLICA_PIN_CACHE_ALIAS].get(_pin_key(user_id))
+    )
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or Django would save an instance read from a replica
+        # back to that replica.
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """Serve the queries of safe requests from a replica, unless the user
+    is pinned to the primary; pin users after successful writes."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        user = request.user
+        _replica_reads.set(
+            request.method in SAFE_METHODS
+            and bool(settings.DATABASE_REPLICAS)
+            and not (user.is_authenticated and is_pinned(request, user.pk))
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        _replica_reads.set(False)
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        user = getattr(request, "user", None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            pin_to_primary(response, user.pk)
+        return response
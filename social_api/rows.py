@@ -0,0 +1,192 @@
+"""List pages serialized from ``.values()`` rows.
+
+Building model instances and walking serializer fields one attribute at a
+time dominates large list responses. When every field a list serializer
+renders is a plain column (possibly across foreign keys), the views of
+``ValuesListMixin`` fetch just those columns with ``.values()`` and
+``ValuesListSerializer`` turns each row into the same dict the serializer
+would have produced, calling the fields' own ``to_representation``. Other
+requests, e.g. with ``?expand=``, take the regular instance path.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import ISO_8601, api_settings
+
+from social_api.renderers import FastJSONRenderer
+from social_api.sparse import SparseQuerysetMixin
+
+# Fields whose representation depends on the column value alone.
+VALUE_FIELDS = (
+    serializers.ReadOnlyField,
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.FloatField,
+    serializers.DecimalField,
+    serializers.DateTimeField,
+    serializers.DateField,
+    serializers.TimeField,
+    serializers.DurationField,
+    serializers.UUIDField,
+    serializers.JSONField,
+)
+
+
+def _lookup(model, attrs: list[str]) -> str | None:
+    """``.values()`` lookup of a field source, or None unless it is a
+    column reached through non-null foreign keys."""
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        if index == len(attrs) - 1:
+            return None if model_field.is_relation else "__".join(attrs)
+        if model_field.null or not (
+            model_field.many_to_one or model_field.one_to_one
+        ):
+            return None
+        model = model_field.related_model
+    return None
+
+
+def _iso_datetime(field):
+    """``DateTimeField.to_representation`` of aware datetimes, looking the
+    field timezone up once instead of for every value."""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    zone = (
+        field.timezone
+        if hasattr(field, "timezone")
+        else field.default_timezone()
+    )
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    if zone is None or type(field).enforce_timezone is not (
+        serializers.DateTimeField.enforce_timezone
+    ):
+        return field.to_representation
+
+    def convert(value):
+        if value.utcoffset() is None:
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(zone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def _converter(field):
+    """``field.to_representation``, or a faster function doing the same."""
+    method = type(field).to_representation
+    if method is serializers.ReadOnlyField.to_representation:
+        return None
+    if method is serializers.CharField.to_representation:
+        return str
+    if method is serializers.IntegerField.to_representation:
+        return int
+    if method is serializers.DateTimeField.to_representation:
+        return _iso_datetime(field)
+    return field.to_representation
+
+
+def row_plan(serializer) -> list[tuple] | None:
+    """``(name, lookup, converter)`` of every field ``serializer`` renders,
+    or None when one of them needs more than a column value."""
+    if (
+        type(serializer).to_representation
+        is not serializers.Serializer.to_representation
+    ):
+        return None
+    model = serializer.Meta.model
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if not isinstance(field, VALUE_FIELDS) or field.source == "*":
+            return None
+        lookup = _lookup(model, field.source_attrs)
+        if lookup is None:
+            return None
+        plan.append((name, lookup, _converter(field)))
+    return plan
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """List serializer rendering ``.values()`` rows through the plan of its
+    child; model instances are serialized as usual.
+
+    Set as ``Meta.list_serializer_class`` of the list serializers that
+    ``ValuesListMixin`` views may feed rows.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        items = list(data)
+        if not items or not isinstance(items[0], dict):
+            return [self.child.to_representation(item) for item in items]
+        plan = row_plan(self.child)
+        ret = []
+        for row in items:
+            item = {}
+            for name, lookup, convert in plan:
+                value = row[lookup]
+                # None is not converted, as in Serializer.to_representation.
+                if value is not None and convert is not None:
+                    value = convert(value)
+                item[name] = value
+            ret.append(item)
+        return ret
+
+
+def values_queryset(queryset, serializer, also=()):
+    """``queryset.values()`` of the columns ``serializer`` renders plus
+    ``also``, or None when it cannot be rendered from rows."""
+    meta = getattr(serializer, "Meta", None)
+    list_serializer_class = getattr(meta, "list_serializer_class", None)
+    if not (
+        isinstance(list_serializer_class, type)
+        and issubclass(list_serializer_class, ValuesListSerializer)
+        and meta.model is queryset.model
+    ):
+        return None
+    plan = row_plan(serializer)
+    if plan is None:
+        return None
+    lookups = [lookup for _, lookup, _ in plan]
+    return queryset.values(*dict.fromkeys([*lookups, *also]))
+
+
+class ValuesListMixin(SparseQuerysetMixin):
+    """View mixin listing ``.values()`` rows when the list serializer can
+    render them, and rendering JSON with ``FastJSONRenderer``."""
+
+    renderer_classes = [
+        FastJSONRenderer if renderer is JSONRenderer else renderer
+        for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+    ]
+
+    def sparse(self, queryset):
+        if (
+            getattr(self, "action", "list") == "list"
+            and self.request.method in SAFE_METHODS
+        ):
+            rows = values_queryset(
+                queryset,
+                self.get_serializer(),
+                also=self.ordering_fields(queryset.model),
+            )
+            if rows is not None:
+                return rows
+        return super().sparse(queryset)
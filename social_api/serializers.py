@@ -1,9 +1,19 @@
+from django.conf import settings
+from django.db.models import Prefetch
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from social_api.models import Post, Follow, Like, Comment
+from social_api.images import srcset
+from social_api.models import Post, Follow, Like, Comment, Hashtag
+from social_api.rows import ValuesListSerializer
+from social_api.sparse import SparseFieldsMixin
+from user.serializers import UserSummarySerializer
 
+AUTHOR = {"author": (UserSummarySerializer, "author")}
+USER = {"user": (UserSummarySerializer, "user")}
 
-class PostSerializer(serializers.ModelSerializer):
+
+class PostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.CharField(source="author.username", read_only=True)
 
     class Meta:
@@ -17,13 +27,14 @@ class PostSerializer(serializers.ModelSerializer):
             "created_at",
             "images",
         )
+        expandable_fields = AUTHOR
 
 
 class PostListSerializer(PostSerializer):
     author = serializers.ReadOnlyField(source="author.email", read_only=True)
-    likes = serializers.IntegerField(source="likes.count", read_only=True)
+    likes = serializers.IntegerField(source="likes_count", read_only=True)
     comments = serializers.IntegerField(
-        source="comments.count",
+        source="comments_count",
         read_only=True,
     )
 
@@ -38,18 +49,21 @@ class PostListSerializer(PostSerializer):
             "likes",
             "hashtag",
         )
+        expandable_fields = AUTHOR
+        list_serializer_class = ValuesListSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     post = serializers.ReadOnlyField(source="post.title", read_only=True)
     user = serializers.ReadOnlyField(source="user.username", read_only=True)
 
     class Meta:
         model = Comment
         fields = ("id", "user", "post", "content", "created_at")
+        expandable_fields = USER
 
 
-class CommentCreateSerializer(serializers.ModelSerializer):
+class CommentCreateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ("id", "content", "created_at")
@@ -61,9 +75,10 @@ class CommentForRetrievePostSerializer(CommentCreateSerializer):
     class Meta:
         model = Comment
         fields = ("user", "content", "created_at")
+        expandable_fields = USER
 
 
-class LikeSerializer(serializers.ModelSerializer):
+class LikeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     post = serializers.ReadOnlyField(source="post.title", read_only=True)
 
     class Meta:
@@ -78,6 +93,7 @@ class LikeListSerializer(LikeSerializer):
     class Meta:
         model = Like
         fields = ("id", "user", "post", "created_at")
+        expandable_fields = USER
 
 
 class LikeCreateSerializer(serializers.ModelSerializer):
@@ -85,6 +101,14 @@ class LikeCreateSerializer(serializers.ModelSerializer):
         model = Like
         fields = ("id", "created_at")
 
+    def create(self, validated_data):
+        return Like.create_unique(
+            validated_data.pop("user"),
+            validated_data.pop("post"),
+            serializers.ValidationError,
+            **validated_data,
+        )
+
 
 class LikeRetrieveSerializer(LikeListSerializer):
     user = serializers.ReadOnlyField(source="user.username", read_only=True)
@@ -92,11 +116,55 @@ class LikeRetrieveSerializer(LikeListSerializer):
     class Meta:
         model = Like
         fields = ("id", "user", "created_at")
+        expandable_fields = USER
+
+
+class URLField(serializers.HyperlinkedIdentityField):
+    """Identity URL as a plain string: a DRF ``Hyperlink`` pickles the
+    ``str()`` of its object into the response cache, which would load
+    columns that sparse querysets leave out."""
+
+    def to_representation(self, value):
+        return str(super().to_representation(value))
+
+
+def _recent_comments() -> Prefetch:
+    return Prefetch(
+        "comments",
+        queryset=Comment.objects.select_related("user")[
+            :settings.POST_INLINE_RELATED_LIMIT
+        ],
+        to_attr="recent_comments",
+    )
 
 
-class PostRetrieveSerializer(serializers.ModelSerializer):
-    comments = CommentForRetrievePostSerializer(many=True, read_only=True)
-    likes = LikeRetrieveSerializer(many=True, read_only=True)
+def _recent_likes() -> Prefetch:
+    return Prefetch(
+        "likes",
+        queryset=Like.objects.select_related("user").order_by(
+            "-created_at", "-id"
+        )[:settings.POST_INLINE_RELATED_LIMIT],
+        to_attr="recent_likes",
+    )
+
+
+class PostRetrieveSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Post detail with only the newest comments and likes inlined.
+
+    The full lists are available through ``comments_url``/``likes_url``.
+    Sparse querysets prefetch the inlined rows into ``recent_comments`` and
+    ``recent_likes`` when they are rendered; without that prefetch they are
+    loaded here.
+    """
+    comments = serializers.SerializerMethodField()
+    likes = serializers.SerializerMethodField()
+    comments_url = URLField(
+        view_name="social_api:post-comments",
+    )
+    likes_url = URLField(
+        view_name="social_api:post-likes",
+    )
+    images_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -106,23 +174,59 @@ class PostRetrieveSerializer(serializers.ModelSerializer):
             "created_at",
             "hashtag",
             "images",
+            "images_srcset",
+            "comments_count",
+            "likes_count",
             "comments",
             "likes",
+            "comments_url",
+            "likes_url",
         )
-
-
-class FollowSerializer(serializers.ModelSerializer):
+        expandable_fields = AUTHOR
+        field_sources = {"images_srcset": ("images", "images_variants")}
+        field_prefetches = {
+            "comments": _recent_comments,
+            "likes": _recent_likes,
+        }
+
+    @extend_schema_field(
+        {"type": "object", "additionalProperties": {"type": "string"}}
+    )
+    def get_images_srcset(self, post):
+        return srcset(post, "images", self.context.get("request"))
+
+    @extend_schema_field(CommentForRetrievePostSerializer(many=True))
+    def get_comments(self, post):
+        comments = getattr(post, "recent_comments", None)
+        if comments is None:
+            comments = post.comments.select_related("user")[
+                :settings.POST_INLINE_RELATED_LIMIT
+            ]
+        return CommentForRetrievePostSerializer(comments, many=True).data
+
+    @extend_schema_field(LikeRetrieveSerializer(many=True))
+    def get_likes(self, post):
+        likes = getattr(post, "recent_likes", None)
+        if likes is None:
+            likes = post.likes.select_related("user").order_by(
+                "-created_at", "-id"
+            )[:settings.POST_INLINE_RELATED_LIMIT]
+        return LikeRetrieveSerializer(likes, many=True).data
+
+
+class FollowSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Follow
         fields = ("id", "follower", "following", "created_at")
+        # Uniqueness is enforced by the database, see Follow.create_unique.
+        validators = []
 
-    def validate(self, attrs):
-        Follow.unique_follow(
-            attrs["follower"].username,
-            attrs["following"].username,
+    def create(self, validated_data):
+        return Follow.create_unique(
+            validated_data["follower"],
+            validated_data["following"],
             serializers.ValidationError,
         )
-        return attrs
 
 
 class FollowListSerializer(FollowSerializer):
@@ -138,9 +242,66 @@ class FollowListSerializer(FollowSerializer):
     class Meta:
         model = Follow
         fields = ("id", "follower", "following")
+        expandable_fields = {
+            "follower": (UserSummarySerializer, "follower"),
+            "following": (UserSummarySerializer, "following"),
+        }
+        list_serializer_class = ValuesListSerializer
 
 
 class FollowRetrieveSerializer(FollowListSerializer):
     class Meta:
         model = Follow
         exclude = ["id"]
+        expandable_fields = FollowListSerializer.Meta.expandable_fields
+
+
+class HashtagSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Hashtag
+        fields = ("id", "name")
+
+
+class TrendingHashtagSerializer(HashtagSerializer):
+    uses = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Hashtag
+        fields = ("id", "name", "uses")
+
+
+class BulkFollowSerializer(serializers.Serializer):
+    usernames = serializers.ListField(
+        child=serializers.CharField(max_length=150),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_ITEMS,
+    )
+
+
+class BulkFollowResultSerializer(serializers.Serializer):
+    username = serializers.CharField()
+    status = serializers.ChoiceField(
+        choices=(
+            "followed",
+            "already_following",
+            "unfollowed",
+            "not_following",
+            "not_found",
+            "self",
+        )
+    )
+
+
+class BulkLikeSerializer(serializers.Serializer):
+    posts = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_ITEMS,
+    )
+
+
+class BulkLikeResultSerializer(serializers.Serializer):
+    post = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=("liked", "already_liked", "not_found")
+    )
@@ -0,0 +1,129 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from social_api.cache import invalidate_on_commit
+from social_api.feed import backfill_timeline, drop_from_timeline
+from social_api.hashtags import sync_post_tags
+from social_api.images import needs_processing
+from social_api.models import Comment, Follow, Like, Post
+from social_api.tasks import schedule_image_processing
+from user.authentication import forget_user_on_commit
+
+TAGGED_FIELDS = {"title", "content", "hashtag"}
+
+_follow_signals_muted = ContextVar("follow_signals_muted", default=False)
+
+
+@contextmanager
+def muted_follow_signals():
+    """Skip the per-row follow handlers in the block; the caller shifts
+    the counters, timelines and caches for the whole batch."""
+    token = _follow_signals_muted.set(True)
+    try:
+        yield
+    finally:
+        _follow_signals_muted.reset(token)
+
+
+def _touch_post(post_id: int, **changes) -> None:
+    """Apply ``changes`` to a post and bump its ``updated_at``."""
+    Post.objects.filter(pk=post_id).update(
+        updated_at=timezone.now(), **changes
+    )
+
+
+def _shift_counter(post_id: int, field: str, delta: int) -> None:
+    """Atomically move a denormalized Post counter by ``delta``."""
+    _touch_post(post_id, **{field: F(field) + delta})
+
+
+def _invalidate_post(post_id: int) -> None:
+    invalidate_on_commit("posts", f"post:{post_id}")
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, update_fields, **kwargs):
+    if update_fields is None or TAGGED_FIELDS & set(update_fields):
+        sync_post_tags(instance, created)
+    if needs_processing(instance, "images"):
+        schedule_image_processing(instance, "images")
+    _invalidate_post(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    _invalidate_post(instance.pk)
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        _shift_counter(instance.post_id, "likes_count", 1)
+        _invalidate_post(instance.post_id)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, **kwargs):
+    _shift_counter(instance.post_id, "likes_count", -1)
+    _invalidate_post(instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        _shift_counter(instance.post_id, "comments_count", 1)
+    else:
+        # The post detail inlines the newest comments.
+        _touch_post(instance.post_id)
+    _invalidate_post(instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    _shift_counter(instance.post_id, "comments_count", -1)
+    _invalidate_post(instance.post_id)
+
+
+def _invalidate_follow(follow: Follow) -> None:
+    usernames = get_user_model().objects.filter(
+        pk__in=(follow.follower_id, follow.following_id)
+    ).values_list("username", flat=True)
+    invalidate_on_commit(
+        "follows", *(f"user:{username}" for username in usernames)
+    )
+
+
+def _shift_follow_counters(follow: Follow, delta: int) -> None:
+    users = get_user_model().objects
+    now = timezone.now()
+    users.filter(pk=follow.follower_id).update(
+        following_count=F("following_count") + delta, updated_at=now
+    )
+    users.filter(pk=follow.following_id).update(
+        followers_count=F("followers_count") + delta, updated_at=now
+    )
+    forget_user_on_commit(follow.follower_id, claims=False)
+    forget_user_on_commit(follow.following_id, claims=False)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created and not _follow_signals_muted.get():
+        _shift_follow_counters(instance, 1)
+        backfill_timeline(instance)
+        _invalidate_follow(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    if _follow_signals_muted.get():
+        return
+    _shift_follow_counters(instance, -1)
+    drop_from_timeline(instance)
+    _invalidate_follow(instance)
@@ -0,0 +1,204 @@
+"""Sparse fieldsets: ``?fields=`` and ``?expand=`` on read requests.
+
+Serializers with ``SparseFieldsMixin`` render only the comma separated
+fields of ``?fields=`` (all by default) plus the relations of
+``?expand=``, which replace their default representation with the
+serializer declared in ``Meta.expandable_fields``. ``sparse_queryset``
+then loads no more than those fields read: ``only()`` their columns,
+``select_related()`` the relations their sources follow and run just the
+``Meta.field_prefetches`` of selected fields.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+def _names(request, param: str) -> set[str] | None:
+    value = getattr(request, "query_params", request.GET).get(param)
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Serializer mixin applying ``?fields=``/``?expand=`` of the request
+    in its context.
+
+    ``Meta.expandable_fields`` maps a field name to ``(serializer class,
+    source)``; ``Meta.field_sources`` names the model fields a method field
+    reads and ``Meta.field_prefetches`` maps a field name to a function
+    returning the ``Prefetch`` it needs.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self._context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        fields = _names(request, "fields")
+        expand = _names(request, "expand") or set()
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        for name in expand & expandable.keys():
+            serializer_class, source = expandable[name]
+            self.fields[name] = serializer_class(
+                source=None if source == name else source, read_only=True
+            )
+        if fields is not None:
+            for name in set(self.fields) - fields - expand:
+                self.fields.pop(name)
+
+
+def _collect(serializer, model, prefix: str, loads: dict) -> None:
+    """Add what ``serializer``'s fields read from ``model`` to ``loads``.
+
+    ``loads["exact"]`` turns False when a field reads something that cannot
+    be named, and then every column is loaded.
+    """
+    meta = serializer.Meta
+    prefetches = getattr(meta, "field_prefetches", {})
+    sources = getattr(meta, "field_sources", {})
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in prefetches and not prefix:
+            loads["prefetch"].append(prefetches[name]())
+            continue
+        if name in sources:
+            loads["only"].update(prefix + source for source in sources[name])
+            continue
+        if field.source == "*":
+            if not isinstance(field, HyperlinkedIdentityField):
+                loads["exact"] = False
+            continue
+        if isinstance(field, ListSerializer):
+            loads["exact"] = False
+            continue
+
+        nested = isinstance(field, BaseSerializer)
+        current, path = model, []
+        for index, attr in enumerate(field.source_attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                loads["exact"] = False
+                break
+            path.append(attr)
+            lookup = prefix + "__".join(path)
+            loads["only"].add(lookup)
+            last = index == len(field.source_attrs) - 1
+            if not model_field.is_relation or (last and not nested):
+                continue
+            if not (model_field.many_to_one or model_field.one_to_one):
+                loads["exact"] = False
+                break
+            loads["related"].add(lookup)
+            current = model_field.related_model
+            if last:
+                _collect(field, current, lookup + "__", loads)
+
+
+def sparse_queryset(queryset, serializer_class, context: dict, also=()):
+    """``queryset`` loading just what ``serializer_class`` renders for the
+    request in ``context``, plus the columns in ``also``."""
+    serializer = serializer_class(context=context)
+    loads = {
+        "only": set(also),
+        "related": set(),
+        "prefetch": [],
+        "exact": True,
+    }
+    _collect(serializer, queryset.model, "", loads)
+    if loads["related"]:
+        queryset = queryset.select_related(*sorted(loads["related"]))
+    if loads["prefetch"]:
+        queryset = queryset.prefetch_related(*loads["prefetch"])
+    if loads["exact"]:
+        pk = queryset.model._meta.pk.name
+        queryset = queryset.only(pk, *sorted(loads["only"]))
+    return queryset
+
+
+class SparseFieldsSchema(AutoSchema):
+    """Documents ``fields``/``expand`` on the GET operations of
+    ``SparseQuerysetMixin`` views."""
+
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        if self.method != "GET":
+            return parameters
+        serializer = self.get_response_serializers()
+        if isinstance(serializer, ListSerializer):
+            serializer = serializer.child
+        if not isinstance(serializer, SparseFieldsMixin):
+            return parameters
+        fields = ", ".join(
+            name
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        )
+        parameters = [
+            *parameters,
+            OpenApiParameter(
+                name="fields",
+                description=f"Comma separated fields to return, of {fields}",
+                type=str,
+            ),
+        ]
+        expandable = getattr(serializer.Meta, "expandable_fields", {})
+        if expandable:
+            parameters.append(
+                OpenApiParameter(
+                    name="expand",
+                    description="Comma separated relations to inline, of "
+                    + ", ".join(expandable),
+                    type=str,
+                )
+            )
+        return parameters
+
+
+class SparseQuerysetMixin:
+    """View mixin narrowing the queryset of read requests to the fields
+    its ``SparseFieldsMixin`` serializer renders."""
+
+    schema = SparseFieldsSchema()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        meta = getattr(serializer_class, "Meta", None)
+        if getattr(meta, "model", None) is queryset.model:
+            queryset = self.sparse(queryset)
+        return queryset
+
+    def sparse(self, queryset):
+        """``queryset`` narrowed to what the serializer of the current read
+        request renders, and the fields the paginator orders by."""
+        serializer_class = self.get_serializer_class()
+        if self.request.method not in SAFE_METHODS or not issubclass(
+            serializer_class, SparseFieldsMixin
+        ):
+            return queryset
+        return sparse_queryset(
+            queryset,
+            serializer_class,
+            self.get_serializer_context(),
+            also=self.ordering_fields(queryset.model),
+        )
+
+    def ordering_fields(self, model) -> list[str]:
+        """Fields of ``model`` the paginator orders by; cursor pagination
+        reads them from the last row."""
+        ordering = getattr(self.paginator, "ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        fields = {field.name for field in model._meta.fields}
+        return [
+            field.lstrip("-")
+            for field in ordering
+            if field.lstrip("-") in fields
+        ]
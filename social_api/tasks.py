@@ -0,0 +1,22 @@
+from jobs.registry import task
+from social_api import feed, images
+from social_api.models import Post
+
+process_image = task()(images.process_image)
+
+
+@task()
+def fan_out_post(post_id: int) -> None:
+    post = Post.objects.select_related("author").filter(pk=post_id).first()
+    if post is not None and not post.fanned_out:
+        feed.fan_out_post(post)
+
+
+def schedule_image_processing(instance, field_name: str) -> None:
+    """Process ``instance.<field_name>`` in a worker once the current
+    transaction commits."""
+    process_image.enqueue(
+        model_label=instance._meta.label,
+        pk=instance.pk,
+        field_name=field_name,
+    )
@@ -0,0 +1,22 @@
+"""Cache settings standing in for two worker processes."""
+import tempfile
+
+_SHARED_LOCATION = tempfile.mkdtemp()
+
+# Both aliases read and write the same files, like workers of one Redis.
+SHARED_CACHES = {
+    alias: {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": _SHARED_LOCATION,
+    }
+    for alias in ("default", "other_worker")
+}
+
+# Every alias has its own memory, like workers with the default LocMem.
+LOCAL_CACHES = {
+    alias: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": alias,
+    }
+    for alias in ("default", "other_worker")
+}
@@ -0,0 +1,126 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from social_api.async_views import (
+    AsyncFollowViewSet,
+    AsyncPostViewSet,
+    read_async,
+)
+from social_api.models import Follow, Post
+from social_api.views import FollowViewSet, PostViewSet
+from user.async_views import AsyncUserDetailView
+from user.serializers import ClaimsTokenObtainPairSerializer
+from user.views import UserDetailView
+
+POST_URL = reverse("social_api:post-list")
+FOLLOW_URL = reverse("social_api:follow-list")
+
+post_list = read_async(
+    PostViewSet,
+    AsyncPostViewSet,
+    {"get": "list", "post": "create"},
+    basename="post",
+    detail=False,
+)
+post_detail = read_async(
+    PostViewSet,
+    AsyncPostViewSet,
+    {"get": "retrieve", "delete": "destroy"},
+    basename="post",
+    detail=True,
+)
+follow_list = read_async(
+    FollowViewSet,
+    AsyncFollowViewSet,
+    {"get": "list"},
+    basename="follow",
+    detail=False,
+)
+user_detail = read_async(
+    UserDetailView, AsyncUserDetailView, {"get": "retrieve"}
+)
+
+
+class AsyncReadViewsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes"
+        )
+        other = get_user_model().objects.create_user(
+            email="test_1@test.test", password="testpassword", username="no"
+        )
+        Follow.objects.create(follower=self.user, following=other)
+        self.post = Post.objects.create(
+            author=self.user, title="test", content="test #async"
+        )
+        Post.objects.create(author=other, title="other", content="other")
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user)
+        self.auth = f"Bearer {token.access_token}"
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)
+        self.factory = APIRequestFactory()
+
+    def call(self, view, method, url, data=None, **kwargs):
+        request = getattr(self.factory, method)(
+            url, data, HTTP_AUTHORIZATION=self.auth
+        )
+        response = async_to_sync(view)(request, **kwargs)
+        response.render()
+        return response
+
+    def assert_same_as_sync(self, view, url, **kwargs):
+        expected = self.client.get(url)
+        response = self.call(view, "get", url, **kwargs)
+
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(json.loads(response.content), expected.json())
+        return response
+
+    def test_post_list(self):
+        self.assert_same_as_sync(post_list, POST_URL)
+        self.assert_same_as_sync(post_list, f"{POST_URL}?title=oth")
+
+    def test_post_retrieve(self):
+        url = reverse("social_api:post-detail", args=[self.post.pk])
+        self.assert_same_as_sync(post_detail, url, pk=str(self.post.pk))
+
+    def test_post_retrieve_missing(self):
+        url = reverse("social_api:post-detail", args=[0])
+        response = self.call(post_detail, "get", url, pk="0")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_follow_list(self):
+        self.assert_same_as_sync(follow_list, FOLLOW_URL)
+
+    def test_user_detail(self):
+        url = reverse("user:users-detail", args=["no"])
+        self.assert_same_as_sync(user_detail, url, username="no")
+
+    def test_second_read_is_cached(self):
+        self.call(post_list, "get", POST_URL)
+        response = self.call(post_list, "get", POST_URL)
+
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_writes_go_to_sync_view(self):
+        response = self.call(
+            post_list, "post", POST_URL, {"title": "new", "content": "new"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Post.objects.filter(title="new").exists())
+
+    def test_auth_required(self):
+        request = self.factory.get(POST_URL)
+        response = async_to_sync(post_list)(request)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,281 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from social_api.models import Follow, Post
+from social_api.tests.caches import LOCAL_CACHES, SHARED_CACHES
+from user import blacklist
+from user.authentication import (
+    ClaimsJWTAuthentication,
+    ClaimsUser,
+    forget_user,
+)
+from user.serializers import ClaimsTokenObtainPairSerializer
+
+MANAGE_USER_URL = reverse("user:manage_user")
+TOKEN_URL = reverse("user:token_obtain_pair")
+REFRESH_URL = reverse("user:token_refresh")
+VERIFY_URL = reverse("user:token_verify")
+LOGOUT_URL = reverse("user:logout")
+LOGOUT_USER_URL = reverse("user:logout_user")
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes"
+        )
+
+    def token(self):
+        return str(
+            ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        )
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def test_token_carries_claims(self):
+        res = APIClient().post(
+            TOKEN_URL, {"email": "test@test.test", "password": "testpassword"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user = self.authenticate(res.data["access"])
+        self.assertIsInstance(user, ClaimsUser)
+
+    def test_claims_are_trusted_without_query(self):
+        token = self.token()
+
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+            self.assertIsInstance(user, get_user_model())
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.username, "yes")
+            self.assertFalse(user.is_staff)
+            self.assertEqual(user, self.user)
+            self.assertIn(
+                str(self.user.pk), str(Post.objects.filter(author=user).query)
+            )
+        self.assertFalse(user.is_loaded)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "test@test.test")
+        with self.assertNumQueries(0):
+            self.authenticate(token).email
+
+    def test_account_change_distrusts_earlier_tokens(self):
+        token = self.token()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        res = client.patch(MANAGE_USER_URL, {"username": "renamed"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user = self.authenticate(token)
+        self.assertNotIsInstance(user, ClaimsUser)
+        self.assertEqual(user.username, "renamed")
+
+    def test_deleted_account_is_rejected(self):
+        token = self.token()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        res = client.delete(MANAGE_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = client.get(MANAGE_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_counter_updates_drop_the_snapshot_and_keep_claims(self):
+        token = self.token()
+        self.authenticate(token).email
+        other = get_user_model().objects.create_user(
+            email="test_1@test.test", password="testpassword", username="no"
+        )
+
+        Follow.objects.create(follower=other, following=self.user)
+
+        user = self.authenticate(token)
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.followers_count, 1)
+
+    def test_logout_does_not_save_the_snapshot(self):
+        token = self.token()
+        self.authenticate(token).email
+        get_user_model().objects.filter(pk=self.user.pk).update(bio="new")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        res = client.post(LOGOUT_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.bio, "new")
+
+    def test_change_on_another_worker_distrusts_earlier_tokens(self):
+        token = self.token()
+        self.assertIsInstance(self.authenticate(token), ClaimsUser)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_staff=True
+        )
+        with self.settings(USER_SNAPSHOT_CACHE_ALIAS="other_worker"):
+            forget_user(self.user.pk)
+
+        user = self.authenticate(token)
+        self.assertNotIsInstance(user, ClaimsUser)
+        self.assertTrue(user.is_staff)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class LocalCacheAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes"
+        )
+        self.token = str(
+            ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        )
+
+    def authenticate(self):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {self.token}"
+        )
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_claims_are_not_trusted_without_a_shared_cache(self):
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+        self.assertNotIsInstance(user, ClaimsUser)
+
+        # Deactivated by a worker whose cache this one cannot see.
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes"
+        )
+        res = self.client.post(
+            TOKEN_URL, {"email": "test@test.test", "password": "testpassword"}
+        )
+        self.refresh = res.data["refresh"]
+
+    def refresh_token(self):
+        return self.client.post(REFRESH_URL, {"refresh": self.refresh})
+
+    def test_refresh_skips_blacklist_query_for_unknown_tokens(self):
+        self.assertEqual(self.refresh_token().status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.refresh_token()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_blacklisted_token_is_rejected(self):
+        self.refresh_token()
+
+        res = self.client.post(LOGOUT_URL, {"refresh": self.refresh})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self.refresh_token().status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        res = self.client.post(VERIFY_URL, {"token": self.refresh})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def logout_on_other_worker(self):
+        with (
+            self.settings(TOKEN_BLACKLIST_CACHE_ALIAS="other_worker"),
+            mock.patch.object(blacklist, "_local", blacklist._ProcessFilter()),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            res = self.client.post(LOGOUT_URL, {"refresh": self.refresh})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_token_blacklisted_by_another_worker_is_rejected(self):
+        self.assertEqual(self.refresh_token().status_code, status.HTTP_200_OK)
+
+        self.logout_on_other_worker()
+
+        self.assertEqual(
+            self.refresh_token().status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_logouts_are_replayed_without_rebuilding_the_filter(self):
+        self.assertEqual(self.refresh_token().status_code, status.HTTP_200_OK)
+
+        self.logout_on_other_worker()
+
+        with mock.patch.object(
+            blacklist, "_build", wraps=blacklist._build
+        ) as build:
+            res = self.refresh_token()
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        build.assert_not_called()
+
+    def test_purge_rebuilds_the_filter(self):
+        self.assertEqual(self.refresh_token().status_code, status.HTTP_200_OK)
+        self.client.post(LOGOUT_URL, {"refresh": self.refresh})
+        OutstandingToken.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        with mock.patch.object(
+            blacklist, "_build", wraps=blacklist._build
+        ) as build:
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("purge_token_blacklist", stdout=StringIO())
+            blacklist.is_blacklisted("unknown")
+            blacklist.is_blacklisted("unknown")
+
+        build.assert_called_once()
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_blacklist_is_queried_without_a_shared_cache(self):
+        self.assertEqual(self.refresh_token().status_code, status.HTTP_200_OK)
+
+        # This worker never sees the other one's log of blacklisted JTIs.
+        self.logout_on_other_worker()
+
+        self.assertEqual(
+            self.refresh_token().status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_purge_deletes_expired_tokens(self):
+        self.client.post(LOGOUT_URL, {"refresh": self.refresh})
+        OutstandingToken.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        call_command("purge_token_blacklist", stdout=StringIO())
+
+        self.assertFalse(OutstandingToken.objects.exists())
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -0,0 +1,118 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase, override_settings
+
+from social_api.models import Comment, Follow, Like, Post
+from social_api.tests.caches import SHARED_CACHES
+
+
+class SeedGraphTests(TestCase):
+    def seed(self, **options):
+        call_command(
+            "seed_graph",
+            users=60,
+            posts=3,
+            follows=8,
+            likes=4,
+            comments=2,
+            seed=1,
+            batch_size=50,
+            stdout=StringIO(),
+            **options,
+        )
+
+    def test_seeds_graph_with_consistent_counters(self):
+        self.seed()
+
+        users = get_user_model().objects
+        self.assertEqual(users.filter(username__startswith="seed").count(), 60)
+        self.assertTrue(Follow.objects.exists())
+        self.assertTrue(Like.objects.exists())
+        self.assertTrue(Comment.objects.exists())
+        for user in users.annotate(followers=Count("follower")):
+            self.assertEqual(user.followers_count, user.followers)
+        for post in Post.objects.annotate(
+            like_rows=Count("likes", distinct=True),
+            comment_rows=Count("comments", distinct=True),
+        ):
+            self.assertEqual(post.likes_count, post.like_rows)
+            self.assertEqual(post.comments_count, post.comment_rows)
+
+    def test_follows_follow_a_power_law(self):
+        self.seed()
+
+        counts = sorted(
+            get_user_model().objects.values_list(
+                "followers_count", flat=True
+            ),
+            reverse=True,
+        )
+        self.assertGreater(counts[0], 4 * counts[len(counts) // 2])
+
+    def test_seeds_again_with_new_users(self):
+        self.seed()
+        self.seed()
+
+        self.assertEqual(get_user_model().objects.count(), 120)
+
+
+# Authenticates from token claims, as with the production Redis cache.
+@override_settings(CACHES=SHARED_CACHES)
+class BenchmarkApiTests(TestCase):
+    def setUp(self):
+        call_command(
+            "seed_graph", users=10, posts=2, seed=1, stdout=StringIO()
+        )
+        self.directory = Path(tempfile.mkdtemp())
+
+    def benchmark(self, **options):
+        out = StringIO()
+        call_command(
+            "benchmark_api",
+            requests=3,
+            seed=1,
+            host="testserver",
+            stdout=out,
+            **options,
+        )
+        return out.getvalue()
+
+    def test_reports_every_scenario_and_undoes_writes(self):
+        follows, likes = Follow.objects.count(), Like.objects.count()
+
+        out = self.benchmark(save=self.directory / "run.json")
+
+        for scenario in ("post-list", "post-detail", "feed", "user-search"):
+            self.assertIn(scenario, out)
+        results = json.loads((self.directory / "run.json").read_text())
+        self.assertEqual(results["post-detail"]["requests"], 3)
+        self.assertEqual(results["post-detail"]["queries"], 4)
+        self.assertEqual(Follow.objects.count(), follows)
+        self.assertEqual(Like.objects.count(), likes)
+
+    def test_fails_on_query_regression(self):
+        baseline = self.directory / "baseline.json"
+        baseline.write_text(
+            json.dumps(
+                {
+                    "post-detail": {
+                        "requests": 3,
+                        "p50_ms": 1000,
+                        "p99_ms": 1000,
+                        "queries": 1,
+                    }
+                }
+            )
+        )
+
+        with self.assertRaisesRegex(CommandError, "post-detail: 4.0 queries"):
+            self.benchmark(
+                scenario=["post-detail"], cold=True, baseline=baseline
+            )
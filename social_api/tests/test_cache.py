@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from social_api.cache import stats
+from social_api.models import Follow, Post
+
+POST_URL = reverse("social_api:post-list")
+FOLLOW_URL = reverse("social_api:follow-list")
+
+
+def detail_url(post_id):
+    return reverse("social_api:post-detail", args=(post_id,))
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.user_1 = get_user_model().objects.create_user(
+            email="test_1@test.test", password="testpassword", username="no",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.post = Post.objects.create(
+            author=self.user_1, title="test", content="test",
+        )
+
+    def test_second_get_is_served_from_cache(self):
+        hits = stats["PostViewSet.list.hit"]
+
+        self.assertEqual(self.client.get(POST_URL)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            res = self.client.get(POST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertEqual(stats["PostViewSet.list.hit"], hits + 1)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(POST_URL)
+        res = self.client.get(POST_URL, {"title": "test"})
+        self.assertEqual(res["X-Cache"], "MISS")
+
+    def test_like_and_comment_invalidate_post(self):
+        self.client.get(detail_url(self.post.id))
+        self.client.get(POST_URL)
+
+        self.client.post(detail_url(self.post.id) + "add-like/")
+        res = self.client.get(detail_url(self.post.id))
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["likes_count"], 1)
+
+        self.client.post(
+            detail_url(self.post.id) + "add-comment/", {"content": "test"}
+        )
+        res = self.client.get(POST_URL)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["comments"], 1)
+
+    def test_follow_invalidates_profile(self):
+        url = reverse("user:users-detail", args=("no",))
+        self.assertEqual(self.client.get(url).data["followers"], 0)
+
+        self.client.post(reverse("user:follow-user", args=("no",)))
+
+        res = self.client.get(url)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["followers"], 1)
+
+    def test_username_and_email_changes_invalidate_lists(self):
+        Follow.objects.create(follower=self.user, following=self.user_1)
+        profile_url = reverse("user:users-detail", args=("no",))
+        for url in (POST_URL, FOLLOW_URL, profile_url):
+            self.client.get(url)
+
+        # Saved like the admin does, outside the API views.
+        self.user_1.username = "renamed"
+        self.user_1.email = "renamed@test.test"
+        self.user_1.save()
+
+        posts = self.client.get(POST_URL)
+        self.assertEqual(posts["X-Cache"], "MISS")
+        self.assertEqual(
+            posts.data["results"][0]["author"], "renamed@test.test"
+        )
+        follows = self.client.get(FOLLOW_URL)
+        self.assertEqual(follows["X-Cache"], "MISS")
+        self.assertEqual(follows.data["results"][0]["following"], "renamed")
+        self.assertEqual(
+            self.client.get(profile_url).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_bio_change_keeps_lists_cached(self):
+        self.client.get(POST_URL)
+
+        self.user_1.bio = "about me"
+        self.user_1.save()
+
+        self.assertEqual(self.client.get(POST_URL)["X-Cache"], "HIT")
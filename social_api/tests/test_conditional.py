@@ -0,0 +1,186 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from social_api.cache import _key
+from social_api.models import Comment, Like, Post
+from social_api.tests.caches import LOCAL_CACHES, SHARED_CACHES
+
+POST_URL = reverse("social_api:post-list")
+
+
+def detail_url(post_id):
+    return reverse("social_api:post-detail", args=[post_id])
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        users = get_user_model().objects
+        self.user = users.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.other = users.create_user(
+            email="test_1@test.test", password="testpassword", username="no",
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="title", content="content"
+        )
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url, res, **headers):
+        return self.client.get(
+            url, headers={"If-None-Match": res["ETag"], **headers}
+        )
+
+    def test_post_detail_not_modified_without_running_view(self):
+        url = detail_url(self.post.id)
+        res = self.client.get(url)
+        self.assertTrue(res["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", res)
+
+        # Evict the cached response and version, not the generation.
+        request = RequestFactory().get(url)
+        kwargs = {"pk": self.post.id}
+        cache.delete_many(
+            _key(f"{view}.retrieve{suffix}", ["post:{pk}"], request, kwargs)
+            for view in ("PostViewSet", "AsyncPostViewSet")
+            for suffix in ("", ".version")
+        )
+        # Only the version is read; the post is neither loaded nor
+        # serialized.
+        with self.assertNumQueries(1):
+            not_modified = self.revalidate(url, res)
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], res["ETag"])
+
+    def test_cached_post_detail_is_revalidated_without_queries(self):
+        url = detail_url(self.post.id)
+        res = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            not_modified = self.revalidate(url, res)
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_likes_and_comments_change_post_etag(self):
+        url = detail_url(self.post.id)
+        res = self.client.get(url)
+
+        Like.objects.create(user=self.other, post=self.post)
+        liked = self.revalidate(url, res)
+        self.assertEqual(liked.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(liked["ETag"], res["ETag"])
+
+        comment = Comment.objects.create(
+            user=self.other, post=self.post, content="hi"
+        )
+        commented = self.revalidate(url, liked)
+        self.assertEqual(commented.status_code, status.HTTP_200_OK)
+
+        comment.content = "edited"
+        comment.save()
+        edited = self.revalidate(url, commented)
+        self.assertEqual(edited.status_code, status.HTTP_200_OK)
+        self.assertEqual(edited.data["comments"][0]["content"], "edited")
+
+    def test_if_modified_since(self):
+        url = detail_url(self.post.id)
+        res = self.client.get(url)
+
+        not_modified = self.client.get(
+            url, headers={"If-Modified-Since": res["Last-Modified"]}
+        )
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_representations_have_their_own_etag(self):
+        url = detail_url(self.post.id)
+        res = self.client.get(url)
+
+        sparse = self.revalidate(url + "?fields=id", res)
+
+        self.assertEqual(sparse.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(sparse["ETag"], res["ETag"])
+
+    def test_missing_post_has_no_etag(self):
+        res = self.client.get(detail_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", res)
+
+    def test_profile_etag_changes_with_follows(self):
+        url = reverse("user:users-detail", args=["no"])
+        res = self.client.get(url)
+        self.assertIn("Last-Modified", res)
+        self.assertEqual(
+            self.revalidate(url, res).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        self.client.post(reverse("user:follow-user", args=["no"]))
+        followed = self.revalidate(url, res)
+
+        self.assertEqual(followed.status_code, status.HTTP_200_OK)
+        self.assertEqual(followed.data["followers"], 1)
+
+    def test_post_list_has_weak_etag(self):
+        older = Post.objects.create(
+            author=self.other, title="older", content="content"
+        )
+        res = self.client.get(POST_URL)
+        self.assertTrue(res["ETag"].startswith('W/"'))
+        self.assertNotIn("Last-Modified", res)
+        self.assertEqual(
+            self.revalidate(POST_URL, res).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        Like.objects.create(user=self.other, post=self.post)
+        liked = self.revalidate(POST_URL, res)
+        self.assertEqual(liked.status_code, status.HTTP_200_OK)
+
+        older.delete()
+        deleted = self.revalidate(POST_URL, liked)
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(deleted.data["results"]), 1)
+
+    def test_like_through_another_worker_changes_post_etag(self):
+        url = detail_url(self.post.id)
+        res = self.client.get(url)
+
+        with self.settings(RESPONSE_CACHE_ALIAS="other_worker"):
+            Like.objects.create(user=self.other, post=self.post)
+
+        liked = self.revalidate(url, res)
+        self.assertEqual(liked.status_code, status.HTTP_200_OK)
+        self.assertEqual(liked.data["likes_count"], 1)
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_no_etag_without_a_shared_cache(self):
+        url = detail_url(self.post.id)
+        res = self.client.get(url)
+
+        # Generations of this process would miss the other workers' likes.
+        self.assertNotIn("ETag", res)
+        self.assertNotIn("Last-Modified", res)
+        self.assertEqual(
+            self.client.get(
+                url, headers={"If-Modified-Since": http_date()}
+            ).status_code,
+            status.HTTP_200_OK,
+        )
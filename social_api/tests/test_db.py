@@ -0,0 +1,69 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+HEALTH_URL = reverse("social_api:health-db")
+COMMAND = "social_api.management.commands.wait_for_db"
+
+
+@patch(f"{COMMAND}.time.sleep")
+class WaitForDbTests(SimpleTestCase):
+    def connection(self, failures):
+        connection = MagicMock()
+        connection.ensure_connection.side_effect = [
+            OperationalError("refused")
+        ] * failures + [None]
+        return connection
+
+    def test_waits_until_a_query_succeeds(self, sleep):
+        connection = self.connection(failures=3)
+
+        with patch(f"{COMMAND}.connections", {"default": connection}):
+            call_command("wait_for_db", stdout=StringIO())
+
+        self.assertEqual(connection.ensure_connection.call_count, 4)
+        connection.cursor().__enter__().execute.assert_called_with("SELECT 1")
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(delays, [0.5, 1, 2])
+
+    def test_gives_up_after_timeout(self, sleep):
+        connection = self.connection(failures=100)
+
+        with patch(f"{COMMAND}.connections", {"default": connection}):
+            with self.assertRaises(CommandError):
+                call_command("wait_for_db", "--timeout=0", stdout=StringIO())
+
+
+class DatabaseHealthTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_admin_only(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword"
+        )
+        self.client.force_authenticate(user)
+
+        res = self.client.get(HEALTH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reports_latency_and_pool(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@test.test", password="testpassword"
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(HEALTH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("latency_ms", res.data)
+        self.assertIsNone(res.data["pool"])
@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from social_api.models import Comment, Follow, Like, Post
+from user.export import aiter_chunks, export_chunks
+
+EXPORT_URL = reverse("user:export_user")
+
+
+def parse(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+class ExportUserTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        users = get_user_model().objects
+        self.user = users.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.other = users.create_user(
+            email="test_1@test.test", password="testpassword", username="no",
+        )
+        self.posts = [
+            Post.objects.create(
+                author=self.user, title=f"title {index}", content="content"
+            )
+            for index in range(3)
+        ]
+        other_post = Post.objects.create(
+            author=self.other, title="other", content="content"
+        )
+        Comment.objects.create(
+            user=self.user, post=other_post, content="comment"
+        )
+        Comment.objects.create(
+            user=self.other, post=self.posts[0], content="not mine"
+        )
+        Like.objects.create(user=self.user, post=other_post)
+        Like.objects.create(user=self.other, post=self.posts[0])
+        Follow.objects.create(follower=self.user, following=self.other)
+        Follow.objects.create(follower=self.other, following=self.user)
+
+    def test_streams_the_rows_of_the_user_as_ndjson(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        self.assertIn(
+            f"user-{self.user.pk}.ndjson", res["Content-Disposition"]
+        )
+        lines = parse(b"".join(res.streaming_content))
+        self.assertEqual(lines[0]["type"], "user")
+        self.assertEqual(lines[0]["username"], "yes")
+        self.assertNotIn("password", lines[0])
+        self.assertEqual(
+            [line["title"] for line in lines if line["type"] == "post"],
+            ["title 0", "title 1", "title 2"],
+        )
+        self.assertEqual(
+            [line["content"] for line in lines if line["type"] == "comment"],
+            ["comment"],
+        )
+        self.assertEqual(
+            len([line for line in lines if line["type"] == "like"]), 1
+        )
+        self.assertEqual(
+            [
+                (line["follower__username"], line["following__username"])
+                for line in lines
+                if line["type"] == "follow"
+            ],
+            [("yes", "no"), ("no", "yes")],
+        )
+        self.assertTrue(lines[1]["created_at"].endswith("Z"))
+
+    def test_requires_authentication(self):
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_rows_are_sent_in_chunks(self):
+        chunks = list(export_chunks(self.user.pk))
+
+        # The profile, then two chunks of posts and one of each other type.
+        self.assertEqual(len(chunks), 6)
+        self.assertEqual(
+            [len(chunk.splitlines()) for chunk in chunks], [1, 2, 1, 1, 1, 2]
+        )
+
+    def test_async_iteration_yields_the_same_chunks(self):
+        async def collect():
+            return [
+                chunk
+                async for chunk in aiter_chunks(export_chunks(self.user.pk))
+            ]
+
+        self.assertEqual(
+            async_to_sync(collect)(), list(export_chunks(self.user.pk))
+        )
+
+    def test_command_writes_the_export(self):
+        out = StringIO()
+
+        call_command("export_user", "yes", chunk_size=1, stdout=out)
+
+        self.assertEqual(
+            out.getvalue().encode(), b"".join(export_chunks(self.user.pk))
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "yes.ndjson")
+            call_command("export_user", "yes", output=path, stdout=out)
+            with open(path, "rb") as output:
+                self.assertEqual(len(parse(output.read())), 8)
+
+    def test_command_rejects_unknown_users(self):
+        with self.assertRaises(CommandError):
+            call_command("export_user", "missing", stdout=StringIO())
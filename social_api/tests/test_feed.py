@@ -0,0 +1,148 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from social_api.models import Follow, Post, TimelineEntry
+
+FEED_URL = reverse("social_api:feed")
+POST_URL = reverse("social_api:post-list")
+
+
+class UnauthenticatedFeedApiTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(FEED_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(JOBS_EAGER=True)
+class AuthenticatedFeedApiTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.author = get_user_model().objects.create_user(
+            email="test_1@test.test", password="testpassword", username="no",
+        )
+        self.stranger = get_user_model().objects.create_user(
+            email="test_2@test.test", password="testpassword", username="hz",
+        )
+        Follow.objects.create(follower=self.user, following=self.author)
+        self.author.refresh_from_db()
+
+    def create_post(self, author, title):
+        self.client.force_authenticate(author)
+        res = self.client.post(POST_URL, {"title": title, "content": title})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Post.objects.get(pk=res.data["id"])
+
+    def feed_ids(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.get(FEED_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in res.data["results"]]
+
+    def test_create_post_fans_out_to_followers(self):
+        post = self.create_post(self.author, "followed")
+        self.create_post(self.stranger, "not followed")
+
+        self.assertTrue(post.fanned_out)
+        self.assertTrue(
+            TimelineEntry.objects.filter(owner=self.user, post=post).exists()
+        )
+        self.assertEqual(self.feed_ids(), [post.id])
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=0)
+    def test_large_author_is_merged_on_read(self):
+        post = self.create_post(self.author, "celebrity")
+
+        self.assertFalse(post.fanned_out)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed_ids(), [post.id])
+
+    @override_settings(JOBS_EAGER=False)
+    def test_posts_not_fanned_out_yet_are_merged_on_read(self):
+        # Still waiting for the fan_out_post job, or created without it.
+        queued = self.create_post(self.author, "queued")
+        created = Post.objects.create(
+            author=self.author, title="shell", content="shell"
+        )
+
+        self.assertFalse(queued.fanned_out)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed_ids(), [created.id, queued.id])
+
+    def test_posts_of_formerly_large_author_are_merged_on_read(self):
+        with self.settings(FEED_FANOUT_MAX_FOLLOWERS=0):
+            post = self.create_post(self.author, "celebrity")
+        self.assertFalse(post.fanned_out)
+
+        # The author now has few enough followers to be fanned out.
+        newer = self.create_post(self.author, "regular")
+
+        self.assertTrue(newer.fanned_out)
+        self.assertEqual(self.feed_ids(), [newer.id, post.id])
+
+    def test_follow_backfills_and_unfollow_drops_timeline(self):
+        post = self.create_post(self.stranger, "later followed")
+        follow = Follow.objects.create(
+            follower=self.user, following=self.stranger
+        )
+        self.assertEqual(self.feed_ids(), [post.id])
+
+        follow.delete()
+        self.assertEqual(self.feed_ids(), [])
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=1)
+    def test_pages_merge_timeline_and_large_authors(self):
+        Follow.objects.create(follower=self.user, following=self.stranger)
+        Follow.objects.create(follower=self.author, following=self.stranger)
+        self.stranger.refresh_from_db()
+        posts = [
+            self.create_post(author, f"post {index}")
+            for index, author in enumerate([self.author, self.stranger] * 3)
+        ]
+        self.assertEqual(
+            [post.fanned_out for post in posts], [True, False] * 3
+        )
+
+        self.client.force_authenticate(self.user)
+        seen = []
+        url = FEED_URL + "?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(len(res.data["results"]), 2)
+            seen += [post["id"] for post in res.data["results"]]
+            url = res.data["next"]
+
+        self.assertEqual(seen, [post.id for post in reversed(posts)])
+        previous = self.client.get(res.data["previous"])
+        self.assertEqual(
+            [post["id"] for post in previous.data["results"]], seen[2:4]
+        )
+
+    def test_migration_fans_out_existing_posts(self):
+        migration = import_module(
+            "social_api.migrations.0014_backfill_timeline_entries"
+        )
+        post = Post.objects.create(
+            author=self.author, title="old", content="old"
+        )
+        self.assertFalse(TimelineEntry.objects.exists())
+
+        migration.fan_out_existing_posts(apps, None)
+
+        post.refresh_from_db()
+        self.assertTrue(post.fanned_out)
+        self.assertTrue(
+            TimelineEntry.objects.filter(owner=self.user, post=post).exists()
+        )
+        self.assertEqual(self.feed_ids(), [post.id])
@@ -1,9 +1,14 @@
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 from social_api.models import Follow
 from social_api.serializers import FollowListSerializer
+from social_api.tests.caches import SHARED_CACHES
 
 FOLLOW_URL = reverse("social_api:follow-list")
 
@@ -17,8 +22,10 @@ class UnauthenticatedAPITest(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(CACHES=SHARED_CACHES)
 class AuthenticatedFollowApiTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.test", password="testpassword", username="yes",
@@ -39,7 +46,7 @@ class AuthenticatedFollowApiTests(APITestCase):
         follows = Follow.objects.all()
         serializer = FollowListSerializer(follows, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
         self.assertEqual(Follow.objects.count(), 2)
 
     def test_filter_follower_by_username(self):
@@ -47,16 +54,16 @@ class AuthenticatedFollowApiTests(APITestCase):
         serializer = FollowListSerializer(self.follow)
         serializer_1 = FollowListSerializer(self.follow_1)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer_1.data, res.data)
-        self.assertNotIn(serializer.data, res.data)
+        self.assertIn(serializer_1.data, res.data["results"])
+        self.assertNotIn(serializer.data, res.data["results"])
 
     def test_filter_following_by_username(self):
         res = self.client.get(FOLLOW_URL, data={"following": "no"})
         serializer = FollowListSerializer(self.follow)
         serializer_1 = FollowListSerializer(self.follow_1)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer.data, res.data)
-        self.assertNotIn(serializer_1.data, res.data)
+        self.assertIn(serializer.data, res.data["results"])
+        self.assertNotIn(serializer_1.data, res.data["results"])
 
     def test_follow_user(self):
         self.user_2 = get_user_model().objects.create_user(
@@ -72,3 +79,115 @@ class AuthenticatedFollowApiTests(APITestCase):
         url = f"/api/v1/user/{self.user.username}/unfollow/"
         res = self.client.delete(url)
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_follow_user_twice_rejected(self):
+        url = f"/api/v1/user/{self.user_1.username}/follow/"
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Follow.objects.count(), 2)
+
+    def test_follow_yourself_rejected(self):
+        url = f"/api/v1/user/{self.user.username}/follow/"
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Follow.objects.count(), 2)
+
+    def test_follow_counters_and_profile_in_one_query(self):
+        self.user_2 = get_user_model().objects.create_user(
+            email="test_2@test.test", password="password_2", username="hz",
+        )
+        self.client.post(f"/api/v1/user/{self.user_2.username}/follow/")
+        self.user.refresh_from_db()
+        self.user_2.refresh_from_db()
+        self.assertEqual(self.user.following_count, 2)
+        self.assertEqual(self.user_2.followers_count, 1)
+
+        # One more query reads the ETag version.
+        with self.assertNumQueries(2):
+            res = self.client.get(f"/api/v1/user/{self.user_2.username}/")
+        self.assertEqual(res.data["followers"], 1)
+        self.assertEqual(res.data["following"], 0)
+
+        self.client.delete(f"/api/v1/user/{self.user_2.username}/unfollow/")
+        self.user_2.refresh_from_db()
+        self.assertEqual(self.user_2.followers_count, 0)
+
+    def test_bulk_follow_and_unfollow(self):
+        for username in ("a", "b"):
+            get_user_model().objects.create_user(
+                email=f"{username}@test.test", username=username,
+            )
+        url = reverse("social_api:follow-bulk-follow")
+        usernames = ["a", "b", "no", "yes", "missing"]
+
+        with self.assertNumQueries(8):
+            res = self.client.post(url, {"usernames": usernames}, "json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in res.data],
+            ["followed", "followed", "already_following", "self", "not_found"],
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.following_count, 3)
+        self.assertEqual(
+            get_user_model().objects.get(username="a").followers_count, 1
+        )
+
+        url = reverse("social_api:follow-bulk-unfollow")
+        res = self.client.post(url, {"usernames": ["a", "no", "hz"]}, "json")
+        self.assertEqual(
+            [item["status"] for item in res.data],
+            ["unfollowed", "unfollowed", "not_found"],
+        )
+        self.assertEqual(
+            list(
+                Follow.objects.filter(follower=self.user).values_list(
+                    "following__username", flat=True
+                )
+            ),
+            ["b"],
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.following_count, 1)
+
+    def test_bulk_follow_counts_only_inserted_follows(self):
+        url = reverse("social_api:follow-bulk-follow")
+        # As if "no" was followed concurrently after the check.
+        with patch("social_api.bulk._followed_ids", return_value=set()):
+            res = self.client.post(url, {"usernames": ["no"]}, "json")
+
+        self.assertEqual(
+            res.data, [{"username": "no", "status": "already_following"}]
+        )
+        self.user.refresh_from_db()
+        self.user_1.refresh_from_db()
+        self.assertEqual(self.user.following_count, 1)
+        self.assertEqual(self.user_1.followers_count, 1)
+
+    def test_bulk_follow_skips_users_deleted_after_the_check(self):
+        users = get_user_model().objects
+        for username in ("hz", "ok"):
+            users.create_user(
+                email=f"{username}@test.test",
+                password="testpassword",
+                username=username,
+            )
+        url = reverse("social_api:follow-bulk-follow")
+
+        def followed_ids(follower, user_ids, lock=False):
+            users.filter(username="hz").delete()
+            return set()
+
+        with patch("social_api.bulk._followed_ids", side_effect=followed_ids):
+            res = self.client.post(url, {"usernames": ["hz", "ok"]}, "json")
+
+        self.assertEqual(
+            res.data,
+            [
+                {"username": "hz", "status": "not_found"},
+                {"username": "ok", "status": "followed"},
+            ],
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.following_count, 2)
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from importlib import import_module
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from social_api.hashtags import bucket_start, parse_tags
+from social_api.models import Hashtag, HashtagBucket, Post
+
+POST_URL = reverse("social_api:post-list")
+TRENDING_URL = reverse("social_api:hashtag-trending")
+
+
+class ParseTagsTests(TestCase):
+    def test_parse_tags(self):
+        tags = parse_tags("Hello #Go", "about #golang", "#django, python")
+        self.assertEqual(tags, {"go", "golang", "django", "python"})
+
+    def test_backfill_migration_parses_tags(self):
+        migration = import_module(
+            "social_api.migrations.0010_backfill_post_hashtags"
+        )
+
+        self.assertEqual(
+            migration.parse_tags(
+                "Hello #Go", "about #golang #" + "x" * 101, "#django, py"
+            ),
+            {"go", "golang", "django", "py"},
+        )
+        self.assertEqual(
+            migration.bucket_start(datetime(2026, 10, 18, 9, 41, 5, 17)),
+            datetime(2026, 10, 18, 9),
+        )
+
+
+class UnauthenticatedHashtagApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(TRENDING_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedHashtagApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.post = Post.objects.create(
+            author=self.user, title="test #go", content="test", hashtag="#go",
+        )
+        self.post_1 = Post.objects.create(
+            author=self.user, title="test", content="test", hashtag="#golang",
+        )
+
+    def test_tags_synced_on_save(self):
+        self.assertEqual(
+            set(self.post.tags.values_list("name", flat=True)), {"go"}
+        )
+
+        self.post.hashtag = "#rust"
+        self.post.save()
+
+        self.assertEqual(
+            set(self.post.tags.values_list("name", flat=True)),
+            {"go", "rust"},
+        )
+
+    def test_filter_post_by_exact_hashtag(self):
+        res = self.client.get(POST_URL, {"hashtag": "go"})
+        ids = [post["id"] for post in res.data["results"]]
+        self.assertEqual(ids, [self.post.id])
+
+    def test_trending_hashtags(self):
+        Post.objects.create(
+            author=self.user, title="more", content="#golang", hashtag="",
+        )
+        stale = bucket_start(timezone.now() - timedelta(days=3))
+        HashtagBucket.objects.create(
+            hashtag=Hashtag.objects.get(name="go"), bucket=stale, count=100,
+        )
+
+        res = self.client.get(TRENDING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(tag["name"], tag["uses"]) for tag in res.data],
+            [("golang", 2), ("go", 1)],
+        )
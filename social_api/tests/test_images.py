@@ -0,0 +1,165 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from social_api.images import _open, process_image
+from social_api.models import Post
+
+POST_URL = reverse("social_api:post-list")
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_upload(width=1000, height=500, name="photo.jpg"):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, "JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    JOBS_EAGER=True,
+    IMAGE_MAX_DIMENSION=800,
+    IMAGE_VARIANT_WIDTHS=(200, 400, 1600),
+)
+class ImageProcessingTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_post(self, name="photo.jpg"):
+        payload = {
+            "title": "test",
+            "content": "test",
+            "images": image_upload(name=name),
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(POST_URL, payload, format="multipart")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Post.objects.get(pk=res.data["id"])
+
+    def test_upload_is_sanitized_and_variants_recorded(self):
+        post = self.create_post()
+
+        with Image.open(post.images.path) as original:
+            self.assertEqual(original.size, (800, 400))
+            self.assertEqual(len(original.getexif()), 0)
+        self.assertEqual(
+            [
+                (variant["format"], variant["width"], variant["height"])
+                for variant in post.images_variants["variants"]
+            ],
+            [
+                ("webp", 200, 100),
+                ("jpeg", 200, 100),
+                ("webp", 400, 200),
+                ("jpeg", 400, 200),
+            ],
+        )
+
+        res = self.client.get(
+            reverse("social_api:post-detail", args=(post.id,))
+        )
+        self.assertIn("-200w.webp 200w, ", res.data["images_srcset"]["webp"])
+        self.assertTrue(
+            res.data["images_srcset"]["jpeg"].endswith("-400w.jpeg 400w")
+        )
+
+    def test_other_formats_are_saved_as_jpg(self):
+        post = self.create_post(name="photo.gif")
+
+        self.assertTrue(post.images.name.endswith(".jpg"))
+        with Image.open(post.images.path) as original:
+            self.assertEqual(original.format, "JPEG")
+
+    def test_cached_detail_follows_the_processed_files(self):
+        post = self.create_post()
+        url = reverse("social_api:post-detail", args=(post.id,))
+        old = post.images.name
+        self.assertTrue(self.client.get(url).data["images"].endswith(old))
+        Post.objects.filter(pk=post.pk).update(
+            images_variants={**post.images_variants, "source": None}
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            process_image("social_api.Post", post.pk, "images")
+
+        post.refresh_from_db()
+        res = self.client.get(url)
+        self.assertFalse(post.images.storage.exists(old))
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertTrue(res.data["images"].endswith(post.images.name))
+
+    def test_processing_is_idempotent(self):
+        post = self.create_post()
+        variants = post.images_variants
+
+        process_image("social_api.Post", post.pk, "images")
+
+        post.refresh_from_db()
+        self.assertEqual(post.images_variants, variants)
+
+    def test_replaced_files_are_deleted_after_the_row_moves_on(self):
+        post = self.create_post()
+        storage = post.images.storage
+        old = [post.images.name] + [
+            variant["name"] for variant in post.images_variants["variants"]
+        ]
+        # Processed again, e.g. after a retry.
+        Post.objects.filter(pk=post.pk).update(
+            images_variants={**post.images_variants, "source": None}
+        )
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            process_image("social_api.Post", post.pk, "images")
+        post.refresh_from_db()
+        new = [post.images.name] + [
+            variant["name"] for variant in post.images_variants["variants"]
+        ]
+        self.assertTrue(set(new).isdisjoint(old))
+        self.assertTrue(all(storage.exists(name) for name in old + new))
+
+        for callback in callbacks:
+            callback()
+        self.assertFalse(any(storage.exists(name) for name in old))
+        self.assertTrue(all(storage.exists(name) for name in new))
+
+    def test_files_are_dropped_when_the_image_changed_meanwhile(self):
+        post = self.create_post()
+        Post.objects.filter(pk=post.pk).update(images_variants={})
+        directory = os.path.dirname(post.images.path)
+        before = set(os.listdir(directory))
+
+        def open_and_replace(field):
+            Post.objects.filter(pk=post.pk).update(images="other.jpg")
+            return _open(field)
+
+        with patch(
+            "social_api.images._open", open_and_replace
+        ), self.captureOnCommitCallbacks(execute=True):
+            process_image("social_api.Post", post.pk, "images")
+
+        post.refresh_from_db()
+        self.assertEqual(post.images.name, "other.jpg")
+        self.assertEqual(set(os.listdir(directory)), before)
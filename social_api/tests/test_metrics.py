@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from prometheus_client import REGISTRY
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from social_api.cache import stats
+from social_api.models import Comment, Post
+from social_api.tests.caches import SHARED_CACHES
+
+METRICS_URL = reverse("metrics")
+POST_URL = reverse("social_api:post-list")
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class MetricsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="title", content="content"
+        )
+        Comment.objects.create(user=self.user, post=self.post, content="hi")
+        self.client.force_authenticate(self.user)
+
+    def test_records_requests_per_route(self):
+        route = {"route": "social_api:post-detail", "method": "GET"}
+        requests = sample("http_requests_total", status="200", **route)
+        queries = sample("http_request_db_queries_sum", **route)
+        serializer = sample("http_request_serializer_seconds_count", **route)
+
+        self.client.get(reverse("social_api:post-detail", args=[self.post.id]))
+
+        self.assertEqual(
+            sample("http_requests_total", status="200", **route), requests + 1
+        )
+        self.assertEqual(
+            sample("http_request_db_queries_sum", **route), queries + 4
+        )
+        self.assertEqual(
+            sample("http_request_serializer_seconds_count", **route),
+            serializer + 1,
+        )
+        self.assertGreater(
+            sample("http_request_duration_seconds_sum", **route), 0
+        )
+
+    def test_exports_cache_hits_and_misses(self):
+        self.client.get(POST_URL)
+        self.client.get(POST_URL)
+
+        for result in ("hit", "miss"):
+            self.assertEqual(
+                sample(
+                    "response_cache_requests_total",
+                    view="PostViewSet.list",
+                    result=result,
+                ),
+                stats[f"PostViewSet.list.{result}"],
+            )
+
+    def test_metrics_endpoint(self):
+        self.client.get(POST_URL)
+        self.client.logout()
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            b'http_requests_total{method="GET",route="social_api:post-list"',
+            res.content,
+        )
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        labels = {"route": "social_api:post-list", "method": "GET"}
+        count = sample("http_request_duration_seconds_count", **labels)
+
+        self.client.get(POST_URL)
+
+        self.assertEqual(
+            sample("http_request_duration_seconds_count", **labels), count
+        )
@@ -1,11 +1,17 @@
-from django.test import TestCase
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from social_api.models import Post, Comment, Like
 from social_api.serializers import PostListSerializer, PostRetrieveSerializer
+from social_api.tests.caches import SHARED_CACHES
 
 
 POST_URL = reverse("social_api:post-list")
@@ -24,8 +30,10 @@ class UnauthenticatedPostApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(CACHES=SHARED_CACHES)
 class AuthenticatedPostApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.test", password="testpassword"
@@ -74,8 +82,8 @@ class AuthenticatedPostApiTests(TestCase):
         serializer_1 = PostListSerializer(self.post)
         serializer_2 = PostListSerializer(self.post_1)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer_1.data, res.data)
-        self.assertNotIn(serializer_2.data, res.data)
+        self.assertIn(serializer_1.data, res.data["results"])
+        self.assertNotIn(serializer_2.data, res.data["results"])
 
     def test_get_invalid_post(self):
         invalid_id = self.post_1.id + 1
@@ -84,10 +92,38 @@ class AuthenticatedPostApiTests(TestCase):
 
     def test_retrieve_post_detail(self):
         res = self.client.get(detail_url(self.post.id))
-        serializer = PostRetrieveSerializer(self.post)
+        serializer = PostRetrieveSerializer(
+            self.post, context={"request": res.wsgi_request}
+        )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    @override_settings(POST_INLINE_RELATED_LIMIT=3)
+    def test_retrieve_post_query_count_and_inline_limit(self):
+        for index in range(6):
+            user = get_user_model().objects.create_user(
+                email=f"liker_{index}@test.test", username=f"liker_{index}",
+            )
+            Like.objects.create(user=user, post=self.post)
+            Comment.objects.create(user=user, post=self.post, content="test")
+
+        # ETag version, post, comments and likes.
+        with self.assertNumQueries(4):
+            res = self.client.get(detail_url(self.post.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["comments"]), 3)
+        self.assertEqual(len(res.data["likes"]), 3)
+        self.assertEqual(res.data["comments"][0]["user"], "liker_5")
+        self.assertEqual(res.data["likes_count"], 6)
+
+        res = self.client.get(res.data["comments_url"], {"page_size": 4})
+        self.assertEqual(len(res.data["results"]), 4)
+        self.assertIsNotNone(res.data["next"])
+
+        res = self.client.get(detail_url(self.post.id) + "likes/")
+        self.assertEqual(len(res.data["results"]), 6)
+
     def test_update_post(self):
         payload = {
             "author": self.user.id,
@@ -133,6 +169,62 @@ class AuthenticatedPostApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Like.objects.count(), 1)
 
+    def test_add_like_twice_rejected(self):
+        url = f"/api/v1/social_api/posts/{self.post_1.id}/add-like/"
+        self.client.post(url)
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Like.objects.count(), 1)
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.likes_count, 1)
+
+    def test_bulk_like(self):
+        Like.objects.create(user=self.user, post=self.post)
+        url = reverse("social_api:like-bulk")
+        payload = {"posts": [self.post.id, self.post_1.id, self.post_1.id + 1]}
+
+        res = self.client.post(url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in res.data],
+            ["already_liked", "liked", "not_found"],
+        )
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.likes_count, 1)
+        self.assertEqual(Like.objects.count(), 2)
+
+        # As if post_1 was liked concurrently after the check.
+        with patch("social_api.bulk._liked_ids", return_value=set()):
+            res = self.client.post(url, payload, format="json")
+
+        self.assertEqual(
+            [item["status"] for item in res.data],
+            ["already_liked", "already_liked", "not_found"],
+        )
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.likes_count, 1)
+
+    def test_bulk_like_skips_posts_deleted_after_the_check(self):
+        url = reverse("social_api:like-bulk")
+
+        def liked_ids(user, post_ids):
+            Post.objects.filter(pk=self.post_1.id).delete()
+            return set()
+
+        with patch("social_api.bulk._liked_ids", side_effect=liked_ids):
+            res = self.client.post(
+                url, {"posts": [self.post.id, self.post_1.id]}, format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in res.data], ["liked", "not_found"]
+        )
+        self.assertEqual(
+            list(Like.objects.values_list("post", flat=True)), [self.post.id]
+        )
+
     def test_unlike_post(self):
         Like.objects.create(user=self.user, post=self.post_1)
         url = f"/api/v1/social_api/posts/{self.post_1.id}/unlike-post/"
@@ -140,9 +232,61 @@ class AuthenticatedPostApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Like.objects.count(), 0)
 
+    def test_counters_follow_likes_and_comments(self):
+        url = f"/api/v1/social_api/posts/{self.post_1.id}/"
+        self.client.post(url + "add-like/")
+        self.client.post(url + "add-comment/", data={"content": "test"})
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.likes_count, 1)
+        self.assertEqual(self.post_1.comments_count, 1)
+
+        self.client.post(url + "unlike-post/")
+        Comment.objects.filter(post=self.post_1).delete()
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.likes_count, 0)
+        self.assertEqual(self.post_1.comments_count, 0)
+
+    def test_posts_list_query_count_is_constant(self):
+        for index in range(5):
+            post = Post.objects.create(
+                author=self.user_1, title=f"post {index}", content=f"{index}",
+            )
+            Like.objects.create(user=self.user, post=post)
+            Comment.objects.create(user=self.user, post=post, content="test")
+
+        # ETag version and the page.
+        with self.assertNumQueries(2):
+            res = self.client.get(POST_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_posts_list_cursor_pagination(self):
+        res = self.client.get(POST_URL, {"page_size": 1})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]], [self.post_1.id]
+        )
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]], [self.post.id]
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_recount_post_counters_command(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Comment.objects.create(user=self.user, post=self.post, content="a")
+        Post.objects.update(likes_count=0, comments_count=7)
+
+        call_command("recount_post_counters", stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 1)
+
 
 class AdminPostTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="admin@test.test",
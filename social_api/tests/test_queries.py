@@ -0,0 +1,112 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from social_api.models import Comment, Follow, Like, Post
+from social_api.queries import fingerprint, query_budget
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_n_plus_one_queries_share_a_fingerprint(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s)"),
+            fingerprint("SELECT *  FROM t\n WHERE a = 'y' AND b IN (%s)"),
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM t LIMIT 21"),
+            "SELECT * FROM t LIMIT ?",
+        )
+
+
+class QueryBudgetTests(APITestCase):
+    """Query budgets of the read endpoints, measured on a cold response
+    cache against data that would expose per-row queries."""
+
+    # (url name, url kwargs, max queries); posts and profiles spend one
+    # reading their ETag version, the feed two picking the page's posts.
+    BUDGETS = [
+        ("social_api:post-list", {}, 2),
+        ("social_api:post-detail", {"pk": "post"}, 4),
+        ("social_api:comment-list", {}, 1),
+        ("social_api:like-list", {}, 1),
+        ("social_api:follow-list", {}, 1),
+        ("social_api:feed", {}, 3),
+        ("social_api:hashtag-list", {}, 1),
+        ("user:users_list", {}, 1),
+        ("user:users-detail", {"username": "author"}, 2),
+        ("user:manage_user", {}, 1),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        users = get_user_model().objects
+        cls.user = users.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        cls.authors = [
+            users.create_user(
+                email=f"author_{index}@test.test",
+                password="testpassword",
+                username=f"author_{index}",
+            )
+            for index in range(3)
+        ]
+        for author in cls.authors:
+            Follow.objects.create(follower=cls.user, following=author)
+            Follow.objects.create(follower=author, following=cls.user)
+            for index in range(2):
+                post = Post.objects.create(
+                    author=author,
+                    title=f"post {index}",
+                    content=f"#tag{index} content",
+                )
+                for liker in cls.authors:
+                    Like.objects.create(user=liker, post=post)
+                    Comment.objects.create(
+                        user=liker, post=post, content="comment"
+                    )
+        cls.post = post
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def url(self, name, kwargs):
+        values = {"post": self.post.pk, "author": self.authors[0].username}
+        return reverse(
+            name, kwargs={key: values[value] for key, value in kwargs.items()}
+        )
+
+    def test_read_endpoints_stay_within_budget(self):
+        for name, kwargs, max_queries in self.BUDGETS:
+            with self.subTest(name), query_budget(max_queries):
+                res = self.client.get(self.url(name, kwargs))
+                self.assertEqual(res.status_code, 200)
+
+    def test_budget_fails_on_repeated_queries(self):
+        with self.assertRaisesRegex(AssertionError, r"2x SELECT"):
+            with query_budget(10):
+                for post in Post.objects.filter(author__in=self.authors[:1]):
+                    post.author.username
+                list(Post.objects.all())
+
+    @override_settings(QUERY_STATS=True)
+    def test_middleware_reports_queries(self):
+        with self.assertLogs("social_api.queries", logging.INFO) as logs:
+            res = self.client.get(reverse("social_api:post-list"))
+
+        self.assertGreater(int(res["X-DB-Queries"]), 0)
+        self.assertEqual(res["X-DB-Duplicates"], "0")
+        self.assertGreaterEqual(float(res["X-DB-Time"]), 0)
+        self.assertIn("GET social_api:post-list", logs.output[0])
+
+    @override_settings(QUERY_STATS=False)
+    def test_middleware_is_off_in_production(self):
+        res = self.client.get(reverse("social_api:post-list"))
+
+        self.assertNotIn("X-DB-Queries", res)
@@ -0,0 +1,141 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from social_api.models import Post
+from social_api.routers import (
+    PIN_COOKIE,
+    PrimaryReplicaRouter,
+    reading_from_replica,
+    replica_reads,
+)
+from social_api.tests.caches import LOCAL_CACHES, SHARED_CACHES
+
+POST_URL = reverse("social_api:post-list")
+
+
+def detail_url(post_id):
+    return reverse("social_api:post-detail", args=[post_id])
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0", "replica_1"])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_use_primary_outside_replica_reads(self):
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+    def test_reads_use_a_replica_inside_replica_reads(self):
+        with replica_reads():
+            self.assertIn(
+                self.router.db_for_read(Post), ("replica_0", "replica_1")
+            )
+        self.assertFalse(reading_from_replica())
+
+    def test_writes_and_migrations_use_primary(self):
+        post = Post()
+        post._state.db = "replica_0"
+        with replica_reads():
+            self.assertEqual(
+                self.router.db_for_write(Post, instance=post), "default"
+            )
+        self.assertFalse(self.router.allow_migrate("replica_0", "social_api"))
+        self.assertIsNone(self.router.allow_migrate("default", "social_api"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Post), "default")
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class ReplicaReadViewTests(APITestCase):
+    """Records whether each read would go to a replica; the test database
+    has none, so every query still runs on the primary."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="title", content="content"
+        )
+        self.client.force_authenticate(self.user)
+
+    def routed(self, method, url):
+        reads = []
+
+        def db_for_read(router, model, **hints):
+            reads.append(reading_from_replica())
+            return "default"
+
+        with patch.object(PrimaryReplicaRouter, "db_for_read", db_for_read):
+            res = getattr(self.client, method)(url)
+        self.assertLess(res.status_code, 400)
+        self.assertFalse(reading_from_replica())
+        return reads
+
+    def test_safe_requests_read_from_replica(self):
+        reads = self.routed("get", detail_url(self.post.id))
+
+        self.assertTrue(reads)
+        self.assertTrue(all(reads))
+
+    def test_writer_is_pinned_to_primary(self):
+        self.assertFalse(
+            any(self.routed("post", detail_url(self.post.id) + "add-like/"))
+        )
+
+        reads = self.routed("get", detail_url(self.post.id))
+        self.assertTrue(reads)
+        self.assertFalse(any(reads))
+
+        other = get_user_model().objects.create_user(
+            email="test_1@test.test", password="testpassword", username="no",
+        )
+        self.client.force_authenticate(other)
+        self.assertTrue(all(self.routed("get", detail_url(self.post.id))))
+
+    @override_settings(READ_YOUR_WRITES_SECONDS=0)
+    def test_pin_expires(self):
+        self.routed("post", detail_url(self.post.id) + "add-like/")
+
+        self.assertTrue(all(self.routed("get", detail_url(self.post.id))))
+
+    def test_failed_write_does_not_pin(self):
+        res = self.client.post(POST_URL, {})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertTrue(all(self.routed("get", detail_url(self.post.id))))
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_pin_cookie_reaches_other_workers(self):
+        self.routed("post", detail_url(self.post.id) + "add-like/")
+
+        with self.settings(REPLICA_PIN_CACHE_ALIAS="other_worker"):
+            self.assertFalse(any(self.routed("get", detail_url(self.post.id))))
+
+        # Without the cookie, a local cache is not trusted either.
+        del self.client.cookies[PIN_COOKIE]
+        self.assertTrue(all(self.routed("get", detail_url(self.post.id))))
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_shared_cache_pins_clients_without_cookies(self):
+        self.routed("post", detail_url(self.post.id) + "add-like/")
+        del self.client.cookies[PIN_COOKIE]
+
+        with self.settings(REPLICA_PIN_CACHE_ALIAS="other_worker"):
+            self.assertFalse(any(self.routed("get", detail_url(self.post.id))))
+
+    def test_tampered_pin_cookie_is_ignored(self):
+        self.client.cookies[PIN_COOKIE] = str(self.user.pk)
+
+        self.assertTrue(all(self.routed("get", detail_url(self.post.id))))
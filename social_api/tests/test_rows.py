@@ -0,0 +1,167 @@
+import datetime
+import decimal
+import uuid
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from social_api.models import Follow, Post
+from social_api.renderers import FastJSONRenderer
+from social_api.rows import ValuesListMixin, values_queryset
+from social_api.serializers import FollowListSerializer, PostListSerializer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_renders_the_same_bytes_as_json_renderer(self):
+        data = {
+            "text": "line\u2028separator\u2029é",
+            "created_at": datetime.datetime(
+                2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+            ),
+            "day": datetime.date(2024, 5, 1),
+            "price": decimal.Decimal("1.50"),
+            "id": uuid.UUID("12345678123456781234567812345678"),
+            "label": gettext_lazy("Not found."),
+            "items": [1, None, True, ("a", "b")],
+            3: "integer key",
+        }
+
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_indented_output_is_rendered_by_json_renderer(self):
+        data = {"a": [1, 2]}
+        media_type = "application/json; indent=2"
+
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+
+
+class ValuesListTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        users = get_user_model().objects
+        self.user = users.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.others = [
+            users.create_user(
+                email=f"test_{index}@test.test",
+                password="testpassword",
+                username=f"user_{index}",
+            )
+            for index in range(3)
+        ]
+        for index, author in enumerate([self.user, *self.others]):
+            if author != self.user:
+                Follow.objects.create(follower=self.user, following=author)
+            for number in range(2):
+                Post.objects.create(
+                    author=author,
+                    title=f"título {index}.{number}",
+                    content="content",
+                    hashtag=None if number else "#tag",
+                )
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        cache.clear()
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return res
+
+    def get_from_instances(self, url):
+        with patch(
+            "social_api.rows.values_queryset", return_value=None
+        ), patch.object(ValuesListMixin, "renderer_classes", [JSONRenderer]):
+            return self.get(url)
+
+    def test_list_responses_are_unchanged(self):
+        for url in (
+            reverse("social_api:post-list"),
+            reverse("social_api:post-list") + "?page_size=3",
+            reverse("social_api:post-list") + "?fields=id,created_at",
+            reverse("social_api:feed"),
+            reverse("social_api:follow-list"),
+            reverse("social_api:follow-list") + "?following=user_1",
+        ):
+            with self.subTest(url):
+                res = self.get(url)
+                self.assertEqual(
+                    res.content, self.get_from_instances(url).content
+                )
+
+    def test_cursor_pages_follow_on(self):
+        res = self.get(reverse("social_api:post-list") + "?page_size=3")
+        seen = [post["id"] for post in res.data["results"]]
+        while res.data["next"]:
+            next_url = res.data["next"]
+            res = self.get(next_url)
+            self.assertEqual(
+                res.content, self.get_from_instances(next_url).content
+            )
+            seen += [post["id"] for post in res.data["results"]]
+
+        self.assertEqual(
+            seen, list(Post.objects.values_list("id", flat=True))
+        )
+
+    def test_list_reads_rows_only_when_serializer_allows(self):
+        def context(query: str = "") -> dict:
+            request = RequestFactory().get("/" + query)
+            return {"request": Request(request)}
+
+        self.assertIsNotNone(
+            values_queryset(
+                Post.objects.all(), PostListSerializer(context=context())
+            )
+        )
+        self.assertIsNotNone(
+            values_queryset(
+                Follow.objects.all(), FollowListSerializer(context=context())
+            )
+        )
+        self.assertIsNone(
+            values_queryset(
+                Post.objects.all(),
+                PostListSerializer(context=context("?expand=author")),
+            )
+        )
+
+    def test_expand_uses_instances(self):
+        res = self.get(reverse("social_api:post-list") + "?expand=author")
+
+        author = res.data["results"][0]["author"]
+        self.assertEqual(author["username"], "user_2")
+
+
+class BenchmarkListsTests(TestCase):
+    def test_reports_rows_per_second_of_both_paths(self):
+        users = get_user_model().objects
+        user = users.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        other = users.create_user(
+            email="test_1@test.test", password="testpassword", username="no",
+        )
+        Follow.objects.create(follower=user, following=other)
+        Post.objects.create(author=user, title="title", content="content")
+        out = StringIO()
+
+        call_command("benchmark_lists", rows=10, repeat=1, stdout=out)
+
+        self.assertIn("posts    values", out.getvalue())
+        self.assertIn("follows: ", out.getvalue())
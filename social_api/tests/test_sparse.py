@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from social_api.models import Comment, Follow, Like, Post
+from social_api.tests.caches import SHARED_CACHES
+
+POST_URL = reverse("social_api:post-list")
+FOLLOW_URL = reverse("social_api:follow-list")
+
+
+def detail_url(post_id):
+    return reverse("social_api:post-detail", args=[post_id])
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.test", password="testpassword", username="yes",
+        )
+        self.other = get_user_model().objects.create_user(
+            email="test_1@test.test", password="testpassword", username="no",
+        )
+        self.post = Post.objects.create(
+            author=self.user, title="title", content="long content"
+        )
+        Comment.objects.create(user=self.other, post=self.post, content="hi")
+        Like.objects.create(user=self.other, post=self.post)
+        Follow.objects.create(follower=self.user, following=self.other)
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        """Response and SQL; on posts the first query reads the ETag
+        version."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, [query["sql"] for query in queries]
+
+    def test_fields_limit_payload_and_columns(self):
+        res, queries = self.get(POST_URL + "?fields=id,title")
+
+        self.assertEqual(
+            res.data["results"], [{"id": self.post.id, "title": "title"}]
+        )
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("content", queries[-1])
+        self.assertNotIn("user_user", queries[-1])
+
+    def test_unrequested_relations_are_not_queried(self):
+        res, queries = self.get(
+            detail_url(self.post.id) + "?fields=id,likes_count"
+        )
+
+        self.assertEqual(res.data, {"id": self.post.id, "likes_count": 1})
+        self.assertEqual(len(queries), 2)
+
+    def test_default_fields_are_unchanged(self):
+        res, queries = self.get(detail_url(self.post.id))
+
+        self.assertEqual(res.data["comments"][0]["content"], "hi")
+        self.assertEqual(res.data["likes"][0]["user"], "no")
+        self.assertEqual(res.data["author"], self.user.id)
+        self.assertEqual(len(queries), 4)
+
+    def test_expand_inlines_relation_in_same_query(self):
+        res, queries = self.get(POST_URL + "?fields=id&expand=author")
+
+        author = res.data["results"][0]["author"]
+        self.assertEqual(author["username"], "yes")
+        self.assertEqual(set(author), {"id", "username", "image"})
+        self.assertEqual(len(queries), 2)
+
+    def test_expand_follow_users(self):
+        res, queries = self.get(FOLLOW_URL + "?expand=follower,following")
+
+        follow = res.data["results"][0]
+        self.assertEqual(follow["follower"]["username"], "yes")
+        self.assertEqual(follow["following"]["username"], "no")
+        self.assertEqual(len(queries), 1)
+
+    def test_user_fields(self):
+        url = reverse("user:users-detail", args=["no"])
+        res, _ = self.get(url + "?fields=username,followers")
+
+        self.assertEqual(res.data, {"username": "no", "followers": 1})
+
+    def test_fields_do_not_apply_to_writes(self):
+        res = self.client.post(
+            POST_URL + "?fields=id", {"title": "new", "content": "new"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["title"], "new")
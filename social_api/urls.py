@@ -1,15 +1,37 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 
-from .views import PostViewSet, CommentViewSet, LikeViewSet, FollowViewSet
+from .async_views import AsyncFollowViewSet, AsyncPostViewSet, with_async_reads
+from .views import (
+    PostViewSet,
+    CommentViewSet,
+    LikeViewSet,
+    FollowViewSet,
+    FeedView,
+    HashtagViewSet,
+    DatabaseHealthView,
+)
 
 router = routers.DefaultRouter()
 router.register("posts", PostViewSet)
 router.register("comments", CommentViewSet)
 router.register("likes", LikeViewSet)
 router.register("follows", FollowViewSet)
+router.register("hashtags", HashtagViewSet)
 
+router_urls = router.urls
+if settings.ASYNC_READ_VIEWS:
+    router_urls = with_async_reads(
+        router_urls,
+        {PostViewSet: AsyncPostViewSet, FollowViewSet: AsyncFollowViewSet},
+    )
 
-urlpatterns = [path("", include(router.urls))]
+
+urlpatterns = [
+    path("feed/", FeedView.as_view(), name="feed"),
+    path("health/db/", DatabaseHealthView.as_view(), name="health-db"),
+    path("", include(router_urls)),
+]
 
 app_name = "social_api"
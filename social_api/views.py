@@ -1,4 +1,8 @@
+import time
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     extend_schema,
@@ -6,25 +10,44 @@ from drf_spectacular.utils import (
     OpenApiExample,
     extend_schema_view,
 )
-from rest_framework import viewsets, status, mixins, generics
+from rest_framework import viewsets, status, mixins, generics, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-
-from social_api.models import Post, Comment, Like, Follow
+from rest_framework.views import APIView
+
+from social_api.bulk import bulk_follow, bulk_like, bulk_unfollow
+from social_api.cache import cache_response, conditional_response
+from social_api.db import pool_stats
+from social_api.feed import timeline_for
+from social_api.hashtags import normalize, trending
+from social_api.models import Post, Comment, Like, Follow, Hashtag
+from social_api.routers import ReplicaReadMixin
+from social_api.rows import ValuesListMixin
+from social_api.sparse import SparseQuerysetMixin
 from social_api.serializers import (
     PostSerializer,
     PostListSerializer,
     PostRetrieveSerializer,
     CommentSerializer,
     CommentCreateSerializer,
+    CommentForRetrievePostSerializer,
     LikeSerializer,
     LikeCreateSerializer,
     LikeListSerializer,
+    LikeRetrieveSerializer,
     FollowSerializer,
     FollowListSerializer,
     FollowRetrieveSerializer,
+    HashtagSerializer,
+    TrendingHashtagSerializer,
+    BulkFollowSerializer,
+    BulkFollowResultSerializer,
+    BulkLikeSerializer,
+    BulkLikeResultSerializer,
 )
+from social_api.tasks import fan_out_post
 
 
 @extend_schema_view(
@@ -45,7 +68,9 @@ from social_api.serializers import (
         description="User can delete own post or admin any.",
     )
 )
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(
+    ReplicaReadMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
 
@@ -58,6 +83,10 @@ class PostViewSet(viewsets.ModelViewSet):
             return LikeCreateSerializer
         if self.action == "retrieve":
             return PostRetrieveSerializer
+        if self.action == "comments":
+            return CommentForRetrievePostSerializer
+        if self.action == "likes":
+            return LikeRetrieveSerializer
         return PostSerializer
 
     def get_queryset(self):
@@ -72,13 +101,15 @@ class PostViewSet(viewsets.ModelViewSet):
         if title:
             queryset = queryset.filter(title__icontains=title)
         if hashtag:
-            queryset = queryset.filter(hashtag__icontains=hashtag)
+            queryset = queryset.filter(tags__name=normalize(hashtag))
         if like:
-            queryset = queryset.filter(likes__gte=like)
-        if self.action in ("list", "retrieve"):
-            return queryset.select_related("author")
+            queryset = queryset.filter(likes_count__gte=like)
         return queryset
 
+    def perform_create(self, serializer):
+        post = serializer.save(author=self.request.user)
+        fan_out_post.enqueue(post_id=post.pk)
+
     @extend_schema(
         methods=["GET"],
         summary="Get list of all posts",
@@ -98,21 +129,28 @@ class PostViewSet(viewsets.ModelViewSet):
             ),
             OpenApiParameter(
                 name="hashtag",
-                description="Filter by post hashtag",
+                description="Filter by exact hashtag, with or without #",
                 type=OpenApiTypes.STR,
                 examples=[OpenApiExample("Example")],
             ),
             OpenApiParameter(
-                name="likes",
-                description="Filter by post likes",
-                type=OpenApiTypes.STR,
+                name="like",
+                description="Filter by minimum number of post likes",
+                type=OpenApiTypes.INT,
                 examples=[OpenApiExample("Example")],
             )
         ]
     )
+    @conditional_response("posts", weak=True)
+    @cache_response("posts")
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional_response("post:{pk}")
+    @cache_response("post:{pk}")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Add a comment to a specific post",
         description="User can add a comment to a specific post.",
@@ -151,6 +189,30 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer.save(post=post, user=request.user)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="Get comments of a specific post",
+        description="User can page through all comments of a post.",
+    )
+    @action(detail=True, methods=["get"])
+    def comments(self, request, pk=None):
+        post = self.get_object()
+        queryset = self.sparse(Comment.objects.filter(post=post))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        summary="Get likes of a specific post",
+        description="User can page through all likes of a post.",
+    )
+    @action(detail=True, methods=["get"])
+    def likes(self, request, pk=None):
+        post = self.get_object()
+        queryset = self.sparse(Like.objects.filter(post=post))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @extend_schema(
         summary="Unlike a specific post",
         description="User can unlike a specific post.",
@@ -166,6 +228,93 @@ class PostViewSet(viewsets.ModelViewSet):
         )
 
 
+@extend_schema_view(
+    list=extend_schema(
+        summary="Get list of all hashtags",
+        description="User can get a list of all hashtags.",
+    ),
+    retrieve=extend_schema(
+        summary="Get a specific hashtag",
+        description="User can get a specific hashtag.",
+    ),
+)
+class HashtagViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Hashtag.objects.all()
+    serializer_class = HashtagSerializer
+
+    def get_serializer_class(self):
+        if self.action == "trending":
+            return TrendingHashtagSerializer
+        return HashtagSerializer
+
+    @extend_schema(
+        summary="Get trending hashtags",
+        description="User can get the most used hashtags of the last hours.",
+        parameters=[
+            OpenApiParameter(
+                name="hours",
+                description="Size of the trending window in hours",
+                type=OpenApiTypes.INT,
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def trending(self, request):
+        try:
+            hours = int(request.query_params.get("hours", 0))
+        except ValueError:
+            raise ValidationError({"hours": "A valid integer is required."})
+        hours = min(max(hours, 0), settings.HASHTAG_TRENDING_MAX_HOURS)
+        serializer = self.get_serializer(trending(hours=hours), many=True)
+        return Response(serializer.data)
+
+
+class DatabaseHealthView(APIView):
+    permission_classes = (permissions.IsAdminUser,)
+
+    @extend_schema(
+        summary="Check the database",
+        description="Admin can see the database round trip time and the "
+                    "connection pool statistics of the serving process.",
+        responses=OpenApiTypes.OBJECT,
+    )
+    def get(self, request):
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return Response(
+            {
+                "vendor": connection.vendor,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                "pool": pool_stats(),
+            }
+        )
+
+
+class FeedView(ValuesListMixin, generics.ListAPIView):
+    serializer_class = PostListSerializer
+
+    def get_queryset(self):
+        # Narrowed to the candidates of the requested page, so the cursor
+        # pagination runs over a handful of posts.
+        paginator = self.paginator
+        cursor = paginator.decode_cursor(self.request)
+        offset, reverse, position = cursor or (0, False, None)
+        return timeline_for(
+            self.request.user,
+            position=position,
+            reverse=reverse,
+            limit=offset + paginator.get_page_size(self.request) + 1,
+        )
+
+    @extend_schema(
+        summary="Get the home timeline",
+        description="User can get posts from the users they follow.",
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
 @extend_schema_view(
     create=extend_schema(
         summary="Create a new comment",
@@ -184,15 +333,12 @@ class PostViewSet(viewsets.ModelViewSet):
         description="User can delete own comment.",
     ),
 )
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin, SparseQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
 
-    def get_queryset(self):
-        queryset = self.queryset
-        if self.action in ("list", "retrieve",):
-            return queryset.select_related("user", "post")
-
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -207,6 +353,10 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema_view(
+    list=extend_schema(
+        summary="Get list of own likes",
+        description="User can get a list of own likes.",
+    ),
     destroy=extend_schema(
         summary="Delete a Like.",
         description="Admin can delete own Like.",
@@ -217,6 +367,9 @@ class CommentViewSet(viewsets.ModelViewSet):
     )
 )
 class LikeViewSet(
+    ReplicaReadMixin,
+    SparseQuerysetMixin,
+    mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
@@ -227,6 +380,8 @@ class LikeViewSet(
     def get_serializer_class(self):
         if self.action == "list":
             return LikeListSerializer
+        if self.action == "bulk":
+            return BulkLikeSerializer
         return LikeCreateSerializer
 
     def get_queryset(self):
@@ -235,14 +390,31 @@ class LikeViewSet(
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @extend_schema(
+        summary="Like several posts at once",
+        description="User can like a list of posts, getting a status for "
+                    "each post id.",
+        responses=BulkLikeResultSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_like(request.user, serializer.validated_data["posts"])
+        return Response(results, status=status.HTTP_200_OK)
+
 
-class FollowViewSet(viewsets.ModelViewSet):
+class FollowViewSet(
+    ReplicaReadMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     queryset = Follow.objects.all()
     serializer_class = FollowSerializer
 
     def get_serializer_class(self):
         if self.action == "list":
             return FollowListSerializer
+        if self.action in ("bulk_follow", "bulk_unfollow"):
+            return BulkFollowSerializer
         return FollowRetrieveSerializer
 
     def get_queryset(self):
@@ -255,8 +427,6 @@ class FollowViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 following__username__icontains=following
             )
-        if self.action in ("list", "retrieve"):
-            return queryset.select_related("follower", "following")
         return queryset
 
     @extend_schema(
@@ -278,11 +448,48 @@ class FollowViewSet(viewsets.ModelViewSet):
             ),
         ]
     )
+    @cache_response("follows")
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @cache_response("follows")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
-class FollowUserView(generics.GenericAPIView, mixins.CreateModelMixin):
+    @extend_schema(
+        summary="Follow several users at once",
+        description="User can follow a list of usernames, getting a status "
+                    "for each username.",
+        responses=BulkFollowResultSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-follow")
+    def bulk_follow(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_follow(
+            request.user, serializer.validated_data["usernames"]
+        )
+        return Response(results, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Unfollow several users at once",
+        description="User can unfollow a list of usernames, getting a "
+                    "status for each username.",
+        responses=BulkFollowResultSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-unfollow")
+    def bulk_unfollow(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_unfollow(
+            request.user, serializer.validated_data["usernames"]
+        )
+        return Response(results, status=status.HTTP_200_OK)
+
+
+class FollowUserView(
+    ReplicaReadMixin, generics.GenericAPIView, mixins.CreateModelMixin
+):
     queryset = Follow.objects.all()
     serializer_class = FollowSerializer
 
@@ -294,17 +501,15 @@ class FollowUserView(generics.GenericAPIView, mixins.CreateModelMixin):
     def post(self, request, *args, **kwargs):
         username = kwargs.get("username")
         following = get_object_or_404(get_user_model(), username=username)
-        follower = request.user
-        follow_data = {"follower": follower.id, "following": following.id}
-        serializer = self.get_serializer(data=follow_data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        Follow.create_unique(request.user, following, ValidationError)
         return Response(
             {"detail": "Follow successful."}, status=status.HTTP_201_CREATED
         )
 
 
-class UnfollowUserView(generics.GenericAPIView, mixins.DestroyModelMixin):
+class UnfollowUserView(
+    ReplicaReadMixin, generics.GenericAPIView, mixins.DestroyModelMixin
+):
     queryset = Follow.objects.all()
     serializer_class = FollowSerializer
 
@@ -316,12 +521,9 @@ class UnfollowUserView(generics.GenericAPIView, mixins.DestroyModelMixin):
     def delete(self, request, *args, **kwargs):
         username = kwargs.get("username")
         following = get_object_or_404(get_user_model(), username=username)
-        follower = request.user
-        follow_instance = Follow.objects.filter(
-            follower=follower, following=following
-        ).first()
-        if follow_instance:
-            follow_instance.delete()
+        Follow.objects.filter(
+            follower=request.user, following=following
+        ).delete()
 
         return Response(
             {"detail": "Unfollow successful."},
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
+import copy
 from datetime import timedelta
 from pathlib import Path
 import os
@@ -38,14 +39,18 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework.authtoken",
+    "rest_framework_simplejwt.token_blacklist",
     "drf_spectacular",
     "social_api",
     "user",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    "social_api.metrics.metrics_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -53,6 +58,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "social_api.queries.query_stats_middleware",
 ]
 
 ROOT_URLCONF = "social_media_api.urls"
@@ -87,9 +93,67 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 5)),
+        },
     }
 }
 
+# psycopg 3 connection pool, one per process. Checkouts wait at most
+# DB_POOL_TIMEOUT seconds for a free connection; see social_api.db for
+# the pool statistics.
+if os.environ.get("DB_POOL", "") == "1":
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+    }
+
+# Read replicas of "default", one alias per host in POSTGRES_REPLICA_HOSTS
+# (comma separated). social_api.routers sends the reads of safe requests
+# there and pins users to the primary for READ_YOUR_WRITES_SECONDS after
+# they write. Tests mirror them onto the default test database.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    host
+    for host in os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")
+    if host
+):
+    alias = f"replica_{index}"
+    DATABASES[alias] = copy.deepcopy(DATABASES["default"])
+    DATABASES[alias]["HOST"] = host
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["social_api.routers.PrimaryReplicaRouter"]
+
+READ_YOUR_WRITES_SECONDS = int(os.environ.get("READ_YOUR_WRITES_SECONDS", 5))
+REPLICA_PIN_CACHE_ALIAS = "default"
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# In-process LRU with TTL by default; set REDIS_URL to share it between
+# workers.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", 60))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -131,6 +195,12 @@ MEDIA_ROOT = "/vol/web/media"
 
 MEDIA_URL = "/media/"
 
+# Uploaded images are re-encoded without metadata, capped to this size and
+# rendered at these widths (WebP and JPEG) for srcset.
+IMAGE_MAX_DIMENSION = 2048
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_QUALITY = 82
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -140,20 +210,99 @@ AUTH_USER_MODEL = "user.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PERMISSION_CLASSES": [
         "social_api.permissions.IsOwnerOrAdminOrIfAuthenticatedReadOnly",
-    ]
+    ],
+    "DEFAULT_PAGINATION_CLASS": (
+        "social_api.pagination.CreatedAtCursorPagination"
+    ),
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", 20)),
 }
 
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 100))
+
+# Rows fetched per server-side cursor round trip and sent per chunk by the
+# account export (see user.export).
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+# Serve GET of posts, follows and user profiles with async views; turn it
+# on when running the ASGI app (see gunicorn.conf.py).
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS", "") == "1"
+
+# Report query count, time and repeated queries of every request in X-DB-*
+# response headers and the social_api.queries log (see social_api.queries).
+QUERY_STATS = DEBUG
+
+# Prometheus metrics of every request, served on /metrics (see
+# social_api.metrics). Pool statistics are refreshed at most every
+# METRICS_POOL_INTERVAL seconds per process.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_POOL_INTERVAL = 1.0
+
+# Number of newest comments/likes inlined into a post detail response.
+POST_INLINE_RELATED_LIMIT = 10
+
+# Maximum number of usernames/post ids accepted by the bulk endpoints.
+BULK_MAX_ITEMS = 100
+
+# Home timeline: authors above this follower count are merged at read time
+# instead of being fanned out into every follower's timeline.
+FEED_FANOUT_MAX_FOLLOWERS = int(
+    os.environ.get("FEED_FANOUT_MAX_FOLLOWERS", 10000)
+)
+FEED_FANOUT_BATCH_SIZE = 1000
+FEED_BACKFILL_SIZE = 50
+
+# Background jobs (``manage.py run_workers``). With JOBS_EAGER tasks run
+# inline when enqueued instead of going through the queue table.
+JOBS_EAGER = os.environ.get("JOBS_EAGER", "") == "1"
+JOBS_WORKERS = int(os.environ.get("JOBS_WORKERS", os.cpu_count() or 1))
+JOBS_BATCH_SIZE = 10
+JOBS_POLL_INTERVAL = 1.0
+JOBS_MAX_ATTEMPTS = 5
+# Retry delay is JOBS_BACKOFF_BASE * 2 ** (attempt - 1), capped.
+JOBS_BACKOFF_BASE = 10
+JOBS_BACKOFF_MAX = 60 * 60
+# A job running for longer than this is assumed to have lost its worker.
+JOBS_LEASE_SECONDS = 10 * 60
+
+# Trending hashtags are ranked over this many hourly usage buckets.
+HASHTAG_TRENDING_HOURS = 24
+HASHTAG_TRENDING_MAX_HOURS = 24 * 7
+HASHTAG_TRENDING_LIMIT = 10
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=3),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=2),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "user.serializers.ClaimsTokenObtainPairSerializer"
+    ),
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.BloomTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "user.serializers.BloomTokenVerifySerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": (
+        "user.serializers.BloomTokenBlacklistSerializer"
+    ),
 }
 
+# Refresh/verify only query the token blacklist for JTIs matching this
+# bloom filter, which is shared between processes through the cache and
+# updated in place by logouts; only purge_token_blacklist rebuilds it. With
+# a process-local cache (no REDIS_URL) every JTI is queried instead.
+TOKEN_BLACKLIST_CACHE_ALIAS = "default"
+TOKEN_BLACKLIST_BLOOM_CAPACITY = 100_000
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = 0.001
+TOKEN_BLACKLIST_BLOOM_TIMEOUT = 24 * 60 * 60
+
+# Users loaded by ClaimsJWTAuthentication are cached for this many seconds.
+# Snapshots and token claims are only trusted when this cache is shared
+# between processes (REDIS_URL); otherwise every request loads the user.
+USER_SNAPSHOT_CACHE_ALIAS = "default"
+USER_SNAPSHOT_TIMEOUT = 5 * 60
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Social Media API",
     "DESCRIPTION": "Platform for create, share and exchange information.",
@@ -0,0 +1,60 @@
+"""
+Production settings for social_media_api.
+
+Select them with DJANGO_SETTINGS_MODULE=social_media_api.settings_production;
+``entrypoint.sh`` then serves the app with gunicorn (see
+``gunicorn.conf.py``) behind nginx, which serves static and media files.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from social_media_api.settings import *  # noqa: F401,F403
+from social_media_api.settings import CACHES, DATABASES, REST_FRAMEWORK
+
+DEBUG = False
+QUERY_STATS = False
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
+CSRF_TRUSTED_ORIGINS = [
+    origin
+    for origin in os.environ.get("CSRF_TRUSTED_ORIGINS", "").split(",")
+    if origin
+]
+
+# nginx terminates the client connection and forwards the original scheme.
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+USE_X_FORWARDED_HOST = True
+
+# Keep database connections open between requests, unless they come from
+# the connection pool (DB_POOL=1), which Django requires CONN_MAX_AGE=0
+# for. Health checks replace connections that died while idle.
+for database in DATABASES.values():
+    if "pool" not in database["OPTIONS"]:
+        database["CONN_MAX_AGE"] = int(os.environ.get("CONN_MAX_AGE", 60))
+    database["CONN_HEALTH_CHECKS"] = True
+
+# Token blacklist generations, user snapshots, replica pins and response
+# cache versions must be seen by every worker, not just the one that
+# wrote them.
+if CACHES["default"]["BACKEND"].endswith(("LocMemCache", "DummyCache")):
+    raise ImproperlyConfigured(
+        "Production needs a cache shared between workers: set REDIS_URL."
+    )
+
+# Collected by entrypoint.sh and served by nginx, like MEDIA_ROOT.
+STATIC_ROOT = "/vol/web/static"
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "root": {"handlers": ["console"], "level": "INFO"},
+}
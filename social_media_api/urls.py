@@ -24,9 +24,12 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from social_api.metrics import metrics_view
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/v1/user/", include("user.urls"), name="user"),
     path("api/v1/social_api/", include("social_api.urls"), name="social_api"),
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -0,0 +1,10 @@
+from social_api.async_views import AsyncReadMixin
+from social_api.cache import cache_response, conditional_response
+from user.views import UserDetailView
+
+
+class AsyncUserDetailView(AsyncReadMixin, UserDetailView):
+    @conditional_response("user:{username}")
+    @cache_response("user:{username}")
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aretrieve(request)
@@ -0,0 +1,191 @@
+import functools
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Model
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from social_api.cache import is_shared
+
+# Claims added to every token by ClaimsTokenObtainPairSerializer.
+CLAIMS = ("username", "is_staff")
+
+
+def _cache():
+    return caches[settings.USER_SNAPSHOT_CACHE_ALIAS]
+
+
+def _shared_cache():
+    """The snapshot cache, or None when other processes would not see the
+    snapshots dropped and changes recorded through it."""
+    if is_shared(settings.USER_SNAPSHOT_CACHE_ALIAS):
+        return _cache()
+    return None
+
+
+def _snapshot_key(user_id) -> str:
+    return f"user-snapshot:{user_id}"
+
+
+def _changed_key(user_id) -> str:
+    return f"user-changed:{user_id}"
+
+
+def load_user(user_id, snapshot=None):
+    """The user with ``user_id``, from the snapshot cache (when it is
+    shared) or the database.
+
+    Raises ``AuthenticationFailed`` for a missing or inactive account.
+    """
+    cache = _shared_cache()
+    if snapshot is None and cache is not None:
+        snapshot = cache.get(_snapshot_key(user_id))
+    user = snapshot
+    if user is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if cache is not None:
+            cache.set(
+                _snapshot_key(user_id),
+                user,
+                timeout=settings.USER_SNAPSHOT_TIMEOUT,
+            )
+    if not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return user
+
+
+def forget_user(user_id, claims: bool = True) -> None:
+    """Drop the cached snapshot and stop trusting the claims of tokens
+    issued so far, until they expire.
+
+    Pass ``claims=False`` for writes that cannot change a claim (counters,
+    images), which only need the snapshot dropped.
+    """
+    cache = _cache()
+    cache.delete(_snapshot_key(user_id))
+    if not claims:
+        return
+    cache.set(
+        _changed_key(user_id),
+        time.time(),
+        timeout=int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def forget_user_on_commit(user_id, claims: bool = True) -> None:
+    """``forget_user`` now and again once the transaction commits, so a
+    snapshot cached from pre-commit data does not survive.
+
+    Every ``.update()`` of users must call it, as no signal does.
+    """
+    forget_user(user_id, claims)
+    transaction.on_commit(functools.partial(forget_user, user_id, claims))
+
+
+class ClaimsUser(SimpleLazyObject):
+    """``request.user`` built from the claims of an access token.
+
+    ``id``, ``pk``, ``username`` and ``is_staff`` are answered from the
+    token, and it passes ``isinstance`` checks and compares equal to the
+    matching ``User``, so permissions and ``filter(author=request.user)``
+    need no query. Any other attribute loads the real user once.
+    """
+
+    def __init__(self, user_id, claims: dict):
+        self.__dict__["_claims"] = {
+            "id": user_id,
+            "pk": user_id,
+            "is_active": True,
+            "is_authenticated": True,
+            "is_anonymous": False,
+            **claims,
+        }
+        super().__init__(functools.partial(load_user, user_id))
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            if name in self._claims:
+                return self._claims[name]
+            if name == "_meta":
+                return get_user_model()._meta
+            # Every field is a class attribute of the model, so a name the
+            # class lacks (e.g. ORM duck-typing probes) cannot be on the
+            # loaded user either.
+            if name != "_state" and not hasattr(get_user_model(), name):
+                raise AttributeError(name)
+        return super().__getattr__(name)
+
+    @property
+    def __class__(self):
+        return get_user_model()
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, Model):
+            return (
+                other._meta.concrete_model is get_user_model()
+                and other.pk == self.pk
+            )
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._wrapped is not empty
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that skips the per-request ``User`` query.
+
+    A cached snapshot is used when there is one. Otherwise the token's
+    claims are trusted as long as the account has not changed since the
+    token was issued; tokens from before a change (or without the claims)
+    load the user as ``JWTAuthentication`` does.
+
+    Both rely on ``USER_SNAPSHOT_CACHE_ALIAS`` being shared between the
+    processes, or a worker would keep trusting the claims of a user that
+    another worker deactivated or demoted. With a process-local cache
+    every request loads the user from the database.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        cache = _shared_cache()
+        if cache is None:
+            return load_user(user_id)
+        found = cache.get_many(
+            [_snapshot_key(user_id), _changed_key(user_id)]
+        )
+        if _snapshot_key(user_id) in found:
+            return load_user(user_id, found[_snapshot_key(user_id)])
+
+        changed = found.get(_changed_key(user_id))
+        issued = validated_token.get("iat")
+        if (
+            all(claim in validated_token for claim in CLAIMS)
+            and issued is not None
+            and (changed is None or issued > changed)
+        ):
+            return ClaimsUser(
+                user_id, {claim: validated_token[claim] for claim in CLAIMS}
+            )
+        return load_user(user_id)
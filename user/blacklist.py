@@ -0,0 +1,217 @@
+import functools
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from social_api.cache import is_shared
+
+GENERATION_KEY = "token-blacklist:gen"
+SEQUENCE_KEY = "token-blacklist:seq"
+# Longest log of blacklisted JTIs a process replays instead of rebuilding.
+ADDED_LOG_REPLAY = 1000
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings.
+
+    ``in`` may return false positives at roughly ``error_rate`` but never
+    false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, bits: bytes = None):
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.size = max(size, 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = bytearray(bits or (self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position // 8] |= 1 << position % 8
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position // 8] & 1 << position % 8
+            for position in self._positions(item)
+        )
+
+    def __getstate__(self):
+        return (self.capacity, self.error_rate, bytes(self.bits))
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+def _cache():
+    return caches[settings.TOKEN_BLACKLIST_CACHE_ALIAS]
+
+
+def _seeded(keys: list[str]) -> dict:
+    """Current values of the counters ``keys``; a missing one is seeded
+    with a fresh value instead of 0, so it never repeats an old value."""
+    cache = _cache()
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns(), timeout=None)
+            values[key] = cache.get(key)
+    return values
+
+
+def _build() -> BloomFilter:
+    jtis = list(
+        BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list("token__jti", flat=True)
+    )
+    bloom = BloomFilter(
+        max(settings.TOKEN_BLACKLIST_BLOOM_CAPACITY, len(jtis) * 2),
+        settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE,
+    )
+    for jti in jtis:
+        bloom.add(jti)
+    return bloom
+
+
+def _filter_key(generation) -> str:
+    return f"token-blacklist:filter:{generation}"
+
+
+def _added_key(sequence) -> str:
+    return f"token-blacklist:added:{sequence}"
+
+
+class _ProcessFilter:
+    generation = None
+    bloom = None
+    # Sequence number of the last blacklisted JTI added to ``bloom``.
+    sequence = None
+
+
+_local = _ProcessFilter()
+
+
+def _rebuild(generation, sequence) -> None:
+    """Build this process' filter from the database and share it.
+
+    ``sequence`` is read before the blacklist is, so the filter can only
+    be newer than it.
+    """
+    bloom = _build()
+    _cache().set(
+        _filter_key(generation),
+        (bloom, sequence),
+        timeout=settings.TOKEN_BLACKLIST_BLOOM_TIMEOUT,
+    )
+    _local.generation, _local.bloom, _local.sequence = (
+        generation,
+        bloom,
+        sequence,
+    )
+
+
+def _bloom() -> BloomFilter:
+    """This process' filter, brought up to date with the shared state.
+
+    Each logout appends its JTI to a shared log (``_add``), which the
+    processes replay into their filters: one cache read per check while
+    nothing changes, a few keys per logout. Only a new generation, after
+    a purge, or a log too far behind or evicted rebuilds the filter from
+    the database; the rebuilt filter is shared through the cache with the
+    sequence it covers, so the other processes just load it.
+    """
+    current = _seeded([GENERATION_KEY, SEQUENCE_KEY])
+    generation, sequence = current[GENERATION_KEY], current[SEQUENCE_KEY]
+    cache = _cache()
+    if _local.generation != generation:
+        shared = cache.get(_filter_key(generation))
+        if shared is None:
+            _rebuild(generation, sequence)
+            return _local.bloom
+        _local.generation = generation
+        _local.bloom, _local.sequence = shared
+
+    behind = sequence - _local.sequence
+    if behind == 0:
+        return _local.bloom
+    if not 0 < behind <= ADDED_LOG_REPLAY:
+        _rebuild(generation, sequence)
+        return _local.bloom
+    keys = [
+        _added_key(number)
+        for number in range(_local.sequence + 1, sequence + 1)
+    ]
+    added = cache.get_many(keys)
+    if len(added) < len(keys):
+        # Evicted, or still being written.
+        _rebuild(generation, sequence)
+        return _local.bloom
+    for jti in added.values():
+        _local.bloom.add(jti)
+    _local.sequence = sequence
+    return _local.bloom
+
+
+def is_blacklisted(jti: str) -> bool:
+    """Whether the token ``jti`` is blacklisted. Only possible matches of
+    the bloom filter are looked up in the database.
+
+    The filter is skipped unless the cache is shared between processes:
+    this process would never hear of tokens blacklisted by the others.
+    """
+    if is_shared(settings.TOKEN_BLACKLIST_CACHE_ALIAS) and jti not in _bloom():
+        return False
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def _bump() -> None:
+    cache = _cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def _add(jti: str) -> None:
+    """Append ``jti`` to the shared log replayed by ``_bloom``."""
+    cache = _cache()
+    try:
+        sequence = cache.incr(SEQUENCE_KEY)
+    except ValueError:
+        # The log was evicted: the reseeded sequence makes every process
+        # rebuild, which includes this JTI.
+        _seeded([SEQUENCE_KEY])
+        return
+    cache.set(
+        _added_key(sequence),
+        jti,
+        timeout=settings.TOKEN_BLACKLIST_BLOOM_TIMEOUT,
+    )
+
+
+def blacklisted(jti: str) -> None:
+    """Record a newly blacklisted ``jti``: this process sees it at once,
+    the others once the transaction commits."""
+    if _local.bloom is not None:
+        _local.bloom.add(jti)
+    transaction.on_commit(functools.partial(_add, jti))
+
+
+def changed() -> None:
+    """Make every process rebuild its filter, e.g. after a purge removed
+    expired tokens from the blacklist."""
+    transaction.on_commit(_bump)
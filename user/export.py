@@ -0,0 +1,118 @@
+"""NDJSON export of a user's account.
+
+``export_chunks`` yields the profile, then every post, comment, like and
+follow of the user as one JSON document per line, each tagged with its
+``type``. Rows are read as ``.values()`` through ``iterator()``, a
+server-side cursor on PostgreSQL, and encoded a chunk at a time, so memory
+stays flat whatever the size of the account.
+"""
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from social_api.models import Comment, Follow, Like, Post
+
+CONTENT_TYPE = "application/x-ndjson"
+
+_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_UTC_Z
+
+USER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "bio",
+    "image",
+    "date_joined",
+)
+
+
+def _sources(user_id) -> tuple:
+    """``(type, queryset, fields)`` of every kind of row exported."""
+    return (
+        (
+            "post",
+            Post.objects.filter(author_id=user_id),
+            (
+                "id",
+                "title",
+                "content",
+                "hashtag",
+                "images",
+                "likes_count",
+                "comments_count",
+                "created_at",
+                "updated_at",
+            ),
+        ),
+        (
+            "comment",
+            Comment.objects.filter(user_id=user_id),
+            ("id", "post_id", "content", "created_at"),
+        ),
+        (
+            "like",
+            Like.objects.filter(user_id=user_id),
+            ("id", "post_id", "created_at"),
+        ),
+        (
+            "follow",
+            Follow.objects.filter(
+                Q(follower_id=user_id) | Q(following_id=user_id)
+            ),
+            (
+                "id",
+                "follower__username",
+                "following__username",
+                "created_at",
+            ),
+        ),
+    )
+
+
+def export_chunks(
+    user_id, using: str = "default", chunk_size: int | None = None
+):
+    """Bytes of the NDJSON export of the user ``user_id``, read from the
+    ``using`` database ``chunk_size`` rows at a time."""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    profile = (
+        get_user_model()
+        .objects.using(using)
+        .filter(pk=user_id)
+        .values(*USER_FIELDS)
+        .first()
+    )
+    if profile is None:
+        return
+    yield orjson.dumps({"type": "user", **profile}, option=_OPTIONS)
+    for kind, queryset, fields in _sources(user_id):
+        rows = (
+            queryset.using(using)
+            .order_by("id")
+            .values(*fields)
+            .iterator(chunk_size=chunk_size)
+        )
+        chunk = []
+        for row in rows:
+            chunk.append(orjson.dumps({"type": kind, **row}, option=_OPTIONS))
+            if len(chunk) == chunk_size:
+                yield b"".join(chunk)
+                chunk = []
+        if chunk:
+            yield b"".join(chunk)
+
+
+async def aiter_chunks(chunks):
+    """Async iterator advancing the ``chunks`` generator in the sync thread.
+
+    ASGI responses would otherwise read a sync iterator whole into memory
+    before sending it.
+    """
+    end = object()
+    advance = sync_to_async(next)
+    while (chunk := await advance(chunks, end)) is not end:
+        yield chunk
@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+
+from social_api.routers import replica_reads
+from user.export import export_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the profile, posts, comments, likes and follows of a user "
+        "as NDJSON to stdout or --output, streamed with server-side cursors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--output", help="File to write instead.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows fetched per round trip (default: EXPORT_CHUNK_SIZE).",
+        )
+        parser.add_argument(
+            "--replica",
+            action="store_true",
+            help="Read from a replica, tolerating replication lag.",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects
+        user_id = (
+            users.filter(username=options["username"])
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if user_id is None:
+            raise CommandError(f"No user {options['username']!r}.")
+        with replica_reads(options["replica"]):
+            using = router.db_for_read(get_user_model())
+        chunks = export_chunks(
+            user_id, using=using, chunk_size=options["chunk_size"]
+        )
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
+            return
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {options['username']} to {options['output']}"
+            )
+        )
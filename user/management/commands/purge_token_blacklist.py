@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from user import blacklist
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted tokens in batches. "
+        "Run it periodically, e.g. daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tokens deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        expired = OutstandingToken.objects.filter(
+            expires_at__lte=timezone.now()
+        ).order_by("id")
+        purged = 0
+        while True:
+            ids = list(
+                expired.values_list("id", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                # Cascades to the BlacklistedToken rows.
+                OutstandingToken.objects.filter(id__in=ids).delete()
+            purged += len(ids)
+
+        if purged:
+            # Let every process drop the purged JTIs from its filter.
+            blacklist.changed()
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {purged} expired tokens")
+        )
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:17
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+import social_api.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("user", "0003_user_user_followers_user_user_following"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("username"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_username_trgm",
+            ),
+        ),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_email_trgm",
+            ),
+        ),
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("bio"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_bio_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0011_fold_user_follow_m2m_into_follow"),
+        ("user", "0005_user_followers_count_user_following_count"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="user",
+            name="user_followers",
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="user_following",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+import social_api.operations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("user", "0008_user_updated_at"),
+    ]
+
+    operations = [
+        social_api.operations.AddPostgresIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                fields=["-date_joined", "-id"], name="user_date_joined"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+class CounterFieldsMixin:
+    """Keep ``save()`` from overwriting counters maintained with F() updates.
+
+    Saving an existing row writes every field except ``counter_fields``, so
+    a stale in-memory counter never clobbers concurrent increments.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        return super().save(*args, **kwargs)
@@ -6,7 +6,7 @@ from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext as _
 
-from social_media_api import settings
+from user.model_mixins import CounterFieldsMixin
 
 
 class UserManager(BaseUserManager):
@@ -55,7 +55,7 @@ def profile_image_path(instance: "User", filename: str) -> pathlib.Path:
     return pathlib.Path("upload/users") / pathlib.Path(filename)
 
 
-class User(AbstractUser):
+class User(CounterFieldsMixin, AbstractUser):
     username = models.CharField(
         _("username"),
         max_length=150,
@@ -67,12 +67,15 @@ class User(AbstractUser):
     image = models.ImageField(
         _("image"), null=True, upload_to=profile_image_path,
     )
-    user_followers = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="follower_users", blank=True
-    )
-    user_following = models.ManyToManyField(
-        settings.AUTH_USER_MODEL, related_name="following_users", blank=True
-    )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Maintained from social_api.Follow, the single store of the graph.
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+    # Version of the profile for ETag/Last-Modified, also bumped by follows
+    # and image processing.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    counter_fields = ("followers_count", "following_count")
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -81,3 +84,7 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ("email",)
+        # PostgreSQL has trigram GIN indexes on UPPER(username), UPPER(email)
+        # and UPPER(bio) for the icontains filters of UserListView, see
+        # migration 0004, and a (-date_joined, -id) index for the list, see
+        # migration 0009.
@@ -0,0 +1,24 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenObtainPairSerializerExtension,
+    TokenRefreshSerializerExtension,
+    TokenVerifySerializerExtension,
+)
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = "user.authentication.ClaimsJWTAuthentication"
+
+
+class ClaimsTokenObtainPairSerializerExtension(
+    TokenObtainPairSerializerExtension
+):
+    target_class = "user.serializers.ClaimsTokenObtainPairSerializer"
+
+
+class BloomTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = "user.serializers.BloomTokenRefreshSerializer"
+
+
+class BloomTokenVerifySerializerExtension(TokenVerifySerializerExtension):
+    target_class = "user.serializers.BloomTokenVerifySerializer"
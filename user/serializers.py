@@ -1,9 +1,31 @@
 from django.contrib.auth import get_user_model
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from django.utils.translation import gettext as _
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
+from social_api.images import srcset
+from social_api.sparse import SparseFieldsMixin
+from user import blacklist
+from user.tokens import BloomRefreshToken
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """User inlined by ``?expand=`` of posts, comments, likes and follows."""
 
-class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = ("id", "username", "image")
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
         fields = ["id", "email", "password", "username", "is_staff"]
@@ -32,9 +54,14 @@ class UserSerializer(serializers.ModelSerializer):
             return user
 
 
-class UserRetrieveSerializer(serializers.ModelSerializer):
-    followers = serializers.IntegerField(source="following.count", read_only=True)
-    following = serializers.IntegerField(source="follower.count", read_only=True)
+class UserRetrieveSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    followers = serializers.IntegerField(
+        source="followers_count", read_only=True
+    )
+    following = serializers.IntegerField(
+        source="following_count", read_only=True
+    )
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = get_user_model()
@@ -47,7 +74,15 @@ class UserRetrieveSerializer(serializers.ModelSerializer):
             "followers",
             "following",
             "image",
+            "image_srcset",
         ]
+        field_sources = {"image_srcset": ("image", "image_variants")}
+
+    @extend_schema_field(
+        {"type": "object", "additionalProperties": {"type": "string"}}
+    )
+    def get_image_srcset(self, user):
+        return srcset(user, "image", self.context.get("request"))
 
 
 class UserLogOutSerializer(serializers.Serializer):
@@ -62,3 +97,35 @@ class UserLogOutSerializer(serializers.Serializer):
                 "label": _("Password"),
             }
         }
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the claims ``ClaimsJWTAuthentication`` trusts to the tokens."""
+
+    token_class = BloomRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        token["is_staff"] = user.is_staff
+        return token
+
+
+class BloomTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = BloomRefreshToken
+
+
+class BloomTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = BloomRefreshToken
+
+
+class BloomTokenVerifySerializer(TokenVerifySerializer):
+    """Also rejects blacklisted tokens, whether or not refresh tokens are
+    rotated."""
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        if blacklist.is_blacklisted(token.get(api_settings.JTI_CLAIM)):
+            raise serializers.ValidationError("Token is blacklisted")
+        return {}
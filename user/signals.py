@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from social_api.cache import invalidate_on_commit
+from social_api.images import needs_processing
+from social_api.tasks import schedule_image_processing
+from user.authentication import forget_user_on_commit
+from user.models import User
+
+# Rendered by post and follow lists and the ``?expand=author`` summaries.
+LISTED_FIELDS = ("username", "email", "image")
+
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance, update_fields, **kwargs):
+    """Remember the stored values of the listed fields the save writes, to
+    tell what it changes."""
+    instance._listed_before_save = None
+    fields = [
+        field
+        for field in LISTED_FIELDS
+        if update_fields is None or field in update_fields
+    ]
+    if not instance._state.adding and fields:
+        instance._listed_before_save = (
+            User.objects.filter(pk=instance.pk).values(*fields).first()
+        )
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    if needs_processing(instance, "image"):
+        schedule_image_processing(instance, "image")
+    if not created:
+        forget_user_on_commit(instance.pk)
+
+    scopes = {f"user:{instance.username}"}
+    before = getattr(instance, "_listed_before_save", None)
+    if before:
+        scopes.add(f"user:{before.get('username', instance.username)}")
+        if any(
+            (value or None) != (getattr(instance, field) or None)
+            for field, value in before.items()
+        ):
+            scopes |= {"posts", "follows"}
+    invalidate_on_commit(*scopes)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    forget_user_on_commit(instance.pk)
+    invalidate_on_commit(f"user:{instance.username}")
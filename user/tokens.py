@@ -0,0 +1,20 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user import blacklist
+
+
+class BloomRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check goes through the bloom filter
+    of ``user.blacklist`` instead of always querying the database."""
+
+    def check_blacklist(self) -> None:
+        if blacklist.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist.blacklisted(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -8,15 +9,24 @@ from rest_framework_simplejwt.views import (
 
 from user.views import (
     CreateUserView,
+    ExportUserView,
     ManageUserView,
     UserListView,
     UserDetailView, LogOutUserView,
 )
 
+from social_api.async_views import read_async
 from social_api.views import FollowUserView, UnfollowUserView
+from user.async_views import AsyncUserDetailView
 
 app_name = "user"
 
+user_detail_view = UserDetailView.as_view(actions={"get": "retrieve"})
+if settings.ASYNC_READ_VIEWS:
+    user_detail_view = read_async(
+        UserDetailView, AsyncUserDetailView, {"get": "retrieve"}
+    )
+
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
@@ -26,6 +36,7 @@ urlpatterns = [
     path("logout/", TokenBlacklistView.as_view(), name="logout"),
     path("me/", ManageUserView.as_view(), name="manage_user"),
     path("me/logout/", LogOutUserView.as_view(), name="logout_user"),
+    path("me/export/", ExportUserView.as_view(), name="export_user"),
     path(
         "users/",
         UserListView.as_view(actions={"get": "list"}),
@@ -33,7 +44,7 @@ urlpatterns = [
     ),
     path(
         "<str:username>/",
-        UserDetailView.as_view(actions={"get": "retrieve"}),
+        user_detail_view,
         name="users-detail",
     ),
     path(
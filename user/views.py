@@ -1,10 +1,24 @@
 from django.contrib.auth import get_user_model, logout
+from django.core.handlers.asgi import ASGIRequest
+from django.db import router
+from django.http import StreamingHttpResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
+from social_api.cache import (
+    cache_response,
+    conditional_response,
+    invalidate_on_commit,
+)
+from social_api.pagination import DateJoinedCursorPagination
+from social_api.routers import ReplicaReadMixin
+from social_api.models import Post
+from social_api.sparse import SparseQuerysetMixin
+from user import export
 from user.serializers import UserSerializer, UserRetrieveSerializer, UserLogOutSerializer
 
 
@@ -13,22 +27,53 @@ class CreateUserView(generics.CreateAPIView):
     permission_classes = ()
 
 
-class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
+class ManageUserView(
+    ReplicaReadMixin,
+    SparseQuerysetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     serializer_class = UserRetrieveSerializer
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        # request.user may be built from token claims or a cached snapshot.
+        return self.sparse(get_user_model().objects.all()).get(
+            pk=self.request.user.pk
+        )
 
     def delete(self, request, *args, **kwargs):
-        instance = self.get_object()
-        instance.delete()
+        self.get_object().delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class UserListView(ModelViewSet):
+class ExportUserView(ReplicaReadMixin, APIView):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    @extend_schema(
+        responses={(200, export.CONTENT_TYPE): OpenApiTypes.STR},
+    )
+    def get(self, request, *args, **kwargs):
+        """Stream the posts, comments, likes and follows of the current
+        user as NDJSON"""
+        # Picked now: replica routing ends with the view, before streaming.
+        chunks = export.export_chunks(
+            request.user.pk, using=router.db_for_read(Post)
+        )
+        if isinstance(request._request, ASGIRequest):
+            chunks = export.aiter_chunks(chunks)
+        response = StreamingHttpResponse(
+            chunks, content_type=export.CONTENT_TYPE
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="user-{request.user.pk}.ndjson"'
+        )
+        return response
+
+
+class UserListView(ReplicaReadMixin, SparseQuerysetMixin, ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = DateJoinedCursorPagination
 
     def get_queryset(self):
         queryset = get_user_model().objects.all()
@@ -69,10 +114,10 @@ class UserListView(ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class UserDetailView(ModelViewSet):
+class UserDetailView(ReplicaReadMixin, SparseQuerysetMixin, ModelViewSet):
     serializer_class = UserRetrieveSerializer
     permission_classes = (permissions.IsAuthenticated,)
-    queryset = get_user_model()
+    queryset = get_user_model().objects.all()
     lookup_field = "username"
 
     @extend_schema(
@@ -86,22 +131,18 @@ class UserDetailView(ModelViewSet):
         ]
 
     )
+    @conditional_response("user:{username}")
+    @cache_response("user:{username}")
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    def get_queryset(self):
-        return get_user_model().objects.prefetch_related(
-            "user_followers", "user_following",
-        )
-
 
 class LogOutUserView(generics.GenericAPIView):
     serializer_class = UserLogOutSerializer
 
     def post(self, request, *args, **kwargs):
-        user = request.user
+        # request.user may be a cached snapshot: never save it back.
         logout(request)
-        user.save()
         return Response(
             {"status": "You have logged out"},
             status=status.HTTP_204_NO_CONTENT,